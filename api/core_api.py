@@ -1,6 +1,8 @@
 from fastapi import (
     APIRouter,
 )
+from fastapi.responses import JSONResponse
+from my_utils import embedding
 from my_utils.version import get_project_version
 
 core_api = APIRouter()
@@ -9,3 +11,13 @@ core_api = APIRouter()
 @core_api.get("/health")
 async def health_check():
     return {"status": "ok", "version": get_project_version()}
+
+
+@core_api.get("/ready")
+async def readiness_check():
+    """就绪探针：embedding 模型加载完成前返回 503"""
+    ready = embedding.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "loading", "embedding": ready},
+    )
@@ -34,22 +34,59 @@ async def knowledge_status():
 
 
 @knowledge_api.post("/knowledge/rebuild")
-async def knowledge_rebuild():
+async def knowledge_rebuild(background: bool = False):
     """
     手动触发知识库重建。
+    Parameters:
+        background (bool): 是否在后台重建并立即返回，进度通过 /knowledge/rebuild/status 查询
     """
     engine = _get_current_database_engine()
+    if background:
+        return {"msg": "ok", "data": engine.start_rebuild()}
     result = await asyncio.to_thread(engine.rebuild, False)
     return {"msg": "ok", "data": result}
 
 
+@knowledge_api.get("/knowledge/rebuild/status")
+async def knowledge_rebuild_status():
+    """
+    获取知识库重建进度。
+    """
+    engine = _get_current_database_engine()
+    return {"msg": "ok", "data": engine.get_rebuild_state()}
+
+
 @knowledge_api.post("/knowledge/health-check")
-async def knowledge_health_check(auto_fix: bool = True):
+async def knowledge_health_check(
+    auto_fix: bool = True, full: bool = False, background: bool = False
+):
     """
     执行知识库健康检查。
     Parameters:
         auto_fix (bool): 是否自动修复
+        full (bool): 是否全量检查，默认只检查上次检查以来改动过的页面、引用和事实
+        background (bool): 是否交给后台健康检查线程并立即返回，进度通过 /knowledge/health-check/status 查询
     """
     engine = _get_current_database_engine()
-    result = await asyncio.to_thread(engine.run_health_check, auto_fix)
+    if background:
+        return {"msg": "ok", "data": engine.start_health_check(auto_fix, full)}
+    result = await asyncio.to_thread(engine.run_health_check, auto_fix, full)
     return {"msg": "ok", "data": result}
+
+
+@knowledge_api.get("/knowledge/health-check/status")
+async def knowledge_health_check_status():
+    """
+    获取后台健康检查状态及上次完成的检查报告。
+    """
+    engine = _get_current_database_engine()
+    return {"msg": "ok", "data": engine.get_health_check_state()}
+
+
+@knowledge_api.post("/knowledge/health-check/cancel")
+async def knowledge_health_check_cancel():
+    """
+    取消排队或运行中的后台健康检查。
+    """
+    engine = _get_current_database_engine()
+    return {"msg": "ok", "data": engine.cancel_health_check()}
@@ -0,0 +1,97 @@
+"""
+Embedding 微批处理基准
+
+比较 1 / 4 / 16 个并发调用方时，直接调用 t2vect 与经由 EmbeddingBatcher 合批推理的
+吞吐与延迟，并校验合批结果与单独推理一致（池化不受同批其他文本 padding 的影响）。
+
+需要已下载的 embedding 模型，在项目根目录运行：
+    python -m bench.bench_embedding_batcher --requests 200
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+import numpy as np
+
+from my_utils import embedding
+from my_utils.embedding_batcher import EmbeddingBatcher
+
+# 长短不一的查询，保证同批内存在 padding
+QUERIES = [
+    "你好",
+    "今天过得怎么样？",
+    "我最喜欢的食物是草莓蛋糕，尤其是店里刚出炉的那种。",
+    "明天要下雨，记得带伞。",
+    "她在图书馆里读了一下午的书，直到闭馆的铃声响起才离开。",
+    "嗯",
+    "The quick brown fox jumps over the lazy dog.",
+    "我们第一次见面是在樱花盛开的季节，那天风很大，花瓣落了一地。",
+]
+
+
+def _run_callers(encode, callers: int, requests: int) -> tuple[float, list[float]]:
+    """callers 个线程共发出 requests 次单条编码请求，返回 (总耗时, 每次请求延迟)"""
+    latencies: list[float] = []
+    lock = threading.Lock()
+    per_caller = max(1, requests // callers)
+
+    def worker(offset: int):
+        local: list[float] = []
+        for i in range(per_caller):
+            text = QUERIES[(offset + i) % len(QUERIES)]
+            start = time.perf_counter()
+            encode([text])
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(callers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def _report(name: str, callers: int, elapsed: float, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(
+        f"{name:<8} callers={callers:<3} "
+        f"throughput={len(latencies) / elapsed:8.1f} req/s  "
+        f"p50={statistics.median(latencies) * 1000:7.2f}ms  p95={p95 * 1000:7.2f}ms"
+    )
+
+
+def check_batch_invariance(batcher: EmbeddingBatcher) -> float:
+    """并发提交各条查询，返回与逐条单独推理结果的最大绝对误差"""
+    expected = np.concatenate([embedding.t2vect([text]) for text in QUERIES])
+    futures = [batcher.submit([text]) for text in QUERIES]
+    actual = np.concatenate([future.result() for future in futures])
+    return float(np.max(np.abs(actual - expected)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding 微批处理基准")
+    parser.add_argument("--requests", type=int, default=200, help="每轮的请求总数")
+    parser.add_argument("--window-ms", type=float, default=3.0, help="合批等待窗口")
+    args = parser.parse_args()
+
+    embedding.warmup()
+    batcher = EmbeddingBatcher(window_ms=args.window_ms)
+
+    max_error = check_batch_invariance(batcher)
+    print(f"合批与单独推理的最大误差: {max_error:.2e}")
+
+    for callers in (1, 4, 16):
+        elapsed, latencies = _run_callers(embedding.t2vect, callers, args.requests)
+        _report("direct", callers, elapsed, latencies)
+        elapsed, latencies = _run_callers(batcher.encode, callers, args.requests)
+        _report("batched", callers, elapsed, latencies)
+
+
+if __name__ == "__main__":
+    main()
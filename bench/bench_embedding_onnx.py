@@ -0,0 +1,144 @@
+"""
+Embedding 推理后端基准
+
+分别在独立子进程中加载 torch、ONNX（fp32）和 ONNX（int8 动态量化）后端，比较：
+- 模型加载耗时
+- 单条查询延迟（p50 / p95），对应检索时的查询编码
+- 批量编码吞吐，对应记忆 / 知识库重建时的批量编码
+- 进程峰值 RSS（含 import torch / onnxruntime 本身的开销）
+
+每个后端使用独立进程，峰值 RSS 互不影响。需要已下载的 embedding 模型，
+ONNX 模型需先通过 export_embedding_onnx.py 导出，缺失的后端会被跳过。
+在项目根目录运行：
+    python -m bench.bench_embedding_onnx --requests 200 --batch-size 32
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 检索查询长度不一，批量编码按语料循环取用
+CORPUS = [
+    "你好呀，今天过得怎么样？",
+    "我最喜欢的食物是草莓蛋糕，尤其是店里刚出炉的那种。",
+    "明天要下雨，记得带伞。",
+    "她在图书馆里读了一下午的书，直到闭馆的铃声响起才离开。",
+    "这个世界的魔法需要以记忆作为代价。",
+    "The quick brown fox jumps over the lazy dog.",
+    "嗯",
+    "我们第一次见面是在樱花盛开的季节，那天风很大，花瓣落了一地。",
+]
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def _peak_rss_mb() -> float | None:
+    """当前进程的峰值 RSS（MB），不支持的平台返回 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _load(backend: str, onnx_dir: str | None, threads: int):
+    """加载指定后端，返回编码函数"""
+    from my_utils import embedding
+
+    if backend == "torch":
+        model_data = embedding.load_torch_model()
+        return lambda text: embedding.torch_t2vect(model_data, text)
+
+    from my_utils import embedding_onnx
+
+    model_path = embedding_onnx.get_onnx_model_path(onnx_dir, backend == "onnx-int8")
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"未找到 ONNX 模型: {model_path}")
+    model_data = embedding_onnx.load_onnx_model(model_path, threads)
+    return lambda text: embedding_onnx.onnx_t2vect(model_data, text)
+
+
+def run_worker(backend: str, requests: int, batch_size: int, onnx_dir: str | None, threads: int):
+    """子进程：测量单个后端并以 JSON 输出结果"""
+    start = time.perf_counter()
+    encode = _load(backend, onnx_dir, threads)
+    load_sec = time.perf_counter() - start
+
+    # 预热，排除首次推理的图优化 / 内存分配
+    encode(CORPUS)
+
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        encode([CORPUS[i % len(CORPUS)]])
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    batch = [CORPUS[i % len(CORPUS)] for i in range(batch_size)]
+    rounds = max(1, requests // batch_size)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        encode(batch)
+    batch_sec = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "backend": backend,
+                "load_sec": load_sec,
+                "p50_ms": statistics.median(latencies) * 1000,
+                "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000,
+                "batch_texts_per_sec": rounds * batch_size / batch_sec,
+                "peak_rss_mb": _peak_rss_mb(),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding 推理后端基准")
+    parser.add_argument("--requests", type=int, default=200, help="单条查询的请求次数")
+    parser.add_argument("--batch-size", type=int, default=32, help="批量编码的批大小")
+    parser.add_argument("--onnx-dir", default=None, help="ONNX 模型目录，默认为模型目录下的 onnx/")
+    parser.add_argument("--threads", type=int, default=0, help="onnx 推理线程数，0 表示自动")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.requests, args.batch_size, args.onnx_dir, args.threads)
+        return
+
+    for backend in BACKENDS:
+        command = [
+            sys.executable, "-m", "bench.bench_embedding_onnx",
+            "--worker", backend,
+            "--requests", str(args.requests),
+            "--batch-size", str(args.batch_size),
+            "--threads", str(args.threads),
+        ]
+        if args.onnx_dir:
+            command += ["--onnx-dir", args.onnx_dir]
+        proc = subprocess.run(command, capture_output=True, text=True)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()
+            print(f"{backend:<10} 跳过: {error[-1] if error else proc.returncode}")
+            continue
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        rss = result["peak_rss_mb"]
+        print(
+            f"{backend:<10} load={result['load_sec']:6.2f}s  "
+            f"p50={result['p50_ms']:7.2f}ms  p95={result['p95_ms']:7.2f}ms  "
+            f"batch={result['batch_texts_per_sec']:8.1f} texts/s  "
+            f"peak_rss={'n/a' if rss is None else f'{rss:.0f}MB'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+JSON 行解析器 token 回放基准
+
+按固定 token 间隔回放一段 LLM 的 JSON 行输出，经 MultiParser（text + motion 任务）分发，比较：
+- JsonLineParser: 整行到达后才产出该句的 text
+- IncrementalJsonLineParser: 行首 text 字符串闭合即产出（当前实现）
+
+统计每句 text 的 TaskResult 相对流开始的到达时间（按 token 序号 × token 间隔换算），
+以及每个 token 的解析开销。actions 越长，提前产出节省的时间越多。
+tests/test_json_line_parser.py 以这里的回放函数校验两种解析器的分发结果一致。
+
+可用 --tokens-file 回放录制的真实 token 流（JSON 字符串数组），否则按句数合成。
+在项目根目录运行：
+    python -m bench.bench_json_line_parser --lines 8 --token-size 3 --token-ms 30
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from core.llm.response_parser import IncrementalJsonLineParser, JsonLineParser
+from core.scheduler.builtin_tasks import create_motion_task, create_text_task
+from core.scheduler.parsers.multi_parser import MultiParser
+
+
+def replay(parser: JsonLineParser, tokens: list[str]) -> list[tuple[int, dict]]:
+    """
+    逐 token 喂给解析器
+
+    返回：
+    - [(token 序号, 产出对象)]，flush 的产出序号为 len(tokens)
+    """
+    results = []
+    for index, token in enumerate(tokens):
+        results.extend((index, item) for item in parser.stream_parse(token))
+    results.extend((len(tokens), item) for item in parser.flush())
+    return results
+
+
+def dispatch(parser: JsonLineParser, tokens: list[str]) -> list[tuple[int, str, object, int]]:
+    """
+    回放 token 并经 MultiParser 分发
+
+    返回：
+    - [(token 序号, task_type, data, sentence_id)]
+    """
+    multi = MultiParser()
+    multi.register_task(create_text_task())
+    multi.register_task(create_motion_task())
+    return [
+        (index, result.task_type, result.data, result.sentence_id)
+        for index, item in replay(parser, tokens)
+        for result in multi.parse(item)
+    ]
+
+
+def build_lines(count: int) -> list[dict]:
+    """合成带动作和表情的回复行"""
+    return [
+        {
+            "text": f"这是第{i}句回复，我们一起去公园散步吧。",
+            "actions": {
+                "motions": [
+                    {"name": "blush", "anchor": "一起去公园", "intensity": 0.6},
+                    {"name": "nod", "anchor": f"第{i}句", "intensity": 1.0},
+                ],
+                "expression": "happy",
+            },
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def tokenize(lines: list[dict], token_size: int) -> list[str]:
+    """把 JSON 行按固定字符数切成 token"""
+    content = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+    return [content[i : i + token_size] for i in range(0, len(content), token_size)]
+
+
+def _measure(parser_cls: type[JsonLineParser], tokens: list[str], token_ms: float) -> dict:
+    start = time.perf_counter()
+    events = dispatch(parser_cls(), tokens)
+    parse_sec = time.perf_counter() - start
+    # token 序号从 0 开始，第 i 个 token 在 (i + 1) 个间隔后到达
+    text_ms = [(index + 1) * token_ms for index, task_type, _, _ in events if task_type == "text"]
+    return {
+        "events": [event[1:] for event in events],
+        "text_ms": text_ms,
+        "parse_us_per_token": parse_sec / max(len(tokens), 1) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 行解析器 token 回放基准")
+    parser.add_argument("--lines", type=int, default=8, help="合成回复的行数")
+    parser.add_argument("--token-size", type=int, default=3, help="每个 token 的字符数")
+    parser.add_argument("--token-ms", type=float, default=30, help="token 间隔（毫秒）")
+    parser.add_argument("--tokens-file", default=None, help="录制的 token 流（JSON 字符串数组）")
+    args = parser.parse_args()
+
+    if args.tokens_file:
+        with open(args.tokens_file, encoding="utf-8") as f:
+            tokens = json.load(f)
+    else:
+        tokens = tokenize(build_lines(args.lines), args.token_size)
+
+    baseline = _measure(JsonLineParser, tokens, args.token_ms)
+    for name, parser_cls in (("line", JsonLineParser), ("incremental", IncrementalJsonLineParser)):
+        result = baseline if parser_cls is JsonLineParser else _measure(parser_cls, tokens, args.token_ms)
+        assert result["events"] == baseline["events"], f"{name}: 分发结果不一致"
+        text_ms = result["text_ms"]
+        saved = [b - c for b, c in zip(baseline["text_ms"], text_ms)]
+        print(
+            f"{name:<12} tokens={len(tokens):<6} sentences={len(text_ms):<4} "
+            f"first_text={text_ms[0]:8.1f}ms  mean_text={statistics.mean(text_ms):8.1f}ms  "
+            f"mean_saved={statistics.mean(saved):7.1f}ms  "
+            f"parse={result['parse_us_per_token']:6.2f}us/token"
+        )
+
+
+if __name__ == "__main__":
+    main()
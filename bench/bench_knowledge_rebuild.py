@@ -0,0 +1,133 @@
+"""
+知识库全量重建耗时基准（chunk 向量缓存冷 / 热）
+
+在临时目录中创建 DataBase，向 wiki_pages 写入 --pages 个合成页面后多次调用 _rebuild_embeddings_index：
+- cold: embedding_cache 为空，全部 chunk 重新编码（等同改动前每次全量重建）
+- warm: 页面未变，全部 chunk 复用 embeddings/metadata.db 中缓存的向量
+- warm-edited: 修改 --edited 个页面后重建，只编码变化的 chunk
+
+编码替换为确定性的假实现，每条文本额外等待 --encode-ms 模拟模型推理耗时（CPU 上的小模型约为数毫秒）；
+启动时的索引加载、后台重建和健康检查调度均被跳过。在项目根目录运行：
+    python -m bench.bench_knowledge_rebuild --pages 500 --encode-ms 2 --edited 25
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import zlib
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+from my_utils import embedding, embedding_service
+from services import data_base
+
+PARAGRAPH = "这是第 {page} 页第 {block} 段的设定资料，记录了角色在某个地方经历的事情与当时的心情。" * 4
+
+
+class CountingEncoder:
+    """按文本确定性生成归一化向量，统计编码条数并模拟每条文本的推理耗时"""
+
+    def __init__(self, dim: int, cost_sec: float):
+        self.dim = dim
+        self.cost_sec = cost_sec
+        self.encoded = 0
+
+    def __call__(self, texts: list[str], use_cache: bool = True) -> np.ndarray:
+        self.encoded += len(texts)
+        time.sleep(self.cost_sec * len(texts))
+        vectors = np.stack(
+            [
+                np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(self.dim)
+                for text in texts
+            ]
+        ).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _page_content(page: int, blocks: int, revision: int = 0) -> str:
+    body = "\n\n".join(
+        PARAGRAPH.format(page=page, block=block) + (f"（修订 {revision}）" if revision else "")
+        for block in range(blocks)
+    )
+    return f"---\ntitle: 页面 {page}\n---\n\n{body}\n"
+
+
+def write_pages(db: data_base.DataBase, pages: int, blocks: int) -> None:
+    """按 wiki_pages 表结构写入合成页面"""
+    now_dt = "2026-01-01 00:00:00"
+    db._conn.executemany(
+        "INSERT INTO wiki_pages (page_id, page_type, title, file_path, content, tags_json, "
+        "sources_json, created, updated, raw_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+        [
+            (
+                f"concept/page-{page}", "concept", f"页面 {page}", f"wiki/concept/page-{page}.md",
+                _page_content(page, blocks), json.dumps([]), json.dumps([]), now_dt, now_dt,
+            )
+            for page in range(pages)
+        ],
+    )
+    db._conn.commit()
+
+
+def _timed_rebuild(db: data_base.DataBase, encoder: CountingEncoder) -> tuple[float, int]:
+    encoder.encoded = 0
+    start = time.perf_counter()
+    db._rebuild_embeddings_index()
+    return time.perf_counter() - start, encoder.encoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="知识库全量重建耗时基准")
+    parser.add_argument("--pages", type=int, default=500, help="页面数")
+    parser.add_argument("--blocks", type=int, default=4, help="每个页面的段落数")
+    parser.add_argument("--dim", type=int, default=512, help="向量维度")
+    parser.add_argument("--encode-ms", type=float, default=2.0, help="每条文本的模拟编码耗时")
+    parser.add_argument("--edited", type=int, default=25, help="warm-edited 修改的页面数")
+    args = parser.parse_args()
+
+    encoder = CountingEncoder(args.dim, args.encode_ms / 1000)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.multiple(
+        data_base.DataBase,
+        _load_persisted_index=lambda self: False,
+        start_rebuild=lambda self, startup=False: {},
+        _start_health_scheduler=lambda self: None,
+    ), mock.patch.object(embedding_service, "encode", encoder), mock.patch.object(
+        embedding, "get_model_id", return_value="fake-embedding:mean"
+    ):
+        os.chdir(tmp)
+        try:
+            settings = SimpleNamespace(loreBooksThreshold=0.5, loreBooksDepth=3)
+            db = data_base.DataBase(SimpleNamespace(settings=settings))
+            write_pages(db, args.pages, args.blocks)
+
+            results = [("cold", *_timed_rebuild(db, encoder))]
+            results.append(("warm", *_timed_rebuild(db, encoder)))
+            db._conn.executemany(
+                "UPDATE wiki_pages SET content = ? WHERE page_id = ?",
+                [
+                    (_page_content(page, args.blocks, revision=1), f"concept/page-{page}")
+                    for page in range(min(args.edited, args.pages))
+                ],
+            )
+            db._conn.commit()
+            results.append(("warm-edited", *_timed_rebuild(db, encoder)))
+            chunks = db.data_count
+            cache_mb = db._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+            ).fetchone()[0] / 2**20
+            db.close()
+        finally:
+            os.chdir(cwd)
+
+    print(f"pages={args.pages} chunks={chunks} encode={args.encode_ms}ms/条 cache={cache_mb:.1f}MB")
+    for name, seconds, encoded in results:
+        print(f"{name:<12} rebuild={seconds * 1000:9.1f}ms  encoded={encoded}")
+
+
+if __name__ == "__main__":
+    main()
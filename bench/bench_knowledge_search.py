@@ -0,0 +1,191 @@
+"""
+知识库检索延迟基准
+
+在合成的 wiki_pages / chunks 表与 IndexIDMap2 索引上，比较 DataBase.search 命中后取 chunk 内容的两种方式：
+- per-hit-sql: 对每个命中逐条执行 chunks JOIN wiki_pages 查询（改动前的 _fetch_chunk_payload）
+- chunk-store: 向量化过滤、去重后在 _ChunkStore 列式内存表中查找（当前实现，直接调用 DataBase.search）
+- cached: 相同查询命中检索结果缓存
+
+每次检索模拟一轮聊天的多句查询（--sentences 条，每条取 top_k）。查询向量与 faiss 检索结果
+预先算好（faiss 检索耗时单独列出，两种方式相同），只测命中后的过滤、取内容与拼接；
+两种方式的输出会先比对一致。在项目根目录运行：
+    python -m bench.bench_knowledge_search --chunks 50000 --dim 512 --sentences 6 --top-k 5
+"""
+
+import argparse
+import sqlite3
+import statistics
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import faiss
+import numpy as np
+
+from bench.bench_vector_index import synthetic_corpus
+from my_utils import embedding_service
+from my_utils.query_cache import QueryResultCache
+from services.data_base import DataBase
+
+PAGE_TYPES = ("entity", "concept", "source")
+
+
+def build_knowledge_db(chunks: int, chunks_per_page: int = 8) -> sqlite3.Connection:
+    """按 DataBase 的表结构在内存中合成 wiki_pages / chunks，chunk_id 即 faiss id"""
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE wiki_pages (page_id TEXT PRIMARY KEY, page_type TEXT NOT NULL, "
+        "title TEXT NOT NULL, file_path TEXT NOT NULL UNIQUE)"
+    )
+    conn.execute(
+        "CREATE TABLE chunks (chunk_id INTEGER PRIMARY KEY AUTOINCREMENT, page_id TEXT NOT NULL, "
+        "chunk_text TEXT NOT NULL, faiss_id INTEGER UNIQUE)"
+    )
+    pages = (chunks + chunks_per_page - 1) // chunks_per_page
+    with conn:
+        conn.executemany(
+            "INSERT INTO wiki_pages VALUES (?, ?, ?, ?)",
+            [
+                (f"page-{i}", PAGE_TYPES[i % len(PAGE_TYPES)], f"页面 {i}", f"wiki/page-{i}.md")
+                for i in range(pages)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO chunks VALUES (?, ?, ?, ?)",
+            [
+                (i, f"page-{i // chunks_per_page}", f"第 {i} 段资料内容。" * 20, i)
+                for i in range(1, chunks + 1)
+            ],
+        )
+    return conn
+
+
+def legacy_search(engine, query_vectors: np.ndarray) -> str:
+    """改动前的检索：逐个命中判断阈值与去重，再逐条查询 SQLite 取 chunk 内容"""
+    distances, ids = engine.index.search(query_vectors, engine.top_k)
+    seen_chunk_ids: set[int] = set()
+    output_blocks: list[str] = []
+    for row_index in range(query_vectors.shape[0]):
+        for col_index in range(engine.top_k):
+            score = float(distances[row_index][col_index])
+            chunk_id = int(ids[row_index][col_index])
+            if chunk_id < 0 or score < engine.thresholds or chunk_id in seen_chunk_ids:
+                continue
+            row = engine._conn.execute(
+                """
+                SELECT c.chunk_text, p.title, p.page_type, p.file_path
+                FROM chunks c
+                JOIN wiki_pages p ON c.page_id = p.page_id
+                WHERE c.chunk_id = ?
+                LIMIT 1
+                """,
+                (chunk_id,),
+            ).fetchone()
+            if not row:
+                continue
+            seen_chunk_ids.add(chunk_id)
+            output_blocks.append(f"[{row[2]}] {row[1]} (score={score:.3f})\n{row[0]}")
+    return "\n\n".join(output_blocks) + ("\n\n" if output_blocks else "")
+
+
+class _PrecomputedIndex:
+    """按轮次返回预先算好的 faiss 检索结果"""
+
+    def __init__(self, ntotal: int):
+        self.ntotal = ntotal
+        self.result: tuple[np.ndarray, np.ndarray] | None = None
+
+    def search(self, query_vectors: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        return self.result
+
+
+def _percentiles(latencies: list[float]) -> str:
+    ordered = sorted(latencies)
+    return (
+        f"p50={statistics.median(ordered) * 1000:8.3f}ms  "
+        f"p95={ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000:8.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="知识库检索延迟基准")
+    parser.add_argument("--chunks", type=int, default=50000, help="chunk 数")
+    parser.add_argument("--dim", type=int, default=512, help="向量维度")
+    parser.add_argument("--sentences", type=int, default=6, help="每次检索的查询句数")
+    parser.add_argument("--top-k", type=int, default=5, help="每句取回的条数（loreBooksDepth）")
+    parser.add_argument("--threshold", type=float, default=0.3, help="相似度阈值（loreBooksThreshold）")
+    parser.add_argument("--rounds", type=int, default=200, help="检索次数")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.chunks, args.dim)
+    index = faiss.IndexIDMap2(faiss.IndexFlatIP(args.dim))
+    index.add_with_ids(corpus, np.arange(1, args.chunks + 1, dtype=np.int64))
+
+    # 每轮的查询为语料附近的扰动点，近似与已有资料相关的聊天内容
+    rng = np.random.default_rng(1)
+    rounds = []
+    faiss_search = []
+    for r in range(args.rounds):
+        picks = rng.integers(0, args.chunks, args.sentences)
+        noise = rng.standard_normal((args.sentences, args.dim)).astype(np.float32)
+        batch = corpus[picks] + noise / np.float32(np.sqrt(args.dim))
+        faiss.normalize_L2(batch)
+        start = time.perf_counter()
+        hits = index.search(batch, args.top_k)
+        faiss_search.append(time.perf_counter() - start)
+        rounds.append(([f"第 {r} 轮的第 {i} 句" for i in range(args.sentences)], batch, hits))
+
+    precomputed = _PrecomputedIndex(index.ntotal)
+    engine = SimpleNamespace(
+        _conn=build_knowledge_db(args.chunks),
+        index=precomputed,
+        top_k=args.top_k,
+        thresholds=args.threshold,
+        _generation=0,
+        _search_cache=QueryResultCache(max_entries=0),
+    )
+    start = time.perf_counter()
+    engine._search_snapshot = (precomputed, DataBase._load_chunk_store(engine))
+    load_sec = time.perf_counter() - start
+
+    legacy, current, cached, blocks = [], [], [], []
+    batches = {tuple(texts): batch for texts, batch, _ in rounds}
+
+    def encode(texts: list[str], use_cache: bool = True) -> np.ndarray:
+        return batches[tuple(texts)]
+
+    with mock.patch.object(embedding_service, "encode", encode):
+        for texts, batch, hits in rounds:
+            precomputed.result = hits
+            start = time.perf_counter()
+            expected = legacy_search(engine, batch)
+            legacy.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            result = DataBase.search(engine, texts)
+            current.append(time.perf_counter() - start)
+            assert result == expected, "两种方式的检索结果不一致"
+            blocks.append(result.count("(score="))
+
+        engine._search_cache = QueryResultCache()
+        for texts, _, hits in rounds:
+            precomputed.result = hits
+            DataBase.search(engine, texts)
+        for texts, _, _ in rounds:
+            start = time.perf_counter()
+            DataBase.search(engine, texts)
+            cached.append(time.perf_counter() - start)
+    engine._conn.close()
+
+    print(
+        f"chunks={args.chunks} dim={args.dim} queries={args.sentences}x top{args.top_k} "
+        f"hits/round={statistics.mean(blocks):.1f} chunk_store_load={load_sec * 1000:.1f}ms"
+    )
+    print(f"faiss search {_percentiles(faiss_search)}  (两种方式相同，不计入下列耗时)")
+    print(f"per-hit-sql  {_percentiles(legacy)}")
+    print(f"chunk-store  {_percentiles(current)}")
+    print(f"cached       {_percentiles(cached)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+LLM 首 token 延迟（TTFT）基准
+
+在后台线程中启动一个 OpenAI 兼容的流式桩服务器：每条新连接先等待 --connect-ms
+（模拟 TCP + TLS 握手），之后按 --first-token-ms / --token-ms 逐个推送 SSE 分片。比较：
+- per-request: 每次请求新建 AsyncOpenAI 客户端并在结束后关闭（改动前每轮聊天的做法）
+- shared: 主事件循环中通过 get_shared_client() 复用同一连接池（当前实现）
+- temporary-loop: 每次请求在 run_in_temporary_loop() 的临时事件循环中进行（同步代码路径），
+  无法复用连接，但循环结束时连接被关闭
+
+同时统计服务器收到的连接数与仍未关闭的连接数。tests/test_client_pool.py 也使用这里的桩服务器。
+在项目根目录运行：
+    python -m bench.bench_llm_ttft --requests 30 --connect-ms 80 --first-token-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+
+from openai import AsyncOpenAI
+
+from core.llm import client_pool
+from core.llm.client_pool import get_shared_client, run_in_temporary_loop
+
+API_KEY = "stub-key"
+
+
+class StubLLMServer:
+    """
+    OpenAI 兼容的 /chat/completions 桩服务器（HTTP/1.1 keep-alive，支持流式与非流式）
+
+    Attributes:
+        connections: 累计接受的连接数
+        closed: 已关闭的连接数
+        requests: 累计处理的请求数
+    """
+
+    def __init__(
+        self,
+        connect_delay_sec: float = 0.05,
+        first_token_sec: float = 0.05,
+        token_interval_sec: float = 0.01,
+        tokens: tuple[str, ...] = ("你好", "呀", "~"),
+    ):
+        self.connect_delay_sec = connect_delay_sec
+        self.first_token_sec = first_token_sec
+        self.token_interval_sec = token_interval_sec
+        self.tokens = tokens
+        self.connections = 0
+        self.closed = 0
+        self.requests = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.Server | None = None
+        self._thread: threading.Thread | None = None
+        self.base_url = ""
+
+    @property
+    def open_connections(self) -> int:
+        return self.connections - self.closed
+
+    def start(self) -> str:
+        """在后台线程启动服务器，返回 base_url"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, "127.0.0.1", 0)
+            )
+            port = self._server.sockets[0].getsockname()[1]
+            self.base_url = f"http://127.0.0.1:{port}/v1"
+            ready.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="stub-llm-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            await asyncio.sleep(self.connect_delay_sec)
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                length = 0
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    name, _, value = line.partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value.strip())
+                body = json.loads(await reader.readexactly(length) or b"{}")
+                self.requests += 1
+                if body.get("stream"):
+                    await self._stream(writer)
+                else:
+                    await self._complete(writer)
+        finally:
+            self.closed += 1
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        await asyncio.sleep(self.first_token_sec)
+        for i, token in enumerate(self.tokens):
+            if i:
+                await asyncio.sleep(self.token_interval_sec)
+            chunk = {
+                "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": "stub",
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            }
+            self._write_chunk(writer, f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+            await writer.drain()
+        self._write_chunk(writer, "data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _complete(self, writer: asyncio.StreamWriter):
+        await asyncio.sleep(self.first_token_sec)
+        payload = json.dumps(
+            {
+                "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(self.tokens)},
+                        "finish_reason": "stop",
+                    }
+                ],
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, text: str):
+        data = text.encode("utf-8")
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+async def first_token_latency(client: AsyncOpenAI) -> float:
+    """发送一次流式请求，返回收到首个内容分片的耗时（秒）"""
+    start = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model="stub", messages=[{"role": "user", "content": "你好"}], stream=True
+    )
+    latency = None
+    async for chunk in stream:
+        if latency is None and chunk.choices and chunk.choices[0].delta.content:
+            latency = time.perf_counter() - start
+    return latency
+
+
+async def _per_request(base_url: str, requests: int) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        client = client_pool._create_client(base_url, API_KEY)
+        try:
+            latencies.append(await first_token_latency(client))
+        finally:
+            await client.close()
+    return latencies
+
+
+async def shared_first_token_latency(base_url: str) -> float:
+    """经由当前事件循环的共享客户端发送一次流式请求"""
+    return await first_token_latency(get_shared_client(base_url, API_KEY))
+
+
+async def _shared(base_url: str, requests: int) -> list[float]:
+    try:
+        return [await shared_first_token_latency(base_url) for _ in range(requests)]
+    finally:
+        await client_pool.close_shared_clients()
+
+
+def _temporary_loop(base_url: str, requests: int) -> list[float]:
+    return [
+        run_in_temporary_loop(shared_first_token_latency(base_url)) for _ in range(requests)
+    ]
+
+
+def _summary(name: str, latencies: list[float], server: StubLLMServer) -> str:
+    ordered = sorted(latencies)
+    return (
+        f"{name:<15} p50={statistics.median(ordered) * 1000:7.1f}ms  "
+        f"p95={ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000:7.1f}ms  "
+        f"connections={server.connections:<4} still_open={server.open_connections}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 首 token 延迟基准")
+    parser.add_argument("--requests", type=int, default=30, help="每种方式的请求次数")
+    parser.add_argument("--connect-ms", type=float, default=80, help="新连接的握手耗时")
+    parser.add_argument("--first-token-ms", type=float, default=50, help="服务端首 token 耗时")
+    parser.add_argument("--token-ms", type=float, default=10, help="后续 token 间隔")
+    args = parser.parse_args()
+
+    runners = {
+        "per-request": lambda url: asyncio.run(_per_request(url, args.requests)),
+        "shared": lambda url: asyncio.run(_shared(url, args.requests)),
+        "temporary-loop": lambda url: _temporary_loop(url, args.requests),
+    }
+    for name, run in runners.items():
+        server = StubLLMServer(
+            args.connect_ms / 1000, args.first_token_ms / 1000, args.token_ms / 1000
+        )
+        latencies = run(server.start())
+        # 等待服务端处理完客户端的断开
+        time.sleep(0.1)
+        print(_summary(name, latencies, server))
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
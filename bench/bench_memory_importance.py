@@ -0,0 +1,87 @@
+"""
+记忆有效重要度计算延迟基准
+
+每次记忆检索都要计算记忆的有效重要度（按创建时间指数衰减 + 访问增益）。在不同记忆规模下比较：
+- per-row-all: 对全部记忆逐条解析 created_at 并计算（改动前）
+- vector-all: MemoryV2._calc_effective_importances 对全部存活行批量计算
+- vector-candidates: 只对 FAISS 返回的 top_k * 3 个候选行批量计算（当前实现）
+
+合成数据与逐条公式来自 bench.bench_memory_store，三种方式的结果会先比对一致。在项目根目录运行：
+    python -m bench.bench_memory_importance --sizes 1000,10000,50000,100000 --top-k 5
+"""
+
+import argparse
+import statistics
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from bench.bench_memory_store import reference_effective_importance, synthetic_rows
+from services.memory_store import MemoryStore
+from services.memory_v2 import MemoryV2
+
+
+def _latencies(fn, repeat: int) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def _summary(name: str, latencies: list[float]) -> str:
+    return (
+        f"  {name:<18} p50={statistics.median(latencies) * 1000:9.3f}ms  "
+        f"p95={latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000:9.3f}ms"
+    )
+
+
+def run_size(count: int, top_k: int, repeat: int) -> None:
+    now = time.time()
+    rows = synthetic_rows(count, now)
+    store = MemoryStore()
+    store.load(rows)
+    engine = SimpleNamespace(_store=store)
+    live = store.live_rows()
+    rng = np.random.default_rng(1)
+    candidates = rng.choice(live, size=min(top_k * 3, live.size), replace=False)
+
+    def per_row_all() -> list[float]:
+        return [
+            reference_effective_importance(
+                row[3], row[5], row[4], row[6], row[8], time.time()
+            )
+            for row in rows
+        ]
+
+    np.testing.assert_allclose(
+        MemoryV2._calc_effective_importances(engine, live), per_row_all(), rtol=1e-6
+    )
+
+    print(f"memories={count} candidates={candidates.size}")
+    print(_summary("per-row-all", _latencies(per_row_all, max(1, repeat // 10))))
+    print(_summary(
+        "vector-all",
+        _latencies(lambda: MemoryV2._calc_effective_importances(engine, live), repeat),
+    ))
+    print(_summary(
+        "vector-candidates",
+        _latencies(lambda: MemoryV2._calc_effective_importances(engine, candidates), repeat),
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="记忆有效重要度计算延迟基准")
+    parser.add_argument("--sizes", default="1000,10000,50000,100000", help="记忆规模，逗号分隔")
+    parser.add_argument("--top-k", type=int, default=5, help="检索条数，候选为 top_k * 3")
+    parser.add_argument("--repeat", type=int, default=100, help="每种方式的计算次数（逐条方式取十分之一）")
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        run_size(size, args.top_k, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+记忆内存表操作耗时基准
+
+在 --memories 条合成记忆上，比较 MemoryV2 内存缓存的两种结构：
+- lists: 九个并行 Python 列表，按 ID 定位需线性扫描，删除后整表重新载入，
+  检索时对全部记忆逐条计算有效重要度（改动前）
+- store: services.memory_store.MemoryStore 列式表，id → 行号字典定位，删除打墓碑，
+  检索只对候选行批量计算有效重要度（当前实现）
+
+逐项统计 add / update / access / delete / search 的单次平均耗时。只测内存表本身：
+SQLite 写入、向量编码与 FAISS 检索均不计入（改动前删除后还需重新编码全部记忆，实际差距更大），
+search 的候选为随机抽取的 top_k * 3 个记忆 ID。
+bench.bench_memory_importance 与 tests/test_memory_importance.py 复用这里的合成数据与逐条公式。
+在项目根目录运行：
+    python -m bench.bench_memory_store --memories 50000 --ops 200
+"""
+
+import argparse
+import math
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.memory_store import MemoryStore
+from services.memory_v2 import MemoryV2
+
+CATEGORIES = ("about_user", "about_self", "shared_experience", "general")
+
+
+def synthetic_rows(count: int, now: float, seed: int = 0) -> list[tuple]:
+    """
+    生成 memories 表的行，创建时间分布在 now 之前一年内
+
+    返回：
+    - (id, category, content, importance, memory_type, created_at, decay_rate, archived, access_count) 列表
+    """
+    rng = np.random.default_rng(seed)
+    ages = rng.uniform(0, 365 * 86400, count)
+    is_core = rng.random(count) < 0.1
+    return [
+        (
+            mem_id,
+            CATEGORIES[mem_id % len(CATEGORIES)],
+            f"记忆 {mem_id}：用户提到过的一件小事。",
+            float(rng.uniform(0.1, 1.0)),
+            "core" if is_core[i] else "normal",
+            datetime.fromtimestamp(now - ages[i]).isoformat(),
+            0.0 if is_core[i] else MemoryV2.DEFAULT_DECAY_RATE,
+            int(rng.random() < 0.05),
+            int(rng.integers(0, 10)),
+        )
+        for i, mem_id in enumerate(range(1, count + 1))
+    ]
+
+
+def reference_effective_importance(
+    importance: float,
+    created_at: str | None,
+    memory_type: str,
+    decay_rate: float | None,
+    access_count: int,
+    now: float,
+) -> float:
+    """改动前逐条计算有效重要度的公式"""
+    if memory_type == "core":
+        return importance
+
+    dr = decay_rate if decay_rate is not None else 0.0
+    if dr <= 0:
+        return importance
+
+    try:
+        created = datetime.fromisoformat(created_at).timestamp()  # type: ignore[arg-type]
+    except Exception:
+        return importance
+
+    days_elapsed = max(0, (now - created) / 86400.0)
+    time_factor = math.exp(-dr * days_elapsed)
+    access_boost = min(access_count * 0.03, 0.2)
+    return importance * time_factor + access_boost
+
+
+class ListTable:
+    """改动前 MemoryV2 的并行列表缓存"""
+
+    def __init__(self, rows: list[tuple]):
+        self.load(rows)
+
+    def load(self, rows: list[tuple]) -> None:
+        self.ids: list[int] = []
+        self.categories: list[str] = []
+        self.contents: list[str] = []
+        self.importances: list[float] = []
+        self.memory_types: list[str] = []
+        self.created_times: list[str] = []
+        self.decay_rates: list[float] = []
+        self.archived: list[bool] = []
+        self.access_counts: list[int] = []
+        for row in rows:
+            self.append(*row)
+
+    def append(self, mem_id, category, content, importance, memory_type, created_at,
+               decay_rate, archived=False, access_count=0) -> None:
+        self.ids.append(mem_id)
+        self.categories.append(category)
+        self.contents.append(content)
+        self.importances.append(importance)
+        self.memory_types.append(memory_type)
+        self.created_times.append(created_at)
+        self.decay_rates.append(decay_rate)
+        self.archived.append(bool(archived))
+        self.access_counts.append(access_count or 0)
+
+    def _find(self, mem_id: int) -> int | None:
+        for i, mid in enumerate(self.ids):
+            if mid == mem_id:
+                return i
+        return None
+
+    def update(self, mem_id: int, content: str, importance: float) -> None:
+        idx = self._find(mem_id)
+        self.contents[idx] = content
+        self.importances[idx] = importance
+
+    def access(self, mem_id: int) -> None:
+        idx = self._find(mem_id)
+        self.access_counts[idx] = self.access_counts[idx] + 1
+
+    def delete(self, mem_id: int) -> None:
+        # 改动前删除后从数据库整表重新载入（此处以内存中的行代替 SELECT）
+        rows = [
+            row for row in zip(
+                self.ids, self.categories, self.contents, self.importances, self.memory_types,
+                self.created_times, self.decay_rates, self.archived, self.access_counts,
+            )
+            if row[0] != mem_id
+        ]
+        self.load(rows)
+
+    def score(self, candidate_ids: np.ndarray, similarities: np.ndarray) -> list[tuple[int, float]]:
+        importance_cache = {
+            mem_id: reference_effective_importance(
+                self.importances[idx], self.created_times[idx], self.memory_types[idx],
+                self.decay_rates[idx], self.access_counts[idx], time.time(),
+            )
+            for idx, mem_id in enumerate(self.ids)
+        }
+        results = []
+        position = {mem_id: idx for idx, mem_id in enumerate(self.ids)}
+        for mem_id, similarity in zip(candidate_ids.tolist(), similarities.tolist()):
+            # 改动前 FAISS 返回的是位置，这里把候选 ID 换算为位置，不计入比较
+            idx = position.get(mem_id)
+            if idx is None or self.archived[idx]:
+                continue
+            results.append((mem_id, similarity * importance_cache.get(mem_id, 0.0)))
+        return results
+
+
+class StoreTable:
+    """当前实现：MemoryStore 列式表，检索打分调用 MemoryV2._calc_effective_importances"""
+
+    def __init__(self, rows: list[tuple]):
+        self.store = MemoryStore()
+        self.store.load(rows)
+        self._engine = SimpleNamespace(_store=self.store)
+
+    def append(self, *row) -> None:
+        self.store.append(*row)
+
+    def update(self, mem_id: int, content: str, importance: float) -> None:
+        idx = self.store.row_of(mem_id)
+        self.store.contents[idx] = content
+        self.store.importances[idx] = importance
+
+    def access(self, mem_id: int) -> None:
+        self.store.access_counts[self.store.row_of(mem_id)] += 1
+
+    def delete(self, mem_id: int) -> None:
+        store = self.store
+        store.delete(mem_id)
+        if store.tombstones > max(16, store.size // 4):
+            store.compact()
+
+    def score(self, candidate_ids: np.ndarray, similarities: np.ndarray) -> list[tuple[int, float]]:
+        store = self.store
+        rows = store.rows_of(candidate_ids)
+        keep = rows >= 0
+        keep &= ~store.archived[rows]
+        rows, similarities = rows[keep], similarities[keep]
+        effective_imps = MemoryV2._calc_effective_importances(self._engine, rows)
+        return [
+            (int(store.ids[idx]), similarity * effective_imp)
+            for idx, similarity, effective_imp in zip(
+                rows.tolist(), similarities.tolist(), effective_imps.tolist()
+            )
+        ]
+
+
+def _mean_us(fn, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def run(table_cls, rows: list[tuple], now: float, ops: int, top_k: int) -> dict[str, float]:
+    table = table_cls(rows)
+    count = len(rows)
+    rng = np.random.default_rng(1)
+    targets = rng.choice(np.arange(1, count + 1), size=ops, replace=False).tolist()
+    searches = [
+        (rng.choice(np.arange(1, count + 1), size=top_k * 3, replace=False),
+         rng.uniform(0.3, 0.9, top_k * 3))
+        for _ in range(ops)
+    ]
+    new_rows = [
+        (count + i + 1, "general", f"新记忆 {i}", 0.5, "normal",
+         datetime.fromtimestamp(now).isoformat(), MemoryV2.DEFAULT_DECAY_RATE)
+        for i in range(ops)
+    ]
+
+    return {
+        "search": _mean_us(table.score, searches),
+        "add": _mean_us(table.append, new_rows),
+        "update": _mean_us(table.update, [(mem_id, "改过的内容", 0.7) for mem_id in targets]),
+        "access": _mean_us(table.access, [(mem_id,) for mem_id in targets]),
+        "delete": _mean_us(table.delete, [(mem_id,) for mem_id in targets]),
+    }
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="记忆内存表操作耗时基准")
+    parser.add_argument("--memories", type=int, default=50000, help="记忆条数")
+    parser.add_argument("--ops", type=int, default=200, help="每项操作的次数")
+    parser.add_argument("--top-k", type=int, default=5, help="检索条数，候选为 top_k * 3")
+    args = parser.parse_args()
+
+    now = time.time()
+    rows = synthetic_rows(args.memories, now)
+
+    # 先确认两种结构的检索打分一致
+    probe_ids = np.arange(1, min(args.memories, 200) + 1, dtype=np.int64)
+    probe_sims = np.linspace(0.3, 0.9, probe_ids.size)
+    expected = ListTable(rows).score(probe_ids, probe_sims)
+    actual = StoreTable(rows).score(probe_ids, probe_sims)
+    assert [mem_id for mem_id, _ in actual] == [mem_id for mem_id, _ in expected]
+    np.testing.assert_allclose([s for _, s in actual], [s for _, s in expected], rtol=1e-6)
+
+    results = {
+        name: run(table_cls, rows, now, args.ops, args.top_k)
+        for name, table_cls in (("lists", ListTable), ("store", StoreTable))
+    }
+    print(f"memories={args.memories} ops={args.ops} (单次平均耗时)")
+    for op in ("add", "update", "access", "delete", "search"):
+        legacy, current = results["lists"][op], results["store"][op]
+        print(
+            f"{op:<7} lists={legacy:11.1f}us  store={current:9.1f}us  "
+            f"speedup={legacy / current:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
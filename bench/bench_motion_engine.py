@@ -0,0 +1,154 @@
+"""
+动作引擎每轮聊天初始化耗时基准
+
+比较每轮聊天获取动作引擎的两种方式：
+- per-chat: 每轮新建 MotionEngineService，重新打开 motion.db 并加载 embedding 矩阵（改动前）
+- shared: get_motion_engine() 进程内共享只读引擎，每轮只 create_session()（当前实现）
+
+同时给出首轮（冷启动）耗时和每句 process() 耗时。使用按参数合成的临时 motion.db，
+查询编码替换为确定性的假实现，只测动作引擎本身。
+tests/test_motion_engine_sessions.py 也使用这里的 build_motion_db 构造测试数据库。
+在项目根目录运行：
+    python -m bench.bench_motion_engine --entries 5000 --dim 512 --chats 50
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from unittest import mock
+
+import numpy as np
+
+from core.expression_generator import motion_engine_v3
+from core.expression_generator.motion_engine_v3 import (
+    PARAM_DEFAULTS,
+    MotionEngineService,
+    get_motion_engine,
+)
+from my_utils import embedding_service
+
+
+def build_motion_db(
+    path: str,
+    entries: int = 200,
+    motions: int = 20,
+    dim: int = 64,
+    duration: float = 2.0,
+    fps: float = 30.0,
+) -> None:
+    """
+    按 motion_engine_v3.MotionDatabase 读取的表结构合成 motion.db
+
+    参数：
+    - path: 输出文件路径
+    - entries: 对话条目数（每条一个 embedding）
+    - motions: 动作数，条目按序号轮流关联
+    - dim: embedding 维度
+    - duration / fps: 每个动作的时长与帧率
+    """
+    rng = np.random.default_rng(0)
+    params = list(PARAM_DEFAULTS)
+    frame_count = int(duration * fps) + 1
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE param_order (idx INTEGER PRIMARY KEY, param_id TEXT)")
+        conn.execute(
+            "CREATE TABLE motions (id INTEGER PRIMARY KEY, duration REAL, fps REAL, "
+            "frame_count INTEGER, param_count INTEGER, curves_blob BLOB)"
+        )
+        conn.execute(
+            "CREATE TABLE entries (id INTEGER PRIMARY KEY, text TEXT, "
+            "embedding_blob BLOB, motion_id INTEGER)"
+        )
+        conn.execute("CREATE TABLE _meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT INTO param_order VALUES (?, ?)", enumerate(params))
+        conn.executemany(
+            "INSERT INTO motions VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    motion_id, duration, fps, frame_count, len(params),
+                    rng.uniform(-1, 1, (len(params), frame_count)).astype(np.float32).tobytes(),
+                )
+                for motion_id in range(1, motions + 1)
+            ],
+        )
+        embeddings = rng.standard_normal((entries, dim)).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        conn.executemany(
+            "INSERT INTO entries VALUES (?, ?, ?, ?)",
+            [
+                (i + 1, f"对话样例 {i}", embeddings[i].tobytes(), i % motions + 1)
+                for i in range(entries)
+            ],
+        )
+        conn.execute("INSERT INTO _meta VALUES ('embedding_model', 'synthetic')")
+    conn.close()
+
+
+@contextmanager
+def fake_query_encoder(dim: int):
+    """把查询编码替换为按文本确定性生成的归一化向量"""
+
+    def encode(texts: list[str], use_cache: bool = True) -> np.ndarray:
+        vectors = np.stack(
+            [
+                np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(dim)
+                for text in texts
+            ]
+        ).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    with mock.patch.object(embedding_service, "encode", encode):
+        yield
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="动作引擎每轮聊天初始化耗时基准")
+    parser.add_argument("--entries", type=int, default=5000, help="对话条目数")
+    parser.add_argument("--motions", type=int, default=200, help="动作数")
+    parser.add_argument("--dim", type=int, default=512, help="embedding 维度")
+    parser.add_argument("--chats", type=int, default=50, help="模拟的聊天轮数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, fake_query_encoder(args.dim):
+        path = os.path.join(tmp, "motion.db")
+        build_motion_db(path, args.entries, args.motions, args.dim)
+
+        per_chat = []
+        for _ in range(args.chats):
+            engines = []
+            per_chat.append(_timed(lambda: engines.append(MotionEngineService(path).create_session())))
+            engines[0].engine.database.close()
+
+        cold = _timed(lambda: get_motion_engine(path))
+        shared = [_timed(lambda: get_motion_engine(path).create_session()) for _ in range(args.chats)]
+
+        session = get_motion_engine(path).create_session()
+        motions = [{"name": "blush", "anchor": "今天"}]
+        process = [
+            _timed(lambda: session.process(f"今天的第{i}句话", motions, "happy", 1.5))
+            for i in range(args.chats)
+        ]
+        motion_engine_v3._engines.pop(path).database.close()
+
+    print(f"entries={args.entries} dim={args.dim} matrix={args.entries * args.dim * 4 / 2**20:.1f}MB")
+    print(f"per-chat setup  mean={statistics.mean(per_chat) * 1000:9.3f}ms  "
+          f"max={max(per_chat) * 1000:9.3f}ms")
+    print(f"shared setup    mean={statistics.mean(shared) * 1000:9.3f}ms  "
+          f"max={max(shared) * 1000:9.3f}ms  cold={cold * 1000:.3f}ms")
+    print(f"process         mean={statistics.mean(process) * 1000:9.3f}ms  (每句，两种方式相同)")
+
+
+if __name__ == "__main__":
+    main()
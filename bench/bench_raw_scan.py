@@ -0,0 +1,138 @@
+"""
+raw 目录扫描耗时基准
+
+在临时目录中生成 --files 个 raw 文件，比较知识库每次同步 / 健康检查时扫描 raw 目录的方式：
+- full-md5: 每次对所有文件以 4 KB 读取计算 MD5（改动前）
+- stat-cold: 当前实现首次扫描，raw_files 中没有文件状态记录，全部计算 MD5
+- stat-warm: 当前实现，(size, mtime_ns, inode) 与记录一致，直接复用已记录的 MD5
+- stat-changed: 当前实现，其中 --changed 个文件被 touch、同样数量的文件内容被修改
+
+直接调用 DataBase._scan_raw_files。文件刚写入、位于页面缓存中，结果不含磁盘读取耗时，
+机械硬盘或冷缓存下 full-md5 的耗时会更高。在项目根目录运行：
+    python -m bench.bench_raw_scan --files 5000 --size-kb 32 --changed 50
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.data_base import RAW_SUFFIXES, DataBase
+
+
+def build_raw_dir(raw_dir: Path, files: int, size_kb: int) -> list[Path]:
+    """生成 raw 文件，大小在 1 KB 到 2 * size_kb KB 之间均匀分布，每 100 个一个子目录"""
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(files):
+        path = raw_dir / f"dir-{i // 100}" / f"doc-{i}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(rng.bytes(int(rng.integers(1, 2 * size_kb + 1)) * 1024))
+        paths.append(path)
+    return paths
+
+
+def legacy_scan(raw_dir: Path) -> dict[str, str]:
+    """改动前的扫描：遍历 raw 目录，以 4 KB 读取计算每个文件的 MD5"""
+    results: dict[str, str] = {}
+    for file_path in raw_dir.rglob("*"):
+        if not file_path.is_file() or file_path.suffix.lower() not in RAW_SUFFIXES:
+            continue
+        md5_obj = hashlib.md5()
+        with file_path.open("rb") as file:
+            while True:
+                data = file.read(4096)
+                if not data:
+                    break
+                md5_obj.update(data)
+        results[file_path.relative_to(raw_dir).as_posix()] = md5_obj.hexdigest()
+    return results
+
+
+def _record(engine, results: dict[str, str]) -> None:
+    """按 ingest 的方式把 MD5 与计算时的文件状态写入 raw_files"""
+    engine._conn.executemany(
+        "INSERT OR REPLACE INTO raw_files VALUES (?, ?, '', '', ?, ?, ?)",
+        [
+            (rel_path, file_md5, *engine._raw_stats.pop(rel_path, (None, None, None)))
+            for rel_path, file_md5 in results.items()
+        ],
+    )
+    engine._conn.commit()
+
+
+def _timed(fn, repeat: int) -> tuple[float, object]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="raw 目录扫描耗时基准")
+    parser.add_argument("--files", type=int, default=5000, help="raw 文件数")
+    parser.add_argument("--size-kb", type=int, default=32, help="平均文件大小（KB）")
+    parser.add_argument("--changed", type=int, default=50, help="touch 与修改内容的文件数（各）")
+    parser.add_argument("--repeat", type=int, default=3, help="每种方式重复次数，取中位数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = Path(tmp) / "raw"
+        paths = build_raw_dir(raw_dir, args.files, args.size_kb)
+        total_mb = sum(path.stat().st_size for path in paths) / 2**20
+
+        conn = sqlite3.connect(os.path.join(tmp, "meta.db"))
+        conn.execute(
+            "CREATE TABLE raw_files (raw_path TEXT PRIMARY KEY, file_md5 TEXT NOT NULL, "
+            "source_page_id TEXT NOT NULL, updated TEXT NOT NULL, "
+            "file_size INTEGER, mtime_ns INTEGER, inode INTEGER)"
+        )
+        engine = SimpleNamespace(_conn=conn, raw_dir=raw_dir, _raw_stats={})
+
+        full_sec, expected = _timed(lambda: legacy_scan(raw_dir), args.repeat)
+
+        def cold_scan():
+            engine._raw_stats.clear()
+            return DataBase._scan_raw_files(engine)
+
+        cold_sec, results = _timed(cold_scan, args.repeat)
+        assert results == expected, "两种方式的 MD5 不一致"
+        _record(engine, results)
+
+        warm_sec, results = _timed(lambda: DataBase._scan_raw_files(engine), args.repeat)
+        assert results == expected
+
+        # touch 的文件内容不变，扫描时重新计算一次 MD5 并回写状态；修改过的文件交由 ingest 记录
+        for path in paths[: args.changed]:
+            os.utime(path)
+        modified = paths[args.changed : 2 * args.changed]
+        for path in modified:
+            with path.open("ab") as file:
+                file.write(b"\n")
+        start = time.perf_counter()
+        results = DataBase._scan_raw_files(engine)
+        changed_sec = time.perf_counter() - start
+        assert len(engine._raw_stats) == len(modified)
+        conn.close()
+
+    print(f"files={args.files} total={total_mb:.1f}MB")
+    for name, seconds in (
+        ("full-md5", full_sec),
+        ("stat-cold", cold_sec),
+        ("stat-warm", warm_sec),
+        ("stat-changed", changed_sec),
+    ):
+        print(f"{name:<13} {seconds * 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+SQLite 写入吞吐基准
+
+多个线程同时写入单行记录（对应记忆写入、访问统计写回和对话记录），比较：
+- connect: 每次写入临时 sqlite3.connect、执行、commit、关闭（改动前的写法）
+- shared: sqlite_access.SQLiteDatabase 的写线程，同时到达的写入合并进同一事务（当前实现）
+
+每种方式写入独立的临时数据库文件。在项目根目录运行：
+    python -m bench.bench_sqlite_writes --threads 8 --writes 200
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from my_utils.sqlite_access import SQLiteDatabase
+
+CREATE_SQL = "CREATE TABLE IF NOT EXISTS chat_turns (id INTEGER PRIMARY KEY, role TEXT, content TEXT)"
+INSERT_SQL = "INSERT INTO chat_turns (role, content) VALUES (?, ?)"
+
+
+def _write_connect(path: str):
+    def write(params: tuple):
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            conn.execute(INSERT_SQL, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    return write, lambda: None
+
+
+def _write_shared(path: str):
+    db = SQLiteDatabase(path)
+    return lambda params: db.execute(INSERT_SQL, params), db.close
+
+
+def _measure(factory, path: str, threads: int, writes: int) -> float:
+    """各线程同时开始写入，返回总耗时（秒）"""
+    with sqlite3.connect(path) as conn:
+        conn.execute(CREATE_SQL)
+    write, close = factory(path)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(worker_id: int):
+        barrier.wait()
+        for i in range(writes):
+            write(("user", f"线程{worker_id} 的第 {i} 条消息"))
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    close()
+
+    with sqlite3.connect(path) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM chat_turns").fetchone()[0]
+    assert count == threads * writes, f"写入条数不符: {count}"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 写入吞吐基准")
+    parser.add_argument("--threads", type=int, default=8, help="并发写入线程数")
+    parser.add_argument("--writes", type=int, default=200, help="每个线程的写入次数")
+    args = parser.parse_args()
+
+    total = args.threads * args.writes
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in (("connect", _write_connect), ("shared", _write_shared)):
+            elapsed = _measure(factory, os.path.join(tmp, f"{name}.db"), args.threads, args.writes)
+            print(
+                f"{name:<8} threads={args.threads:<3} writes={total:<6} "
+                f"elapsed={elapsed:7.2f}s  throughput={total / elapsed:9.1f} writes/s  "
+                f"mean_latency={elapsed * args.threads / total * 1000:7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+TextStreamParser 句子切分基准
+
+比较增量扫描句尾的 TextStreamParser 与改动前每收到一个字符都从头重扫缓存的实现
+（LegacyTextStreamParser，tests/test_text_stream_parser.py 也以它为等价性基准）。
+无标点的长回复会让旧实现的耗时随长度平方增长。
+
+在项目根目录运行：
+    python -m bench.bench_text_stream_parser --chars 2000 --token-size 3
+"""
+
+import argparse
+import time
+
+from core.scheduler.parsers.text_stream_parser import (
+    MIN_SENTENCE_LENGTH,
+    SENTENCE_END_PATTERNS,
+    TextStreamParser,
+)
+
+
+class LegacyTextStreamParser(TextStreamParser):
+    """改动前的切分实现：每次都从缓存开头逐位置检测句尾"""
+
+    @staticmethod
+    def _is_sentence_end_at(text: str, idx: int) -> int:
+        for pattern in sorted(SENTENCE_END_PATTERNS, key=len, reverse=True):
+            if text.startswith(pattern, idx):
+                return len(pattern)
+        return 0
+
+    def _extract_plain_segments(self, force_flush: bool = False) -> list[str]:
+        ready: list[str] = []
+        buffer = "".join(self._sentence_chars)
+
+        while True:
+            boundary_end = -1
+            i = 0
+            while i < len(buffer):
+                hit_len = self._is_sentence_end_at(buffer, i)
+                if hit_len > 0:
+                    boundary_end = i + hit_len
+                    cleaned = "".join(buffer[:boundary_end].split())
+                    if len(cleaned) >= MIN_SENTENCE_LENGTH:
+                        break
+                    i = boundary_end
+                    boundary_end = -1
+                    continue
+                i += 1
+
+            if boundary_end < 0:
+                break
+            ready.append(buffer[:boundary_end])
+            buffer = buffer[boundary_end:]
+
+        if force_flush and buffer.strip():
+            ready.append(buffer)
+            buffer = ""
+
+        self._sentence_chars = list(buffer)
+        return ready
+
+
+def split_sentences(parser: TextStreamParser, tokens: list[str]) -> list[dict]:
+    """逐 token 喂给解析器，返回全部句子结果（含 flush）"""
+    results = []
+    for token in tokens:
+        results.extend(result.data for result in parser.parse(token))
+    results.extend(result.data for result in parser.flush())
+    return results
+
+
+def _tokenize(text: str, token_size: int) -> list[str]:
+    return [text[i : i + token_size] for i in range(0, len(text), token_size)]
+
+
+def _measure(parser_cls: type[TextStreamParser], tokens: list[str]) -> tuple[float, list[dict]]:
+    start = time.perf_counter()
+    results = split_sentences(parser_cls(), tokens)
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TextStreamParser 句子切分基准")
+    parser.add_argument("--chars", type=int, default=2000, help="每种回复的字符数")
+    parser.add_argument("--token-size", type=int, default=3, help="每个 token 的字符数")
+    args = parser.parse_args()
+
+    sentence = "今天的天气很好，我们一起去公园散步吧。"
+    cases = {
+        "punctuated": (sentence * (args.chars // len(sentence) + 1))[: args.chars],
+        "unpunctuated": ("一段没有任何句尾标点的长回复" * args.chars)[: args.chars],
+        "brackets": (("（轻轻点头）" + sentence) * args.chars)[: args.chars],
+    }
+
+    for name, text in cases.items():
+        tokens = _tokenize(text, args.token_size)
+        legacy_sec, legacy_results = _measure(LegacyTextStreamParser, tokens)
+        current_sec, current_results = _measure(TextStreamParser, tokens)
+        assert current_results == legacy_results, f"{name}: 切分结果不一致"
+        print(
+            f"{name:<13} chars={len(text):<6} sentences={len(current_results):<5} "
+            f"legacy={legacy_sec * 1000:9.2f}ms  current={current_sec * 1000:8.2f}ms  "
+            f"speedup={legacy_sec / max(current_sec, 1e-9):7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+V3 首句发射延迟基准
+
+用模拟的慢速 LLM（每隔固定时间产出一句 text 和对应的 motion）与固定耗时的 TTS / 动作检索
+替身驱动 V3MotionChatContext，比较两种驱动方式下客户端收到每一句的时间：
+- stream: stream_pipeline，句子就绪即发（当前实现）
+- legacy: 每收到一个管道结果才检查一次队首，流结束后 finalize（改动前的 V3ChatService.chat）
+
+legacy 方式下一句 TTS 就绪后要等到 LLM 产出下一行才会发出，首句延迟约为一个行间隔。
+TTS、动作引擎和动作检索均为替身，不做实际推理（导入 core.chat 仍需完整的运行环境）。
+在项目根目录运行：
+    python -m bench.bench_v3_first_sentence --sentences 6 --line-delay-ms 400 --tts-ms 150
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from contextlib import contextmanager
+from unittest import mock
+
+from core.chat import v3_motion
+from core.chat.v3_motion import V3MotionChatContext
+from core.scheduler.task import TaskResult
+
+
+class FakeSlowPipeline:
+    """每隔 line_delay_sec 产出一句 text，随后立即产出该句的 motion"""
+
+    def __init__(self, sentences: list[str], line_delay_sec: float):
+        self.sentences = sentences
+        self.line_delay_sec = line_delay_sec
+        # 各句 text 被产出的时间（perf_counter）
+        self.produced_at: list[float] = []
+
+    async def execute(self) -> AsyncGenerator[TaskResult, None]:
+        for sid, text in enumerate(self.sentences, start=1):
+            await asyncio.sleep(self.line_delay_sec)
+            self.produced_at.append(time.perf_counter())
+            yield TaskResult(
+                task_name="text_generation",
+                task_type="text",
+                data=text,
+                raw_data={"text": text},
+                sentence_id=sid,
+            )
+            yield TaskResult(
+                task_name="motion_generation",
+                task_type="motion",
+                data={"motions": [{"name": "nod", "anchor": text[:1], "intensity": 0.5}]},
+                sentence_id=sid,
+            )
+
+
+class FakeStages:
+    """TTS 与动作检索替身：固定耗时，记录启动和被取消的次数"""
+
+    def __init__(self, tts_sec: float, motion_sec: float):
+        self.tts_sec = tts_sec
+        self.motion_sec = motion_sec
+        self.tts_started = 0
+        self.tts_cancelled = 0
+
+    async def tts(self, semaphore: asyncio.Semaphore, sentence_text: str, tts_text: str):
+        self.tts_started += 1
+        try:
+            async with semaphore:
+                await asyncio.sleep(self.tts_sec)
+        except asyncio.CancelledError:
+            self.tts_cancelled += 1
+            raise
+        return f"audio:{tts_text}"
+
+    async def motion(self, text: str, motions: list[dict], expression, session):
+        await asyncio.sleep(self.motion_sec)
+        return {"text": text, "motions": motions}
+
+
+@contextmanager
+def fake_stages(tts_sec: float, motion_sec: float):
+    """替换 V3 上下文依赖的动作引擎、动作检索和 TTS"""
+    stages = FakeStages(tts_sec, motion_sec)
+    engine = mock.Mock()
+    engine.create_session.return_value = mock.Mock()
+    with (
+        mock.patch.object(v3_motion, "get_motion_engine", return_value=engine),
+        mock.patch.object(v3_motion, "tts_wrapper", stages.tts),
+        mock.patch.object(v3_motion, "_create_motion_event", stages.motion),
+    ):
+        yield stages
+
+
+async def drive_stream(ctx: V3MotionChatContext, pipeline: FakeSlowPipeline) -> list[float]:
+    """stream_pipeline 驱动，返回每个事件的发射时间"""
+    emitted = []
+    async for _ in ctx.stream_pipeline(pipeline):
+        emitted.append(time.perf_counter())
+    return emitted
+
+
+async def drive_legacy(ctx: V3MotionChatContext, pipeline: FakeSlowPipeline) -> list[float]:
+    """改动前的驱动方式：每个管道结果后检查队首，流结束后 finalize"""
+    emitted = []
+    async for result in pipeline.execute():
+        await ctx.handle_result(result)
+        emitted.extend(time.perf_counter() for _ in ctx.emit_ready())
+    await ctx.finalize()
+    emitted.extend(time.perf_counter() for _ in ctx.emit_ready())
+    return emitted
+
+
+async def measure(
+    driver, sentences: list[str], line_delay_sec: float, tts_sec: float, motion_sec: float
+) -> dict:
+    """
+    运行一轮并统计
+
+    返回：
+    - {"first_emit_ms": 首句发射时间, "lags_ms": 每句从 LLM 产出到发射的间隔}
+    """
+    with fake_stages(tts_sec, motion_sec):
+        ctx = V3MotionChatContext(tts_lang="zh")
+        pipeline = FakeSlowPipeline(sentences, line_delay_sec)
+        start = time.perf_counter()
+        emitted = await driver(ctx, pipeline)
+    return {
+        "first_emit_ms": (emitted[0] - start) * 1000,
+        "lags_ms": [(e - p) * 1000 for e, p in zip(emitted, pipeline.produced_at)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="V3 首句发射延迟基准")
+    parser.add_argument("--sentences", type=int, default=6, help="回复句数")
+    parser.add_argument("--line-delay-ms", type=float, default=400, help="LLM 每句的产出间隔")
+    parser.add_argument("--tts-ms", type=float, default=150, help="单句 TTS 耗时")
+    parser.add_argument("--motion-ms", type=float, default=20, help="单句动作检索耗时")
+    args = parser.parse_args()
+
+    sentences = [f"这是第{i}句测试回复。" for i in range(1, args.sentences + 1)]
+    for name, driver in (("stream", drive_stream), ("legacy", drive_legacy)):
+        result = asyncio.run(
+            measure(
+                driver,
+                sentences,
+                args.line_delay_ms / 1000,
+                args.tts_ms / 1000,
+                args.motion_ms / 1000,
+            )
+        )
+        lags = result["lags_ms"]
+        print(
+            f"{name:<7} first_emit={result['first_emit_ms']:7.1f}ms  "
+            f"first_lag={lags[0]:7.1f}ms  mean_lag={sum(lags) / len(lags):7.1f}ms  "
+            f"max_lag={max(lags):7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+向量索引 recall@k 与检索延迟基准
+
+在合成语料（高斯混合聚类后 L2 归一化，近似真实 embedding 的簇结构）上，
+通过 vector_index.build_index 构建各类索引，以 Flat 精确检索结果为基准统计：
+- 构建耗时（含 IVF / PQ 训练）与序列化后的索引大小
+- 各检索参数（IVF nprobe / HNSW efSearch）下的 recall@k
+- 单条查询延迟 p50 / p95，对应知识库与记忆检索时的逐句查询
+
+用于为大型知识库选择 VectorIndex 配置（type / compression / nprobe / ef_search）。
+1M 向量的语料需要数 GB 内存，默认只跑 10k 与 100k。在项目根目录运行：
+    python -m bench.bench_vector_index --sizes 10000,100000,1000000 --dim 512 --k 10
+"""
+
+import argparse
+import statistics
+import time
+from unittest import mock
+
+import faiss
+import numpy as np
+
+from my_utils import vector_index
+
+# (索引类型, 压缩方式, 检索参数名, 参数取值)
+CASES = [
+    ("ivf", "none", "nprobe", (1, 4, 16, 64)),
+    ("ivf", "sq8", "nprobe", (16, 64)),
+    ("ivf", "pq", "nprobe", (16, 64)),
+    ("hnsw", "none", "ef_search", (16, 64, 128)),
+    ("hnsw", "sq8", "ef_search", (64, 128)),
+]
+
+
+def synthetic_corpus(count: int, dim: int, clusters: int = 256, seed: int = 0) -> np.ndarray:
+    """生成带簇结构的归一化向量"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = np.empty((count, dim), dtype=np.float32)
+    step = 100000
+    for start in range(0, count, step):
+        end = min(start + step, count)
+        labels = rng.integers(0, clusters, end - start)
+        vectors[start:end] = centers[labels] + 0.6 * rng.standard_normal((end - start, dim))
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """每条查询的 top-k 与精确 top-k 的平均重合比例"""
+    k = truth.shape[1]
+    hits = sum(
+        len(set(row[row >= 0].tolist()) & set(exact.tolist())) for row, exact in zip(found, truth)
+    )
+    return hits / (k * len(truth))
+
+
+def _latencies(index: faiss.Index, queries: np.ndarray, k: int) -> list[float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def _config(**overrides) -> dict:
+    config = dict(vector_index.DEFAULT_INDEX_CONFIG)
+    config.update(overrides)
+    return config
+
+
+def _report(label: str, index, queries, truth, k, build_sec: float | None, size_mb: float | None):
+    _, found = index.search(queries, k)
+    latencies = _latencies(index, queries, k)
+    build = f"build={build_sec:7.2f}s size={size_mb:8.1f}MB" if build_sec is not None else " " * 29
+    print(
+        f"  {label:<24} {build}  recall@{k}={recall_at_k(found, truth):.3f}  "
+        f"p50={statistics.median(latencies) * 1000:7.3f}ms  "
+        f"p95={latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000:7.3f}ms"
+    )
+
+
+def run_size(count: int, dim: int, queries_count: int, k: int):
+    corpus = synthetic_corpus(count, dim)
+    # 查询取自语料附近的扰动点，模拟与已有内容相近的检索
+    rng = np.random.default_rng(1)
+    queries = corpus[rng.integers(0, count, queries_count)] + 0.3 * rng.standard_normal(
+        (queries_count, dim)
+    ).astype(np.float32)
+    faiss.normalize_L2(queries)
+
+    print(f"N={count} dim={dim} queries={queries_count} threads={faiss.omp_get_max_threads()}")
+    with mock.patch.object(vector_index, "get_index_config", return_value=_config(type="flat")):
+        start = time.perf_counter()
+        flat = vector_index.build_index(corpus)
+        build_sec = time.perf_counter() - start
+    _, truth = flat.search(queries, k)
+    _report("flat", flat, queries, truth, k, build_sec, corpus.nbytes / 2**20)
+    del flat
+
+    for kind, compression, param, values in CASES:
+        config = _config(type=kind, compression=compression)
+        with mock.patch.object(vector_index, "get_index_config", return_value=config):
+            # 数据量或维度不满足时压缩方式会被降级，按实际使用的方式标注
+            compression = vector_index._resolve_compression(dim, count)
+            start = time.perf_counter()
+            index = vector_index.build_index(corpus)
+            build_sec = time.perf_counter() - start
+        size_mb = faiss.serialize_index(index).nbytes / 2**20
+        for i, value in enumerate(values):
+            config[param] = value
+            with mock.patch.object(vector_index, "get_index_config", return_value=config):
+                vector_index.apply_search_params(index)
+            label = f"{kind}-{compression} {param}={value}"
+            _report(label, index, queries, truth, k, build_sec if i == 0 else None, size_mb)
+        del index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="向量索引 recall@k 与检索延迟基准")
+    parser.add_argument("--sizes", default="10000,100000", help="语料规模，逗号分隔")
+    parser.add_argument("--dim", type=int, default=512, help="向量维度")
+    parser.add_argument("--queries", type=int, default=200, help="查询条数")
+    parser.add_argument("--k", type=int, default=10, help="recall@k 的 k")
+    parser.add_argument("--threads", type=int, default=0, help="faiss 线程数，0 表示默认")
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        faiss.omp_set_num_threads(args.threads)
+    for size in (int(s) for s in args.sizes.split(",")):
+        run_size(size, args.dim, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,8 @@ class Assistant:
         self._executor = ThreadPoolExecutor(max_workers=4)
         # LLM 客户端实例
         self._llm_client = LLMClient(model_key="LLM")
+        # 已关闭（被重新加载或删除）后，仍持有本实例的进行中请求跳过知识库与记忆访问
+        self._closed = False
 
         self.load_config()
 
@@ -115,7 +117,7 @@ class Assistant:
             知识库检索结果
         """
         start_time = time.time()
-        if not self.enable_data_base:
+        if not self.enable_data_base or self._closed:
             return "", 0.0
         # jionlp 分词是 CPU 密集型，放入线程池
         msg_list = await self._run_sync_task(jionlp.split_sentence, msg, "fine")
@@ -135,7 +137,7 @@ class Assistant:
             (格式化记忆文本, 耗时)
         """
         start_time = time.time()
-        if not self.enable_long_memory:
+        if not self.enable_long_memory or self._closed:
             return "", 0.0
 
         result = await self._run_sync_task(self.memoryEngine.get_context, msg)
@@ -389,7 +391,7 @@ class Assistant:
 
         # 存储原始对话轮次供日记使用
         now_ts = int(time.time())
-        if self.enable_long_memory:
+        if self.enable_long_memory and not self._closed:
             self.memoryEngine.add_chat_turn("user", user_msg, now_ts)
             self.memoryEngine.add_chat_turn("assistant", assistant_msg, now_ts)
             # 跨天日记生成检查（取消旧任务防堆积，异常兜底）
@@ -435,6 +437,18 @@ class Assistant:
         except Exception as e:
             Log.warning(f"[Assistant] 历史记录 LLM 压缩失败（非致命）: {e}")
 
+    def close(self) -> None:
+        """
+        释放助手持有的后台资源（知识库后台线程与连接、记忆统计写回线程、线程池），助手被重新加载或删除时调用。
+        关闭后仍在进行的请求不再检索知识库和记忆，也不再写入对话记录
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.databaseEngine.close()
+        self.memoryEngine.close()
+        self._executor.shutdown(wait=False)
+
     async def _run_sync_task(self, func, *args):
         """
         工具方法
@@ -4,6 +4,9 @@ V1 版本聊天上下文
 基础版本：文本 + TTS，不包含动作生成。
 
 架构流程与 V3 一致：handle_result 缓存 → process_all 按序处理 TTS → 队列输出。
+
+流式模式（streaming=True）：handle_result 收到句子即启动 TTS，
+iter_sentence_events 按句子顺序逐条产出，首段语音无需等待 LLM 输出完整回复。
 """
 
 import asyncio
@@ -33,14 +36,18 @@ class BaseChatContext:
     - text_cache / _event_buffer: 缓存 + 队列输出（参照 V3 模式）
     - tts_semaphore: TTS 并发控制
     - pending_tasks: 异步任务跟踪（供子类取消用）
+    - streaming: 流式模式，句子到达即派发 TTS，按序经 iter_sentence_events 产出
     """
 
-    def __init__(self, tts_concurrency: int = 1):
+    def __init__(self, tts_concurrency: int = 1, streaming: bool = False):
         self.tts_semaphore: asyncio.Semaphore = asyncio.Semaphore(tts_concurrency)
         self.pending_tasks: set[asyncio.Task] = set()
         self.full_text_list: list[str] = []
         self.text_cache: dict[int, str] = {}
         self._event_buffer: list[FullChatResponse] = []
+        self.streaming: bool = streaming
+        # 流式模式：按句子到达顺序排列的 TTS 任务，None 为结束标记
+        self._sentence_queue: asyncio.Queue[asyncio.Task | None] = asyncio.Queue()
 
     async def handle_result(self, result: TaskResult):
         """
@@ -54,26 +61,55 @@ class BaseChatContext:
         self.text_cache[sentence_id] = sentence_text
         self.full_text_list.append(sentence_text)
 
+        if self.streaming:
+            task = asyncio.create_task(self._build_sentence_event(sentence_text))
+            self.pending_tasks.add(task)
+            task.add_done_callback(self.pending_tasks.discard)
+            self._sentence_queue.put_nowait(task)
+
+    async def _build_sentence_event(self, text: str) -> AssistantMessage:
+        """
+        单句处理：TTS 合成 → 合并为 AssistantMessage
+
+        参数：
+        - text: 句子文本
+        """
+        audio_file: str | None = None
+        tts_text = filter_tts_text(text)
+        if tts_text.strip():
+            audio_file = await tts_wrapper(self.tts_semaphore, text, tts_text)
+
+        extras = {}
+        if audio_file:
+            extras["audio"] = audio_file
+
+        return AssistantMessage(content=text, extras=extras or None)
+
     async def process_all(self):
         """
         按 sentence_id 顺序依次处理每个句子：
         TTS 合成 → 合并为 AssistantMessage 发出
         """
         for sid in sorted(self.text_cache.keys()):
-            text = self.text_cache[sid]
+            self._event_buffer.append(
+                await self._build_sentence_event(self.text_cache[sid])
+            )
 
-            audio_file: str | None = None
-            tts_text = filter_tts_text(text)
-            if tts_text.strip():
-                audio_file = await tts_wrapper(self.tts_semaphore, text, tts_text)
+    def close_stream(self):
+        """流式模式：标记不会再有新句子，iter_sentence_events 在排空后结束"""
+        self._sentence_queue.put_nowait(None)
 
-            extras = {}
-            if audio_file:
-                extras["audio"] = audio_file
+    async def iter_sentence_events(self) -> AsyncGenerator[FullChatResponse, None]:
+        """
+        流式模式：按句子顺序产出事件
 
-            self._event_buffer.append(
-                AssistantMessage(content=text, extras=extras or None)
-            )
+        每个句子的 TTS 完成且其前序句子均已产出后立即产出，直到 close_stream()。
+        """
+        while True:
+            task = await self._sentence_queue.get()
+            if task is None:
+                return
+            yield await task
 
     def drain_ready_events(self) -> list[FullChatResponse]:
         """排出所有缓冲事件"""
@@ -108,8 +144,8 @@ class V1ChatService:
         流程概述：
         1. 获取助手实例
         2. 使用 build_chat_chain + MessageChain 构建消息列表
-        3. 创建纯文本管道并流式执行
-        4. 按序处理 TTS → 输出就绪事件
+        3. 创建纯文本管道，后台流式执行，句子到达即派发 TTS
+        4. 按句子顺序输出就绪事件（与 LLM 输出并行）
 
         参数：
         - params: 聊天请求参数
@@ -122,7 +158,7 @@ class V1ChatService:
 
             return
 
-        ctx = BaseChatContext()
+        ctx = BaseChatContext(streaming=True)
 
         # 从 ChatRequest 构建用户消息内容
         user_message_raw, user_text = await build_user_message_content(params)
@@ -141,14 +177,25 @@ class V1ChatService:
             task_parser=TextStreamParser(),
         )
 
-        try:
-            async for result in pipeline.execute():
-                await ctx.handle_result(result)
+        async def _consume_pipeline():
+            """后台消费 LLM 流，逐句交给上下文派发 TTS"""
+            try:
+                async for result in pipeline.execute():
+                    await ctx.handle_result(result)
+            finally:
+                ctx.close_stream()
 
-            await ctx.process_all()
-            for payload in ctx.drain_ready_events():
+        producer = asyncio.create_task(_consume_pipeline())
+        ctx.pending_tasks.add(producer)
+        producer.add_done_callback(ctx.pending_tasks.discard)
+
+        try:
+            async for payload in ctx.iter_sentence_events():
                 yield payload
 
+            # 管道异常在此抛出
+            await producer
+
             yield DoneMessage(full_text=ctx.get_full_text())
 
             agent.chat_history.extend(
@@ -165,8 +212,11 @@ class V1ChatService:
             )
 
         except Exception as e:
-            for task in list(ctx.pending_tasks):
-                task.cancel()
-
             logger.error(f"处理数据时出错: {e}", exc_info=True)
             yield ErrorMessage(error_code="500", data=f"处理数据时出错: {e}")
+
+        finally:
+            # 客户端断开（GeneratorExit）或请求被取消（CancelledError）不经过 except，
+            # 在此统一停止仍在运行的 LLM 管道和 TTS 任务
+            for task in list(ctx.pending_tasks):
+                task.cancel()
@@ -28,19 +28,21 @@ V3 版本聊天模块
 │     LLM: {"text": "你好", "actions": ["blush"]}                  │
 │     解析器: text → "你好", actions → ["blush"]                    │
 ├─────────────────────────────────────────────────────────────────┤
-│  5. 句子就绪即发：text + motion 到齐 → 入队 → 后台并行 TTS + 动作检索  │
-│     _process_item: asyncio.gather(tts, motion_engine)              │
-│     → emit_ready 按入队顺序取出已就绪事件发射                        │
+│  5. 句子就绪即发：text 到达 → 入队并立即启动 TTS                    │
+│     motion 随后到达（或确定不会到达）→ 合并到同一句 → 动作检索        │
+│     → 就绪信号唤醒 stream_pipeline，按入队顺序即时发射               │
 └─────────────────────────────────────────────────────────────────┘
 
 调用链说明：
 - BaseChatContext: 基础上下文（v1.py）
   - handle_json_result: 处理文本结果 → text_wrapper + tts_task
 - V3MotionChatContext: 继承基础上下文，添加动作处理
-  - handle_result: 分发任务结果 → 缓存数据 → 配对入队 → 后台处理
-  - _process_item: 后台并行执行 TTS + 动作检索 → 标记就绪
+  - handle_result: 分发任务结果 → text 到达即入队 → 迟到的 motion 合并到对应句子
+  - _process_item: 后台先启动 TTS，等待 motion 合并后执行动作检索 → 标记就绪
   - emit_ready: 按入队顺序取出已就绪事件
-- _create_motion_event: get_motion_engine() → engine.process() → motion_to_keyframes()
+  - stream_pipeline: 后台消费管道，就绪即发，不依赖 LLM 下一个 token 的到达
+- _create_motion_event: session.process() → 逐帧曲线字典
+  （引擎由 get_motion_engine() 进程内共享，跨句子状态保存在每轮的 MotionSession 中）
 
 SSE 事件格式：
 data: {"type": "text", "sentence_id": 1, "message": "你好呀~", ...}
@@ -82,8 +84,9 @@ from typing import Literal
 
 from core.expression_generator.motion_engine_v3 import (
     ACTION_DESCRIPTIONS,
-    MotionEngineService,
+    MotionSession,
     estimate_text_duration,
+    get_motion_engine,
 )
 from core.expression_generator.utils.expression_loader import load_expressions
 from Config import Config
@@ -105,13 +108,15 @@ class _QueueItem:
     text: str = ""
     motions: list[dict] | None = None
     expression: str | None = None
+    # motion 已合并（到达或确定不会到达）
+    _motion_event: asyncio.Event = field(default_factory=asyncio.Event)
 
 
 async def _create_motion_event(
     text: str,
     motions: list[dict],
     expression: str | None,
-    engine: MotionEngineService,
+    session: MotionSession,
 ) -> dict | None:
     """
     创建动作事件
@@ -122,7 +127,7 @@ async def _create_motion_event(
     - text: 原始文本（用于语义检索和 anchor 定位）
     - motions: LLM 输出的特殊动作列表 [{"name": str, "anchor": str, "intensity": float}, ...]
     - expression: 整句表情名（用于面部渲染），None 表示沿用上一句
-    - engine: MotionEngineService 实例
+    - session: 本轮聊天的 MotionSession（共享引擎 + 独立跨句子状态）
 
     返回：
     - MotionResponse，含逐帧曲线 (curves) + expression
@@ -137,7 +142,7 @@ async def _create_motion_event(
     # 在线程池中执行动作处理（SentenceTransformer 编码是 CPU 密集型操作）
     motion_data = await loop.run_in_executor(
         None,
-        lambda: engine.process(text, motions, expression, text_duration),
+        lambda: session.process(text, motions, expression, text_duration),
     )
 
     duration_ms = int((motion_data.duration if motion_data else text_duration) * 1000)
@@ -160,9 +165,10 @@ class V3MotionChatContext(BaseChatContext):
     V3Motion 聊天上下文
 
     输出策略：
-    - 句子（text+motion）就绪后立即入队并启动后台 TTS + 动作检索
+    - 句子 text 到达后立即入队并启动后台 TTS，motion 到达后合并并执行动作检索
     - 工具事件直接入队标记就绪
     - emit_ready: 按入队顺序依次取出已就绪事件
+    - stream_pipeline: 事件驱动发射，队首就绪即产出（推荐入口）
     """
 
     def __init__(self, tts_lang: str = "zh"):
@@ -171,17 +177,23 @@ class V3MotionChatContext(BaseChatContext):
         self.text_cache: dict[int, str] = {}
         self.motion_cache: dict[int, list[dict]] = {}
         self.expression_cache: dict[int, str] = {}
-        self.motion_engine: MotionEngineService = MotionEngineService(
+        # 引擎进程内共享（只加载一次 motion.db），本轮仅持有独立的跨句子状态
+        self.motion_session: MotionSession = get_motion_engine(
             Config.MOTION_DB_PATH
-        )
+        ).create_session()
         # 逐句原始多任务 JSON 行，供 get_raw_output() 以 JSON 格式归档到 chat_history
-        self._raw_json_lines: dict[int, str] = {}
+        self._raw_json_lines: dict[int, dict] = {}
 
         # 有序发射队列
         self._queue: list[_QueueItem] = []
-        # 缓冲区：等待 text/motion 配对
-        self._text_buf: dict[int, str] = {}
+        # 已入队的句子 {sid: 队列项}，用于合并迟到的 motion
+        self._sentence_items: dict[int, _QueueItem] = {}
+        # 缓冲区：先于 text 到达的 motion
         self._motion_buf: dict[int, tuple[list[dict], str | None]] = {}
+        # 就绪信号：有队列项就绪或输入结束时置位，唤醒 stream_pipeline
+        self._ready_signal: asyncio.Event = asyncio.Event()
+        # 管道输入是否已结束（不再有新的 TaskResult）
+        self._input_closed: bool = False
 
     async def _build_motion_event(
         self,
@@ -194,7 +206,7 @@ class V3MotionChatContext(BaseChatContext):
             text=text,
             motions=motions,
             expression=expression,
-            engine=self.motion_engine,
+            session=self.motion_session,
         )
 
     async def handle_json_result(self, result: TaskResult):
@@ -222,23 +234,24 @@ class V3MotionChatContext(BaseChatContext):
         self.full_text_list.append(text)
 
     async def handle_result(self, result: TaskResult):
-        """分发任务结果：缓存数据，配对入队，启动后台处理"""
-        if result.raw_data and result.sentence_id not in self._raw_json_lines:
-            self._raw_json_lines[result.sentence_id] = json.dumps(
-                result.raw_data, ensure_ascii=False
-            )
+        """分发任务结果：缓存数据，text 到达即入队，motion 合并到对应句子"""
+        # 增量解析时同一句先到达部分字段，保留字段最全的原始行
+        if result.raw_data and len(result.raw_data) >= len(
+            self._raw_json_lines.get(result.sentence_id, {})
+        ):
+            self._raw_json_lines[result.sentence_id] = result.raw_data
 
         if result.task_type == "text":
             await self.handle_json_result(result)
-            self._text_buf[result.sentence_id] = result.data
+            self._enqueue_sentence(result.sentence_id, result.data)
         elif result.task_type == "bilingual":
             await self.handle_bilingual_result(result)
-            self._text_buf[result.sentence_id] = result.data.get("text", "")
+            self._enqueue_sentence(result.sentence_id, result.data.get("text", ""))
         elif result.task_type == "motion":
             await self.handle_motion_result(result)
             motions = result.data.get("motions", [])
             expression = result.data.get("expression")
-            self._motion_buf[result.sentence_id] = (motions, expression)
+            self._merge_motion(result.sentence_id, motions, expression)
         elif result.task_type == "tool_call":
             tc: ToolCallEvent = result.data
             # 内部工具（如 remember / recall / update_memory）不转发给客户端，保持沉浸感
@@ -263,6 +276,7 @@ class V3MotionChatContext(BaseChatContext):
                     ],
                 )
             )
+            self._ready_signal.set()
             return
         elif result.task_type == "tool_result":
             tr: ToolResultEvent = result.data
@@ -276,56 +290,66 @@ class V3MotionChatContext(BaseChatContext):
                     events=[ToolMessage(tool_call_id=tr.call_id, content=tr.content)],
                 )
             )
+            self._ready_signal.set()
             return
 
-        # 尝试将已配对的句子入队
-        self._flush_sentences()
-
-    def _flush_sentences(self):
-        """将已配对的句子按 sid 顺序入队，并启动后台处理"""
-        while self._text_buf:
-            sid = min(self._text_buf)
-            if sid in self._motion_buf:
-                text = self._text_buf.pop(sid)
-                motions, expression = self._motion_buf.pop(sid)
-            elif len(self._text_buf) > 1:
-                # 更高 sid 的 text 已到达 → 本句不会再有 motion
-                text = self._text_buf.pop(sid)
-                motions, expression = None, None
-            else:
-                # 唯一待处理句子，等待 motion 到达
-                break
-
-            item = _QueueItem(
-                kind="sentence",
-                text=text,
-                motions=motions,
-                expression=expression,
-            )
-            self._queue.append(item)
+    def _enqueue_sentence(self, sid: int, text: str):
+        """
+        text 到达：句子立即入队并启动后台处理（TTS 不等待 motion）
 
-            # 后台处理：TTS + 动作检索
-            asyncio.create_task(self._process_item(item))
+        更高 sid 的 text 到达意味着更早的句子不会再有 motion，一并合并为无动作。
+        """
+        if sid in self._sentence_items:
+            return
+
+        for prev_sid, prev_item in self._sentence_items.items():
+            if prev_sid < sid and not prev_item._motion_event.is_set():
+                prev_item._motion_event.set()
+
+        item = _QueueItem(kind="sentence", text=text)
+        if sid in self._motion_buf:
+            item.motions, item.expression = self._motion_buf.pop(sid)
+            item._motion_event.set()
+        self._sentence_items[sid] = item
+        self._queue.append(item)
+
+        task = asyncio.create_task(self._process_item(item))
+        self.pending_tasks.add(task)
+        task.add_done_callback(self.pending_tasks.discard)
+
+    def _merge_motion(
+        self, sid: int, motions: list[dict], expression: str | None
+    ):
+        """motion 到达：合并到已入队的同一句，text 尚未到达时先缓存"""
+        item = self._sentence_items.get(sid)
+        if item is None:
+            self._motion_buf[sid] = (motions, expression)
+            return
+        if item._motion_event.is_set():
+            return
+        item.motions = motions
+        item.expression = expression
+        item._motion_event.set()
 
     async def _process_item(self, item: _QueueItem):
-        """后台处理句子：并行 TTS + 动作检索，完成后标记就绪"""
+        """后台处理句子：先启动 TTS，motion 合并后并行动作检索，完成后标记就绪"""
+        tts_job: asyncio.Task | None = None
         try:
             tts_text = filter_tts_text(item.text)
 
-            motion_event: dict | None = None
-            audio_file: str | None = None
-
-            if item.motions and self.tts_lang == "zh" and tts_text.strip():
-                motion_event, audio_file = await asyncio.gather(
-                    self._build_motion_event(item.text, item.motions, item.expression),
-                    tts_wrapper(self.tts_semaphore, item.text, tts_text),
+            if self.tts_lang == "zh" and tts_text.strip():
+                tts_job = asyncio.create_task(
+                    tts_wrapper(self.tts_semaphore, item.text, tts_text)
                 )
-            elif item.motions:
+
+            await item._motion_event.wait()
+
+            motion_event: dict | None = None
+            if item.motions:
                 motion_event = await self._build_motion_event(
                     item.text, item.motions, item.expression
                 )
-            elif self.tts_lang == "zh" and tts_text.strip():
-                audio_file = await tts_wrapper(self.tts_semaphore, item.text, tts_text)
+            audio_file: str | None = await tts_job if tts_job else None
 
             extras = {}
             if motion_event:
@@ -334,14 +358,23 @@ class V3MotionChatContext(BaseChatContext):
                 extras["audio"] = audio_file
 
             item.events = [AssistantMessage(content=item.text, extras=extras or None)]
-            item.is_ready = True
-            item._ready_event.set()
+            self._mark_ready(item)
 
         except Exception as e:
             logger.error(f"[V3] 处理句子出错: {e}", exc_info=True)
             item.events = [AssistantMessage(content=item.text)]
-            item.is_ready = True
-            item._ready_event.set()
+            self._mark_ready(item)
+
+        finally:
+            # 出错或本任务被取消时，TTS 子任务不再需要
+            if tts_job and not tts_job.done():
+                tts_job.cancel()
+
+    def _mark_ready(self, item: _QueueItem):
+        """标记队列项就绪，并唤醒等待发射的消费者"""
+        item.is_ready = True
+        item._ready_event.set()
+        self._ready_signal.set()
 
     def emit_ready(self) -> list[FullChatResponse]:
         """按入队顺序取出已就绪的事件"""
@@ -350,21 +383,68 @@ class V3MotionChatContext(BaseChatContext):
             events.extend(self._queue.pop(0).events or [])
         return events
 
+    def close_input(self):
+        """管道结束：未合并 motion 的句子按无动作处理，并标记不会再有新的 TaskResult"""
+        if self._input_closed:
+            return
+        # 不会再有迟到的 motion
+        for item in self._sentence_items.values():
+            item._motion_event.set()
+        self._motion_buf.clear()
+        self._input_closed = True
+        self._ready_signal.set()
+
+    async def iter_ready(self) -> AsyncGenerator[FullChatResponse]:
+        """
+        事件驱动发射：队首项就绪即产出，直到输入结束且队列排空
+
+        与 LLM token 到达解耦，句子的 TTS/动作完成后立即发出。
+        """
+        while True:
+            # 先清除再检查，检查之后的置位都会被下一次 wait 观察到
+            self._ready_signal.clear()
+            for event in self.emit_ready():
+                yield event
+            if self._input_closed and not self._queue:
+                return
+            await self._ready_signal.wait()
+
+    async def stream_pipeline(
+        self, pipeline: Pipeline
+    ) -> AsyncGenerator[FullChatResponse]:
+        """
+        后台消费管道结果，同时按序产出就绪事件
+
+        管道中的异常在所有已入队事件发射完后重新抛出。
+
+        参数：
+        - pipeline: 待执行的任务管道
+        """
+
+        async def _consume():
+            try:
+                async for result in pipeline.execute():
+                    await self.handle_result(result)
+            finally:
+                self.close_input()
+
+        producer = asyncio.create_task(_consume())
+        self.pending_tasks.add(producer)
+        producer.add_done_callback(self.pending_tasks.discard)
+
+        try:
+            async for event in self.iter_ready():
+                yield event
+            await producer
+        finally:
+            # 正常结束时所有任务均已完成；提前退出（异常、断开）时连同句子任务一起取消
+            for task in list(self.pending_tasks):
+                task.cancel()
+
     async def finalize(self):
-        """管道结束后：将缓冲区中剩余的句子入队，等待所有后台任务完成"""
-        # 清空缓冲区：管道已结束，不再会有新的 TaskResult 到达
-        for sid in sorted(self._text_buf):
-            text = self._text_buf[sid]
-            motions, expression = self._motion_buf.pop(sid, (None, None))
-            item = _QueueItem(
-                kind="sentence",
-                text=text,
-                motions=motions,
-                expression=expression,
-            )
-            self._queue.append(item)
-            asyncio.create_task(self._process_item(item))
-        self._text_buf.clear()
+        """管道结束后：结束 motion 等待，等待所有后台任务完成"""
+        # 管道已结束，不再会有新的 TaskResult 到达
+        self.close_input()
 
         # 等待所有句子项处理完成
         for item in self._queue:
@@ -376,7 +456,10 @@ class V3MotionChatContext(BaseChatContext):
         if not self._raw_json_lines:
             return self.get_full_text()
         sorted_ids = sorted(self._raw_json_lines.keys())
-        return "\n".join(self._raw_json_lines[sid] for sid in sorted_ids)
+        return "\n".join(
+            json.dumps(self._raw_json_lines[sid], ensure_ascii=False)
+            for sid in sorted_ids
+        )
 
 
 class V3ChatService:
@@ -500,14 +583,8 @@ class V3ChatService:
         )
 
         try:
-            async for result in pipeline.execute():
-                await ctx.handle_result(result)
-                for event in ctx.emit_ready():
-                    yield event
-
-            # 等待所有后台任务完成，按序发射剩余事件
-            await ctx.finalize()
-            for event in ctx.emit_ready():
+            # 后台消费管道，句子 TTS/动作就绪即按序发射
+            async for event in ctx.stream_pipeline(pipeline):
                 yield event
 
             full_text = ctx.get_full_text()
@@ -527,7 +604,11 @@ class V3ChatService:
             )
 
         except Exception as e:
-            for task in list(ctx.pending_tasks):
-                task.cancel()
             logger.error(f"[V3] 处理数据时出错: {e}", exc_info=True)
             yield ErrorMessage(error_code="500", data=f"处理数据时出错: {e}")
+
+        finally:
+            # 客户端断开（GeneratorExit）或请求被取消（CancelledError）不经过 except，
+            # 在此统一停止仍在运行的管道、TTS 和动作任务
+            for task in list(ctx.pending_tasks):
+                task.cancel()
@@ -13,13 +13,15 @@ Live2D 动作引擎 V3 — 服务端适配器
     MotionDatabase      — SQLite 数据库，含预计算 embedding + 预解析动作曲线
     SemanticMatcher     — embedding 语义检索（基于预计算向量）
     ActionOverlay       — 特殊动作 → 参数帧数组生成
-    MotionEngineService — 服务端统一入口，串联检索/覆盖/混合全流程
+    MotionSessionState  — 单次会话的跨句子状态（持续动作 / 表情）
+    MotionEngineService — 服务端统一入口，串联检索/覆盖/混合全流程（进程内共享、只读）
+    MotionSession       — 绑定会话状态的引擎句柄，每轮聊天一个
 
 使用示例：
     from core.expression_generator.motion_engine_v3 import get_motion_engine
 
-    engine = get_motion_engine()
-    motion_data = engine.process(
+    session = get_motion_engine().create_session()
+    motion_data = session.process(
         text="你好呀~",
         motions=[{"name": "blush", "anchor": "你好呀"}],
         expression="happy",
@@ -30,8 +32,10 @@ Live2D 动作引擎 V3 — 服务端适配器
 """
 
 import sqlite3
-from dataclasses import dataclass
-from my_utils import embedding
+import threading
+from dataclasses import dataclass, field
+from Config import Config
+from my_utils import embedding_service
 from my_utils.log import logger as Log
 import numpy as np
 
@@ -184,6 +188,8 @@ class MotionDatabase:
             f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
         )
         self._conn.row_factory = sqlite3.Row
+        # 连接在多个会话/线程间共享，查询需串行
+        self._conn_lock = threading.Lock()
 
         self._embeddings: np.ndarray = np.empty((0, 0), dtype=np.float32)
         self._texts: list[str] = []
@@ -259,10 +265,11 @@ class MotionDatabase:
         Returns:
             dict[str, list[float]]: param_id → [frame0, frame1, ...]
         """
-        row = self._conn.execute(
-            "SELECT curves_blob, param_count, frame_count FROM motions WHERE id=?",
-            (motion_id,),
-        ).fetchone()
+        with self._conn_lock:
+            row = self._conn.execute(
+                "SELECT curves_blob, param_count, frame_count FROM motions WHERE id=?",
+                (motion_id,),
+            ).fetchone()
         if row is None:
             return {}
 
@@ -288,7 +295,8 @@ class MotionDatabase:
 
     def close(self) -> None:
         """关闭数据库连接"""
-        self._conn.close()
+        with self._conn_lock:
+            self._conn.close()
 
     @property
     def num_entries(self) -> int:
@@ -357,7 +365,7 @@ class SemanticMatcher:
             list[tuple[str, int, float]]: [(文本, motion_id, 相似度), ...]
         """
 
-        query_embedding: np.ndarray = embedding.t2vect([query])
+        query_embedding: np.ndarray = embedding_service.encode([query])
         similarities: np.ndarray = self._embeddings @ query_embedding.T
         top_indices = np.argsort(similarities[:, 0])[::-1][:k]
 
@@ -666,6 +674,24 @@ def estimate_text_duration(text: str) -> float:
 # ============================================================================
 
 
+@dataclass
+class MotionSessionState:
+    """
+    单次聊天会话的跨句子动作状态
+
+    引擎本身只读、进程内共享，逐句变化的状态放在这里，保证并发会话互不干扰。
+
+    Attributes:
+        active_sustained: 上一句仍在持续的动作 {动作名: {参数名: 关键帧}}
+        active_expression: 上一句生效的表情
+    """
+
+    active_sustained: dict[str, dict[str, list[tuple[float, float]]]] = field(
+        default_factory=dict
+    )
+    active_expression: str | None = None
+
+
 class MotionEngineService:
     """
     服务端动作引擎入口
@@ -674,9 +700,9 @@ class MotionEngineService:
         文本 + motions + expression → 语义检索 → 从 DB 加载预解析动作 →
         anchor 解析 → 跨句子持续动作释放 → 特殊动作覆盖 → 产出 MotionData
 
-    跨句子状态：
-        内部维护 _active_sustained 和 _active_expression，
-        每句处理后更新，下一句处理时自动对未延续的持续动作做渐出。
+    引擎只持有只读数据（embedding 矩阵、动作元数据），通过 get_motion_engine()
+    进程内共享；跨句子状态由调用方传入的 MotionSessionState 维护，
+    一般通过 create_session() 获取绑定状态的 MotionSession。
 
     Attributes:
         database: MotionDatabase 实例（含预计算 embedding）
@@ -698,15 +724,15 @@ class MotionEngineService:
         if self.database.num_entries > 0:
             self.matcher = SemanticMatcher(self.database)
 
-        # 跨句子持续动作状态：{动作名: {参数名: 目标值}}
-        self._active_sustained: dict[str, dict[str, list[tuple[float, float]]]] = {}
-        # 跨句子表情状态
-        self._active_expression: str | None = None
+    def create_session(self) -> "MotionSession":
+        """创建一个持有独立跨句子状态的会话句柄"""
+        return MotionSession(self)
 
     def _apply_sustained_release(
         self,
         curves: dict[str, list[float]],
         fps: float,
+        state: MotionSessionState,
     ) -> dict[str, list[float]]:
         """
         对上一句活跃但本句未延续的持续动作做渐出
@@ -716,11 +742,12 @@ class MotionEngineService:
         Args:
             curves: 当前句的基底曲线
             fps: 帧率
+            state: 会话跨句子状态
 
         Returns:
             dict[str, list[float]]: 渐出处理后的曲线
         """
-        if not self._active_sustained:
+        if not state.active_sustained:
             return curves
 
         release_frames = int(self.SUSTAINED_RELEASE_DURATION * fps)
@@ -728,7 +755,7 @@ class MotionEngineService:
             pid: list(vals) for pid, vals in curves.items()
         }
 
-        for action_name, params in self._active_sustained.items():
+        for action_name, params in state.active_sustained.items():
             for param_id, keyframes in params.items():
                 if param_id not in result:
                     continue
@@ -749,6 +776,7 @@ class MotionEngineService:
         motions: list[dict],
         expression: str | None = None,
         max_duration: float | None = None,
+        state: MotionSessionState | None = None,
     ) -> MotionData | None:
         """
         处理语义输入：检索 + anchor 解析 + 跨句子释放 + 覆盖混合
@@ -761,6 +789,7 @@ class MotionEngineService:
             motions: 动作列表 [{"name": str, "anchor": str, "intensity": float}, ...]
             expression: 整句表情名（None 表示沿用上一句）
             max_duration: 动作最大时长（秒），用于匹配语音时长
+            state: 会话跨句子状态，None 表示无上下文的单句处理
 
         Returns:
             MotionData | None: 混合后的动作数据
@@ -768,6 +797,9 @@ class MotionEngineService:
         if self.matcher is None or self.database.num_entries == 0:
             return None
 
+        if state is None:
+            state = MotionSessionState()
+
         # 1. 语义检索，按时长优选
         if max_duration and max_duration > 0:
             result = self.matcher.search_with_duration(text, max_duration, k=5)
@@ -809,7 +841,7 @@ class MotionEngineService:
             )
 
         # 4. 跨句子持续动作释放：上一句的持续动作渐出
-        curves = self._apply_sustained_release(curves, meta.fps)
+        curves = self._apply_sustained_release(curves, meta.fps, state)
 
         # 5. 生成并混合特殊动作覆盖
         mixed_curves = ActionOverlay.generate_all(
@@ -824,16 +856,16 @@ class MotionEngineService:
                 action_type = ACTION_METADATA.get(name, {}).get("type", "punctual")
                 if action_type == "sustained":
                     new_sustained[name] = dict(SIMPLE_ACTIONS[name])
-        self._active_sustained = new_sustained
+        state.active_sustained = new_sustained
 
         # 7. 更新跨句子表情状态
         if expression is not None:
-            self._active_expression = expression
+            state.active_expression = expression
 
         # 8. 构造输出 expression 列表
         expression_output: list[str] | None = None
-        if self._active_expression is not None:
-            expression_output = [self._active_expression]
+        if state.active_expression is not None:
+            expression_output = [state.active_expression]
 
         # 9. 时长截断
         effective_duration = meta.duration
@@ -855,3 +887,67 @@ class MotionEngineService:
             fps=meta.fps,
             expression=expression_output,
         )
+
+
+class MotionSession:
+    """
+    绑定会话状态的动作引擎句柄
+
+    每轮聊天创建一个，共享底层只读引擎，仅持有本会话的 MotionSessionState。
+    同一会话内的句子须按顺序调用 process()，以保证跨句子状态正确。
+
+    Attributes:
+        engine: 共享的 MotionEngineService
+        state: 本会话的跨句子状态
+    """
+
+    def __init__(self, engine: MotionEngineService) -> None:
+        self.engine = engine
+        self.state = MotionSessionState()
+
+    def process(
+        self,
+        text: str,
+        motions: list[dict],
+        expression: str | None = None,
+        max_duration: float | None = None,
+    ) -> MotionData | None:
+        """使用本会话状态调用 MotionEngineService.process()"""
+        return self.engine.process(
+            text, motions, expression, max_duration, state=self.state
+        )
+
+
+# ============================================================================
+# 进程级引擎注册表
+# ============================================================================
+
+_engines: dict[str, MotionEngineService] = {}
+"""db_path → 已加载的 MotionEngineService，进程内共享"""
+
+_engines_lock = threading.Lock()
+
+
+def get_motion_engine(db_path: str | None = None) -> MotionEngineService:
+    """
+    获取进程内共享的动作引擎
+
+    懒初始化：同一 db_path 只在首次调用时打开数据库并加载 embedding 矩阵，
+    之后的聊天轮次直接复用。
+
+    Args:
+        db_path: motion.db 路径，默认 Config.MOTION_DB_PATH
+
+    Returns:
+        共享的 MotionEngineService 实例
+    """
+    path = db_path or Config.MOTION_DB_PATH
+    engine = _engines.get(path)
+    if engine is not None:
+        return engine
+    with _engines_lock:
+        engine = _engines.get(path)
+        if engine is None:
+            engine = MotionEngineService(path)
+            _engines[path] = engine
+    return engine
@@ -70,15 +70,7 @@ async def generate_interaction_message(
     ).create_task_pipeline(chain=chain)
 
     try:
-        async for result in pipeline.execute():
-            await chat_context.handle_result(result)
-
-            for payload in chat_context.emit_ready():
-                yield payload
-
-        await chat_context.finalize()
-
-        for payload in chat_context.emit_ready():
+        async for payload in chat_context.stream_pipeline(pipeline):
             yield payload
 
         full_text = chat_context.get_full_text()
@@ -91,11 +83,13 @@ async def generate_interaction_message(
         )
 
     except Exception as e:
-        for task in list(chat_context.pending_tasks):
-            task.cancel()
-
         logger.error(f"[交互WS] 处理数据时出错: {e}", exc_info=True)
         yield ErrorMessage(
             error_code="INTERACTION_ERROR",
             data=f"处理数据时出错: {e}",
         )
+
+    finally:
+        # 客户端断开时同样停止仍在运行的管道、TTS 和动作任务
+        for task in list(chat_context.pending_tasks):
+            task.cancel()
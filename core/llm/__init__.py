@@ -31,10 +31,18 @@ from core.llm.prompt_manager import PromptManager, PromptTemplate
 from core.llm.response_parser import (
     ResponseParser,
     JsonLineParser,
+    IncrementalJsonLineParser,
+    PartialJsonLine,
     JsonParser,
     TextParser,
 )
 from core.llm.callback_manager import CallbackManager, CallbackEvent
+from core.llm.client_pool import (
+    get_shared_client,
+    close_shared_clients,
+    closing_shared_clients,
+    run_in_temporary_loop,
+)
 from core.llm.llm_client import (
     LLMClient,
     LLMStreamChunk,
@@ -48,6 +56,8 @@ __all__ = [
     # 响应解析
     "ResponseParser",
     "JsonLineParser",
+    "IncrementalJsonLineParser",
+    "PartialJsonLine",
     "JsonParser",
     "TextParser",
     # 回调管理
@@ -55,6 +65,10 @@ __all__ = [
     "CallbackEvent",
     # LLM 客户端
     "LLMClient",
+    "get_shared_client",
+    "close_shared_clients",
+    "closing_shared_clients",
+    "run_in_temporary_loop",
     "LLMStreamChunk",
     "ToolCallResult",
 ]
@@ -0,0 +1,159 @@
+"""
+LLM 客户端连接池
+
+所有 LLMClient 实例按 (api, key) 共享同一个 AsyncOpenAI 客户端及其 httpx 连接池，
+避免每轮聊天新建连接池、重复 TCP/TLS 握手。
+
+连接池配置（config.yaml → LLMClientPool，均可省略）：
+- max_connections: 最大连接数
+- max_keepalive_connections: 最大空闲保活连接数
+- keepalive_expiry: 空闲连接保活时长（秒）
+- http2: 是否启用 HTTP/2（需要安装 h2，未安装时自动回退 HTTP/1.1）
+
+httpx 连接与创建它的事件循环绑定，而部分同步代码会在临时事件循环中调用 LLM，
+因此客户端按事件循环分别缓存；事件循环被回收后其缓存随之释放。
+临时事件循环应通过 run_in_temporary_loop() / closing_shared_clients() 运行，
+在循环结束前关闭其上创建的客户端，否则连接只能等待垃圾回收。
+
+使用示例：
+```python
+client = get_shared_client(api, key)
+await client.chat.completions.create(...)
+
+# 应用退出时
+await close_shared_clients()
+
+# 同步代码中临时调用 LLM：结束时自动关闭该循环上的客户端
+result = run_in_temporary_loop(some_coroutine())
+```
+"""
+
+import asyncio
+import importlib.util
+import weakref
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from my_utils import config_manager as CConfig
+from my_utils.log import logger as Log
+
+T = TypeVar("T")
+
+# 连接池默认配置
+DEFAULT_POOL_CONFIG = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 60.0,
+    "http2": False,
+}
+
+_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+"""事件循环 → {(api, key): AsyncOpenAI}，事件循环被回收后对应条目自动移除"""
+
+
+def _get_pool_config() -> dict:
+    """读取连接池配置，缺省项使用默认值"""
+    config = dict(DEFAULT_POOL_CONFIG)
+    config.update(CConfig.config.get("LLMClientPool", {}) or {})
+    return config
+
+
+def _create_client(api: str, key: str) -> AsyncOpenAI:
+    """按连接池配置创建 AsyncOpenAI 客户端"""
+    config = _get_pool_config()
+
+    http2 = bool(config["http2"])
+    if http2 and importlib.util.find_spec("h2") is None:
+        Log.warning("[LLM连接池] 未安装 h2，HTTP/2 不可用，回退到 HTTP/1.1")
+        http2 = False
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=int(config["max_connections"]),
+            max_keepalive_connections=int(config["max_keepalive_connections"]),
+            keepalive_expiry=float(config["keepalive_expiry"]),
+        ),
+        http2=http2,
+    )
+    return AsyncOpenAI(api_key=key, base_url=api, http_client=http_client)
+
+
+def _current_loop_pool() -> dict[tuple[str, str], AsyncOpenAI]:
+    """获取当前事件循环的客户端缓存"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = {}
+        _pools[loop] = pool
+    return pool
+
+
+def get_shared_client(api: str, key: str) -> AsyncOpenAI:
+    """
+    获取共享的 AsyncOpenAI 客户端
+
+    同一事件循环内，相同 (api, key) 始终返回同一个客户端，连接可跨请求复用。
+    必须在事件循环内调用。
+
+    参数：
+    - api: 接口地址（base_url）
+    - key: API Key
+
+    返回：
+    - AsyncOpenAI 客户端实例
+    """
+    pool = _current_loop_pool()
+    client = pool.get((api, key))
+    if client is None:
+        client = _create_client(api, key)
+        pool[(api, key)] = client
+        Log.debug(f"[LLM连接池] 新建客户端: {api}")
+    return client
+
+
+async def close_shared_clients() -> None:
+    """关闭当前事件循环中的所有共享客户端（应用退出时调用）"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.pop(loop, None)
+    if not pool:
+        return
+    for client in pool.values():
+        try:
+            await client.close()
+        except Exception as e:
+            Log.warning(f"[LLM连接池] 关闭客户端失败: {e}")
+    Log.info(f"[LLM连接池] 已关闭 {len(pool)} 个共享客户端")
+
+
+async def closing_shared_clients(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    运行协程，结束时（含异常）关闭当前事件循环中的共享客户端
+
+    用于包装在临时事件循环中运行的顶层协程，不要在长期运行的主事件循环中使用。
+
+    参数：
+    - coro: 要运行的协程
+
+    返回：
+    - 协程的返回值
+    """
+    try:
+        return await coro
+    finally:
+        await close_shared_clients()
+
+
+def run_in_temporary_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    在新建的临时事件循环中运行协程（asyncio.run），循环关闭前释放其上的共享客户端
+
+    参数：
+    - coro: 要运行的协程
+
+    返回：
+    - 协程的返回值
+    """
+    return asyncio.run(closing_shared_clients(coro))
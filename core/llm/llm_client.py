@@ -35,6 +35,7 @@ from my_utils import config_manager as CConfig
 from my_utils.log import logger as Log
 from core.llm.response_parser import ResponseParser, StreamParserProtocol, TextParser
 from core.llm.callback_manager import CallbackManager, CallbackEvent
+from core.llm.client_pool import get_shared_client
 
 
 @dataclass
@@ -110,7 +111,6 @@ class LLMClient:
         """
         self._model_key = model_key
         self._callbacks = CallbackManager()
-        self._clients: dict[str, AsyncOpenAI] = {}
 
     @property
     def callbacks(self) -> CallbackManager:
@@ -119,7 +119,10 @@ class LLMClient:
 
     def _get_client(self, model_key: str) -> AsyncOpenAI:
         """
-        获取或创建 OpenAI 客户端
+        获取 OpenAI 客户端
+
+        从进程级连接池获取按 (api, key) 共享的客户端，
+        所有 LLMClient 实例复用同一连接池；配置变更后自动使用新的客户端。
 
         参数：
         - model_key: 模型配置键名
@@ -127,13 +130,8 @@ class LLMClient:
         返回：
         - AsyncOpenAI 客户端实例
         """
-        if model_key not in self._clients:
-            config = CConfig.config.get(model_key, {})
-            self._clients[model_key] = AsyncOpenAI(
-                api_key=config.get("key", ""),
-                base_url=config.get("api", ""),
-            )
-        return self._clients[model_key]
+        config = CConfig.config.get(model_key, {})
+        return get_shared_client(config.get("api", ""), config.get("key", ""))
 
     def _get_model_config(self, model_key: str) -> dict:
         """
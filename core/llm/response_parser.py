@@ -7,6 +7,7 @@
 - TextParser: 纯文本解析（默认）
 - JsonParser: JSON 对象解析
 - JsonLineParser: JSON 行解析（流式友好）
+- IncrementalJsonLineParser: JSON 行解析，首字段字符串闭合即提前产出
 
 自定义解析器：
 继承 ResponseParser 并实现 parse/stream_parse 方法。
@@ -384,3 +385,114 @@ class JsonLineParser(ResponseParser[dict[str, Any], list[dict[str, Any]]]):
             except json.JSONDecodeError:
                 pass
         self._buffer = ""
+
+
+class PartialJsonLine(dict):
+    """
+    未完成 JSON 行中提前解析出的字段
+
+    由 IncrementalJsonLineParser 产出，类型本身即“部分数据”标记；
+    同一行完整解析后还会再产出一次完整对象。
+    """
+
+
+class IncrementalJsonLineParser(JsonLineParser):
+    """
+    增量 JSON 行解析器
+
+    在 JsonLineParser 的基础上，当一行 JSON 的首个字段（默认 text）的字符串值
+    闭合时立即产出 PartialJsonLine({"text": ...})，不必等待同一行后续的
+    actions / expression 等字段；整行结束后仍产出完整对象。
+
+    仅识别位于行首的字段（与任务提示词中的输出示例一致），
+    其他位置的字段按整行解析处理，结果与 JsonLineParser 相同。
+
+    输出示例：
+    ```
+    {"text": "你好", "actions": {...}}
+    ```
+    流式产出：
+    ```
+    PartialJsonLine({"text": "你好"})               # text 闭合时
+    {"text": "你好", "actions": {...}}             # 行结束时
+    ```
+    """
+
+    # 行首字段：{"<key>": "<字符串值>"
+    _LEADING_KEY = re.compile(r'\s*\{\s*"((?:[^"\\]|\\.)*)"\s*:')
+    _STRING_VALUE = re.compile(r'\s*("(?:[^"\\]|\\.)*")')
+
+    def __init__(self, separator: str = "\n", early_field: str = "text"):
+        """
+        初始化增量 JSON 行解析器
+
+        参数：
+        - separator: 行分隔符（默认换行符）
+        - early_field: 需要提前产出的行首字段名
+        """
+        super().__init__(separator)
+        self._early_field = early_field
+        # 当前未完成行是否已处理完提前字段（已产出或确定不会产出）
+        self._early_done = False
+
+    def reset(self) -> None:
+        """重置缓冲区和行状态"""
+        super().reset()
+        self._early_done = False
+
+    def _try_early_field(self) -> PartialJsonLine | None:
+        """尝试从未完成行中解析行首字段，返回 None 表示暂不可产出"""
+        key_match = self._LEADING_KEY.match(self._buffer)
+        if key_match is None:
+            stripped = self._buffer.lstrip()
+            # 行首已经不可能构成 {"key": 形式，放弃本行
+            if stripped and not stripped.startswith("{"):
+                self._early_done = True
+            return None
+
+        if key_match.group(1) != self._early_field:
+            self._early_done = True
+            return None
+
+        value_match = self._STRING_VALUE.match(self._buffer, key_match.end())
+        if value_match is None:
+            rest = self._buffer[key_match.end() :].lstrip()
+            # 值不是字符串，放弃本行
+            if rest and not rest.startswith('"'):
+                self._early_done = True
+            return None
+
+        self._early_done = True
+        try:
+            value = json.loads(value_match.group(1))
+        except json.JSONDecodeError:
+            return None
+        return PartialJsonLine({self._early_field: value})
+
+    def stream_parse(self, token: str) -> Iterator[dict[str, Any]]:
+        """
+        流式解析
+
+        先按行产出完整 JSON 对象，再检查剩余未完成行的行首字段是否已闭合。
+
+        参数：
+        - token: 单个 token
+
+        产出：
+        - PartialJsonLine（提前字段）或完整的 JSON 对象
+        """
+        had_line = self._separator in self._buffer + token
+        yield from super().stream_parse(token)
+        if had_line:
+            # 已进入新行
+            self._early_done = False
+
+        if not self._early_done and self._buffer:
+            partial = self._try_early_field()
+            if partial is not None:
+                yield partial
+
+    def flush(self) -> Iterator[dict[str, Any]]:
+        """刷新缓冲区，处理剩余内容"""
+        yield from super().flush()
+        self._early_done = False
@@ -7,6 +7,7 @@
 1. 流式解析 JSON 行（每行一个 JSON 对象）
 2. 根据已注册的任务，从 JSON 中提取对应字段
 3. 句子 ID 自动分配（同一行的 text 和 actions 共享同一 ID）
+4. 支持增量输入：行首 text 先以 PartialJsonLine 到达，整行到达时只补发其余字段
 
 输入格式（LLM 输出）：
 ```
@@ -27,6 +28,7 @@ from collections.abc import Generator
 from typing import Any
 import time
 from core.scheduler.parsers.base_parser import BaseParser
+from core.llm.response_parser import PartialJsonLine
 from my_utils.log import logger as Log
 from core.scheduler.task import Task, TaskResult
 
@@ -58,6 +60,8 @@ class MultiParser(BaseParser):
         self._sentence_counter: int = 0
         # 上一次的文本内容（用于检测新句子）
         self._last_text: str = ""
+        # 已通过部分数据提前产出的字段 {sentence_id: {field_name}}
+        self._partial_fields: dict[int, set[str]] = {}
 
     def register_task(self, task: Task) -> None:
         """
@@ -79,6 +83,7 @@ class MultiParser(BaseParser):
         if not keep_counter:
             self._sentence_counter = 0
         self._last_text = ""
+        self._partial_fields.clear()
 
     def _get_sentence_id(self, data: dict[str, Any]) -> int:
         """
@@ -146,10 +151,22 @@ class MultiParser(BaseParser):
         产出：
         - TaskResult 实例
         """
+        sentence_id = self._get_sentence_id(data)
+        is_partial = isinstance(data, PartialJsonLine)
+        if is_partial:
+            emitted = self._partial_fields.setdefault(sentence_id, set())
+        else:
+            # 整行到达：跳过已由部分数据提前产出的字段
+            emitted = self._partial_fields.pop(sentence_id, set())
+
         # 遍历已注册的任务，提取数据
         for task in self._tasks.values():
+            if task.field_name in emitted:
+                continue
             result = self._extract_task_data(data, task)
             if result is not None:
+                if is_partial:
+                    emitted.add(task.field_name)
                 yield result
 
     @property
@@ -41,6 +41,12 @@ from core.scheduler.task import TaskResult
 # 句尾标点符号模式
 SENTENCE_END_PATTERNS = ("。", "！", "？", "……\n", "……", "...\n", "...")
 
+# 按长度降序排列的句尾模式（同一位置优先匹配最长模式）
+_SORTED_END_PATTERNS = tuple(sorted(SENTENCE_END_PATTERNS, key=len, reverse=True))
+
+# 最长句尾模式长度：某位置的命中结果最多依赖其后这么多个字符
+_MAX_PATTERN_LENGTH = len(_SORTED_END_PATTERNS[0])
+
 # 最小句子长度（避免太短的句子触发 TTS）
 MIN_SENTENCE_LENGTH = 6
 
@@ -136,8 +142,12 @@ class TextStreamParser(BaseParser):
         self._task_type = task_type
         self._task_name = task_name
 
-        # 普通文本缓存（不包含括号段）
-        self._sentence_buffer = ""
+        # 普通文本缓存（不包含括号段），按字符存储以避免逐字符拼接字符串
+        self._sentence_chars: list[str] = []
+
+        # 增量扫描状态：已确定不会再变化的扫描位置，及其之前的非空白字符数
+        self._scan_pos = 0
+        self._scan_nonspace = 0
 
         # 括号段缓存：括号内容单独成段，优先保证完整
         self._bracket_buffer = ""
@@ -156,7 +166,9 @@ class TextStreamParser(BaseParser):
         参数：
         - keep_counter: 是否保留句子计数器（默认 False）
         """
-        self._sentence_buffer = ""
+        self._sentence_chars = []
+        self._scan_pos = 0
+        self._scan_nonspace = 0
         self._bracket_buffer = ""
         self._segment_bracket_stack = []
         if not keep_counter:
@@ -175,11 +187,51 @@ class TextStreamParser(BaseParser):
         返回：
         - 命中长度（0 表示未命中）
         """
-        for pattern in sorted(SENTENCE_END_PATTERNS, key=len, reverse=True):
+        for pattern in _SORTED_END_PATTERNS:
             if text.startswith(pattern, idx):
                 return len(pattern)
         return 0
 
+    def _scan_boundary(self) -> int:
+        """
+        从上次确定的位置继续扫描普通文本缓存，查找可输出的句尾
+
+        扫描规则与从头扫描一致：逐位置按最长模式检测句尾，
+        句尾之前的非空白字符数未达到 MIN_SENTENCE_LENGTH 时越过该句尾继续扫描。
+        位置之后至少有 _MAX_PATTERN_LENGTH 个字符时，其命中结果不会再因新字符改变，
+        扫描进度才会被记录；缓存末尾的少量位置每次重新检测。
+
+        返回：
+        - 句尾结束位置（-1 表示暂无可输出句子）
+        """
+        chars = self._sentence_chars
+        length = len(chars)
+        i = self._scan_pos
+        nonspace = self._scan_nonspace
+        committed = True
+
+        while i < length:
+            is_final = length - i >= _MAX_PATTERN_LENGTH
+            window = "".join(chars[i : i + _MAX_PATTERN_LENGTH])
+            hit_len = self._is_sentence_end_at(window, 0)
+            if hit_len > 0:
+                nonspace += sum(1 for ch in window[:hit_len] if not ch.isspace())
+                if nonspace >= MIN_SENTENCE_LENGTH:
+                    return i + hit_len
+                i += hit_len
+            else:
+                if not chars[i].isspace():
+                    nonspace += 1
+                i += 1
+
+            if committed and is_final:
+                self._scan_pos = i
+                self._scan_nonspace = nonspace
+            else:
+                committed = False
+
+        return -1
+
     def _extract_plain_segments(self, force_flush: bool = False) -> list[str]:
         """
         从普通文本缓存中提取可输出片段
@@ -193,31 +245,22 @@ class TextStreamParser(BaseParser):
         ready: list[str] = []
 
         while True:
-            boundary_end = -1
-            i = 0
-            while i < len(self._sentence_buffer):
-                hit_len = self._is_sentence_end_at(self._sentence_buffer, i)
-                if hit_len > 0:
-                    boundary_end = i + hit_len
-                    candidate = self._sentence_buffer[:boundary_end]
-                    cleaned = "".join(candidate.split())
-                    if len(cleaned) >= MIN_SENTENCE_LENGTH:
-                        break
-                    i = boundary_end
-                    boundary_end = -1
-                    continue
-                i += 1
-
+            boundary_end = self._scan_boundary()
             if boundary_end < 0:
                 break
 
-            candidate = self._sentence_buffer[:boundary_end]
-            ready.append(candidate)
-            self._sentence_buffer = self._sentence_buffer[boundary_end:]
+            ready.append("".join(self._sentence_chars[:boundary_end]))
+            del self._sentence_chars[:boundary_end]
+            self._scan_pos = 0
+            self._scan_nonspace = 0
 
-        if force_flush and self._sentence_buffer.strip():
-            ready.append(self._sentence_buffer)
-            self._sentence_buffer = ""
+        if force_flush:
+            remaining = "".join(self._sentence_chars)
+            if remaining.strip():
+                ready.append(remaining)
+                self._sentence_chars = []
+                self._scan_pos = 0
+                self._scan_nonspace = 0
 
         return ready
 
@@ -326,7 +369,7 @@ class TextStreamParser(BaseParser):
                 self._bracket_buffer = ch
                 continue
 
-            self._sentence_buffer += ch
+            self._sentence_chars.append(ch)
             for plain_segment in self._extract_plain_segments(force_flush=False):
                 yield from self._emit_segment(plain_segment)
 
@@ -20,7 +20,11 @@ from openai.types.chat import (
 from core.message_chain import MessageChain
 from my_utils.log import logger as Log
 from core.llm import LLMClient
-from core.llm.response_parser import JsonLineParser, TextParser
+from core.llm.response_parser import (
+    IncrementalJsonLineParser,
+    JsonLineParser,
+    TextParser,
+)
 from core.scheduler.task import (
     Task,
     TaskResult,
@@ -108,6 +112,7 @@ class TaskScheduler:
         创建多行 JSON 返回处理管道
 
         支持 Function Calling 工具调用。
+        使用增量 JSON 行解析：每行的 text 字段闭合即产出，其余字段整行到达后补发。
         on_tool_event: 工具调用/结果实时回调（用于追加到 chat_history）
         """
 
@@ -119,7 +124,7 @@ class TaskScheduler:
 
         return Pipeline(
             messages=chain.build(),
-            llm_parser=JsonLineParser(),
+            llm_parser=IncrementalJsonLineParser(),
             task_parser=parser,
             max_retries=max_retries,
             retry_delay=retry_delay,
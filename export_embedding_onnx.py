@@ -0,0 +1,64 @@
+# 导出 embedding 模型为 ONNX（可选 int8 动态量化），并校验与 torch 输出的一致性
+# 与 torch 后端的延迟 / 内存对比：python -m bench.bench_embedding_onnx
+import argparse
+
+import numpy as np
+
+from my_utils import embedding, embedding_onnx
+
+# 一致性校验语料
+PARITY_CORPUS = [
+    "你好呀，今天过得怎么样？",
+    "我最喜欢的食物是草莓蛋糕。",
+    "明天要下雨，记得带伞。",
+    "她在图书馆里读了一下午的书。",
+    "这个世界的魔法需要以记忆作为代价。",
+    "The quick brown fox jumps over the lazy dog.",
+    "嗯",
+    "我们第一次见面是在樱花盛开的季节，那天风很大，花瓣落了一地。",
+]
+
+
+def _cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """逐行余弦相似度"""
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+
+def check_parity(model_path: str) -> float:
+    """
+    逐条比较 ONNX 与 torch 的句向量
+
+    返回：
+    - 语料中最小的余弦相似度
+    """
+    torch_vectors = embedding.torch_t2vect(embedding.load_torch_model(), PARITY_CORPUS)
+    onnx_vectors = embedding_onnx.onnx_t2vect(
+        embedding_onnx.load_onnx_model(model_path), PARITY_CORPUS
+    )
+    return float(np.min(_cosine_rows(torch_vectors, onnx_vectors)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导出 embedding 模型为 ONNX")
+    parser.add_argument("--output-dir", default=None, help="导出目录，默认为模型目录下的 onnx/")
+    parser.add_argument("--no-quantize", action="store_true", help="不生成 int8 量化模型")
+    parser.add_argument(
+        "--min-cosine", type=float, default=0.99, help="一致性校验的最小余弦相似度"
+    )
+    args = parser.parse_args()
+
+    model_path = embedding_onnx.export_onnx_model(
+        args.output_dir, quantize=not args.no_quantize
+    )
+    print(f"已导出: {model_path}")
+
+    min_cosine = check_parity(model_path)
+    print(f"与 torch 输出的最小余弦相似度: {min_cosine:.5f}")
+    if min_cosine < args.min_cosine:
+        raise SystemExit(f"一致性校验未通过（阈值 {args.min_cosine}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import os
 from my_utils.logo import print_moechat_logo
 from my_utils.version import get_project_version
 from my_utils.memory_cleanup import cleanup
+from my_utils import embedding
 from services.assistant_service import AssistantService
 from tool_system.core.registry import get_registry as get_tool_registry
 
@@ -21,6 +22,8 @@ async def init():
         logger.info(f"当前版本为: {get_project_version()}")
 
         await create_data_folder()
+        # embedding 模型在后台线程加载，与助手、工具初始化并行
+        embedding.start_warmup()
         # await check_and_download_default_assistant()
         await initialize_assistant()
         await initialize_tools()
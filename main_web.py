@@ -1,4 +1,5 @@
 import asyncio
+from core.llm import closing_shared_clients
 from init_server import init
 from router.router import app
 import uvicorn
@@ -8,8 +9,8 @@ def start_server():
     """
     启动主服务器
     """
-    # 等待初始化完成
-    asyncio.get_event_loop().run_until_complete(init())
+    # 等待初始化完成；初始化使用的事件循环与 uvicorn 的不同，结束时关闭其上的 LLM 连接
+    asyncio.get_event_loop().run_until_complete(closing_shared_clients(init()))
     # 启动web服务，应该在最后
     uvicorn.run(app, host="0.0.0.0", port=8001)
 
@@ -1,17 +1,72 @@
-from transformers import AutoTokenizer, AutoModel
-import torch
+"""
+文本向量化（GTE 中文句向量模型）
+
+模型在首次使用时才加载，导入本模块不再阻塞在读取模型文件上：
+- warmup(): 同步加载模型并执行一次预热推理
+- start_warmup(): 在后台线程中执行 warmup，供启动流程与其他初始化并行
+- is_ready(): 就绪探针，模型加载完成后返回 True
+- 预热完成前调用 t2vect 会等待正在进行的加载，而不会重复加载
+
+推理后端（config.yaml → Embedding，均可省略）：
+- backend: torch（默认）/ onnx，onnx 使用 onnxruntime 在 CPU 上推理导出的模型
+- onnx_quantized: onnx 后端是否使用 int8 动态量化模型，默认 true（与 export_embedding_onnx.py 默认导出的模型一致）
+- onnx_dir: 导出目录，默认为 embedding 模型目录下的 onnx/
+- onnx_threads: onnx 推理线程数，0 表示自动
+"""
+
+import os
+import threading
+import time
+
 import numpy as np
 from Config import Config
+from my_utils import config_manager as CConfig
+from my_utils.log import logger as Log
+
 
+def _get_backend_config() -> dict:
+    """读取推理后端配置"""
+    config = CConfig.config.get("Embedding", {}) or {}
+    return {
+        "backend": str(config.get("backend", "torch")).lower(),
+        "onnx_quantized": bool(config.get("onnx_quantized", True)),
+        "onnx_dir": config.get("onnx_dir") or None,
+        "onnx_threads": int(config.get("onnx_threads", 0)),
+    }
 
-def _get_device() -> torch.device:
+
+def _get_device():
     """自动选择可用设备，优先 CUDA"""
+    import torch
+
     if torch.cuda.is_available():
         return torch.device("cuda")
     return torch.device("cpu")
 
 
 def load_model():
+    backend_config = _get_backend_config()
+    if backend_config["backend"] == "onnx":
+        from my_utils import embedding_onnx
+
+        model_path = embedding_onnx.get_onnx_model_path(
+            backend_config["onnx_dir"], backend_config["onnx_quantized"]
+        )
+        Log.info(f"[Embedding] 使用 ONNX Runtime 后端: {model_path}")
+        model_data = embedding_onnx.load_onnx_model(
+            model_path, backend_config["onnx_threads"]
+        )
+        model_data["backend"] = "onnx"
+        return model_data
+
+    return load_torch_model()
+
+
+def load_torch_model() -> dict:
+    """加载 torch 版模型"""
+    import torch
+    from transformers import AutoTokenizer, AutoModel
+
     device = _get_device()
 
     tokenizer = AutoTokenizer.from_pretrained(Config.EMBEDDING_MODEL_PATH)
@@ -25,14 +80,98 @@ def load_model():
 
     model = model.to(device)
     model.eval()
-    return {"tokenizer": tokenizer, "model": model, "device": device}
+    return {"tokenizer": tokenizer, "model": model, "device": device, "backend": "torch"}
+
+
+_embedding_model: dict | None = None
+_load_lock = threading.Lock()
+_warmup_thread: threading.Thread | None = None
+
+
+def get_model() -> dict:
+    """
+    获取已加载的模型，未加载时在当前线程加载
+
+    加载过程由锁保护：并发调用（包括后台预热）只会加载一次，其余调用方等待加载完成。
+    """
+    global _embedding_model
+    if _embedding_model is None:
+        with _load_lock:
+            if _embedding_model is None:
+                start = time.perf_counter()
+                _embedding_model = load_model()
+                Log.info(
+                    f"[Embedding] 模型加载完成，耗时 {time.perf_counter() - start:.2f}s"
+                )
+    return _embedding_model
 
 
-embedding_model = load_model()
+def is_ready() -> bool:
+    """模型是否已加载完成"""
+    return _embedding_model is not None
+
+
+def warmup() -> None:
+    """加载模型并执行一次推理，使首个真实请求不承担初始化开销"""
+    get_model()
+    t2vect(["预热"])
+
+
+def start_warmup() -> threading.Thread:
+    """
+    在后台线程中执行 warmup，重复调用返回同一线程
+
+    返回：
+    - 预热线程
+    """
+    global _warmup_thread
+
+    def runner():
+        try:
+            warmup()
+        except Exception as e:
+            Log.error(f"[Embedding] 模型预热失败: {e}", exc_info=True)
+
+    with _load_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=runner, name="embedding-warmup", daemon=True
+            )
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+# 池化方式标识：并入模型标识，池化方式改变后已持久化的向量缓存与索引随之失效
+POOLING = "masked-mean"
+
+
+def get_model_id() -> str:
+    """当前 embedding 模型标识（含推理后端与池化方式），用于区分不同模型产生的向量缓存"""
+    model_name = os.path.basename(os.path.normpath(Config.EMBEDDING_MODEL_PATH))
+    backend_config = _get_backend_config()
+    if backend_config["backend"] == "onnx":
+        suffix = "onnx-int8" if backend_config["onnx_quantized"] else "onnx"
+        model_name = f"{model_name}:{suffix}"
+    return f"{model_name}:{POOLING}"
 
 
 def t2vect(text: list[str]) -> np.ndarray:
-    model_data = embedding_model
+    model_data = get_model()
+    if model_data["backend"] == "onnx":
+        from my_utils import embedding_onnx
+
+        return embedding_onnx.onnx_t2vect(model_data, text)
+    return torch_t2vect(model_data, text)
+
+
+def torch_t2vect(model_data: dict, text: list[str]) -> np.ndarray:
+    """
+    使用 torch 模型编码文本（按 attention_mask 的均值池化）
+
+    padding 位置不参与平均，同一文本无论与哪些文本同批推理，结果都相同。
+    """
+    import torch
+
     tokenizer = model_data["tokenizer"]
     model = model_data["model"]
     device = model_data["device"]
@@ -45,6 +184,8 @@ def t2vect(text: list[str]) -> np.ndarray:
 
     with torch.no_grad():
         outputs = model(**inputs)
-        embeddings = outputs.last_hidden_state.mean(dim=1)
+        mask = inputs["attention_mask"].unsqueeze(-1).to(outputs.last_hidden_state.dtype)
+        summed = (outputs.last_hidden_state * mask).sum(dim=1)
+        embeddings = summed / mask.sum(dim=1).clamp(min=1e-9)
 
     return embeddings.cpu().numpy()
@@ -0,0 +1,211 @@
+"""
+Embedding 微批处理器
+
+多个线程池（助手执行器、run_in_executor、记忆模块）会同时调用 t2vect，
+各自单独前向推理既重复付出模型开销，又在 torch 线程上互相争抢。
+本模块用一个后台线程串行执行推理：在很短的时间窗口内（默认 3 ms）
+收集同时到达的请求，合并为一次 padding 后的批量推理，再把结果按请求拆分返回。
+
+同时提供同步与异步接口：
+- submit(texts) -> concurrent.futures.Future
+- encode(texts) -> np.ndarray（阻塞等待）
+- encode_async(texts) -> np.ndarray（在事件循环中等待，不阻塞循环）
+
+批处理配置（config.yaml → Embedding，均可省略）：
+- batch_window_ms: 合批等待窗口（毫秒），0 表示不合批、直接在调用线程推理
+- max_batch_size: 单批最多文本条数
+
+超过 max_batch_size 的请求（知识库 / 记忆重建时的批量编码）按上限切片，
+上一片推理完成后才排入下一片：期间到达的检索查询可以插队，最多只需等待一片的推理，
+也避免一次超大 padding 批次带来的内存峰值。
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from my_utils import config_manager as CConfig
+from my_utils import embedding
+from my_utils.log import logger as Log
+
+DEFAULT_BATCH_WINDOW_MS = 3.0
+DEFAULT_MAX_BATCH_SIZE = 64
+
+
+class EmbeddingBatcher:
+    """
+    t2vect 的微批处理前端
+
+    Attributes:
+        window_sec: 合批等待窗口（秒）
+        max_batch_size: 单批最多文本条数（超过此值的请求切片后依次排队）
+    """
+
+    def __init__(
+        self,
+        window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ):
+        self.window_sec = max(0.0, float(window_ms)) / 1000.0
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._queue: queue.SimpleQueue[tuple[list[str], Future]] = queue.SimpleQueue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        """首次提交时启动后台推理线程"""
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, texts: list[str]) -> Future:
+        """
+        提交一组文本，返回结果 Future
+
+        参数：
+        - texts: 文本列表
+
+        返回：
+        - Future，结果为 (len(texts), D) 的 t2vect 原始输出
+        """
+        future: Future = Future()
+        texts = list(texts)
+        if not texts:
+            future.set_result(np.empty((0, 0), dtype=np.float32))
+            return future
+        if self.window_sec <= 0:
+            try:
+                future.set_result(
+                    np.concatenate(
+                        [
+                            embedding.t2vect(texts[i : i + self.max_batch_size])
+                            for i in range(0, len(texts), self.max_batch_size)
+                        ]
+                    )
+                )
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        if len(texts) > self.max_batch_size:
+            return self._submit_chunked(texts)
+
+        self._ensure_worker()
+        self._queue.put((texts, future))
+        return future
+
+    def _submit_chunked(self, texts: list[str]) -> Future:
+        """
+        按 max_batch_size 切片提交超大请求，上一片完成后再排入下一片
+
+        参数：
+        - texts: 超过 max_batch_size 的文本列表
+
+        返回：
+        - Future，结果为各片推理结果按原顺序拼接
+        """
+        future: Future = Future()
+        parts: list[np.ndarray] = []
+
+        def submit_from(offset: int) -> None:
+            chunk = self.submit(texts[offset : offset + self.max_batch_size])
+            chunk.add_done_callback(lambda done: on_chunk_done(done, offset))
+
+        def on_chunk_done(chunk: Future, offset: int) -> None:
+            # 回调在推理线程上执行；调用方已取消时不再排入后续切片
+            if future.cancelled():
+                return
+            if chunk.cancelled():
+                future.cancel()
+                return
+            error = chunk.exception()
+            if error is not None:
+                future.set_exception(error)
+                return
+            parts.append(chunk.result())
+            next_offset = offset + self.max_batch_size
+            if next_offset < len(texts):
+                submit_from(next_offset)
+            else:
+                future.set_result(np.concatenate(parts))
+
+        submit_from(0)
+        return future
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """同步编码：阻塞直到所在批次推理完成"""
+        return self.submit(texts).result()
+
+    async def encode_async(self, texts: list[str]) -> np.ndarray:
+        """异步编码：在事件循环中等待所在批次推理完成"""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def _collect_batch(self) -> list[tuple[list[str], Future]]:
+        """阻塞取出首个请求，再在窗口期内收集后续请求直到达到批量上限"""
+        first = self._queue.get()
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.window_sec
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self) -> None:
+        """后台推理循环"""
+        while True:
+            batch = self._collect_batch()
+            # 跳过调用方已取消的请求
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            # 批内相同文本只推理一次
+            unique: dict[str, int] = {}
+            for texts, _ in batch:
+                for text in texts:
+                    unique.setdefault(text, len(unique))
+
+            try:
+                vectors = embedding.t2vect(list(unique))
+            except Exception as e:
+                Log.error(f"[Embedding批处理] 推理失败: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for texts, future in batch:
+                rows = [unique[text] for text in texts]
+                future.set_result(vectors[rows])
+
+
+def _create_batcher() -> EmbeddingBatcher:
+    """按配置创建批处理器"""
+    config = CConfig.config.get("Embedding", {}) or {}
+    return EmbeddingBatcher(
+        window_ms=float(config.get("batch_window_ms", DEFAULT_BATCH_WINDOW_MS)),
+        max_batch_size=int(config.get("max_batch_size", DEFAULT_MAX_BATCH_SIZE)),
+    )
+
+
+_batcher = _create_batcher()
+
+
+def get_batcher() -> EmbeddingBatcher:
+    """获取进程级共享的批处理器"""
+    return _batcher
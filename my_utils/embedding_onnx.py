@@ -0,0 +1,162 @@
+"""
+Embedding ONNX Runtime 后端
+
+将 GTE 句向量模型导出为 ONNX（可选 int8 动态量化），在无 GPU 的服务器上
+通过 onnxruntime 推理，替代全精度 torch 模型。
+
+输出与 torch 后端一致：取 last_hidden_state 在序列维度上的均值，
+tokenizer 参数（padding / truncation / max_length=100）保持相同。
+
+导出命令见项目根目录 export_embedding_onnx.py；启用方式（config.yaml）：
+```yaml
+Embedding:
+  backend: onnx
+  onnx_quantized: true
+```
+"""
+
+import inspect
+import os
+
+import numpy as np
+from Config import Config
+
+# 导出文件名
+ONNX_MODEL_NAME = "model.onnx"
+ONNX_INT8_MODEL_NAME = "model.int8.onnx"
+
+# 默认导出目录（位于 embedding 模型目录下）
+DEFAULT_ONNX_DIR = os.path.join(Config.EMBEDDING_MODEL_PATH, "onnx")
+
+
+def get_onnx_model_path(onnx_dir: str | None = None, quantized: bool = False) -> str:
+    """
+    获取 ONNX 模型文件路径
+
+    参数：
+    - onnx_dir: 导出目录，None 时使用 DEFAULT_ONNX_DIR
+    - quantized: 是否为 int8 量化模型
+
+    返回：
+    - 模型文件路径
+    """
+    name = ONNX_INT8_MODEL_NAME if quantized else ONNX_MODEL_NAME
+    return os.path.join(onnx_dir or DEFAULT_ONNX_DIR, name)
+
+
+def load_onnx_model(model_path: str, num_threads: int = 0) -> dict:
+    """
+    加载 ONNX 模型与 tokenizer
+
+    参数：
+    - model_path: ONNX 模型文件路径
+    - num_threads: 推理线程数，0 表示由 onnxruntime 自动决定
+
+    返回：
+    - {"tokenizer", "session", "input_names"}
+    """
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(
+            f"ONNX 模型不存在: {model_path}，请先运行 python export_embedding_onnx.py 导出"
+        )
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads > 0:
+        options.intra_op_num_threads = num_threads
+
+    session = ort.InferenceSession(
+        model_path, sess_options=options, providers=["CPUExecutionProvider"]
+    )
+    tokenizer = AutoTokenizer.from_pretrained(Config.EMBEDDING_MODEL_PATH)
+    return {
+        "tokenizer": tokenizer,
+        "session": session,
+        "input_names": [i.name for i in session.get_inputs()],
+    }
+
+
+def onnx_t2vect(model_data: dict, text: list[str]) -> np.ndarray:
+    """
+    使用 ONNX 模型编码文本，输出与 torch 后端的 t2vect 对齐（按 attention_mask 的均值池化）
+
+    参数：
+    - model_data: load_onnx_model 的返回值
+    - text: 文本列表
+
+    返回：
+    - (len(text), D) float32 数组（未归一化）
+    """
+    inputs = model_data["tokenizer"](
+        text, padding=True, truncation=True, return_tensors="np", max_length=100
+    )
+    feeds = {
+        name: np.asarray(inputs[name], dtype=np.int64)
+        for name in model_data["input_names"]
+        if name in inputs
+    }
+    last_hidden_state = model_data["session"].run(None, feeds)[0]
+    mask = np.asarray(inputs["attention_mask"], dtype=np.float32)[:, :, None]
+    summed = (last_hidden_state * mask).sum(axis=1)
+    return (summed / np.maximum(mask.sum(axis=1), 1e-9)).astype(np.float32)
+
+
+def export_onnx_model(onnx_dir: str | None = None, quantize: bool = True) -> str:
+    """
+    将 torch 模型导出为 ONNX，可选再做 int8 动态量化
+
+    参数：
+    - onnx_dir: 导出目录，None 时使用 DEFAULT_ONNX_DIR
+    - quantize: 是否额外生成 int8 动态量化模型
+
+    返回：
+    - 最终模型路径（quantize=True 时为量化模型路径）
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    onnx_dir = onnx_dir or DEFAULT_ONNX_DIR
+    os.makedirs(onnx_dir, exist_ok=True)
+    fp32_path = get_onnx_model_path(onnx_dir, quantized=False)
+
+    tokenizer = AutoTokenizer.from_pretrained(Config.EMBEDDING_MODEL_PATH)
+    model = AutoModel.from_pretrained(Config.EMBEDDING_MODEL_PATH)
+    model.eval()
+
+    sample = tokenizer(
+        ["导出示例文本", "第二条"],
+        padding=True,
+        truncation=True,
+        return_tensors="pt",
+        max_length=100,
+    )
+    # TorchScript 导出按 forward 签名顺序展开关键字参数，输入名需与之对应
+    forward_params = inspect.signature(model.forward).parameters
+    input_names = [name for name in forward_params if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (),
+            fp32_path,
+            kwargs={name: sample[name] for name in input_names},
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = get_onnx_model_path(onnx_dir, quantized=True)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
@@ -0,0 +1,222 @@
+"""
+Embedding 服务层
+
+在 embedding.t2vect 之前加一层进程级 LRU 缓存，供知识库、记忆、动作检索等共用：
+- 以 (规范化文本, 模型 ID) 为键，同一文本在被淘汰前只编码一次
+- 统一返回 L2 归一化后的 float32 向量，调用方可直接用于内积检索
+- 记录命中/未命中次数，便于观察缓存效果
+
+一条用户消息会先后经过知识库检索、记忆检索（记忆 + 日记）和动作检索，
+相同的文本在这些环节之间可以直接复用向量。未命中的文本经 embedding_batcher
+与其他线程的并发请求合批推理。
+
+缓存配置（config.yaml → Embedding，可省略）：
+- cache_size: 缓存的最大文本条数，0 表示关闭缓存
+
+使用示例：
+```python
+vectors = encode(["你好", "今天天气不错"])  # (2, D) float32，已归一化
+vectors = await encode_async(["你好"])  # 事件循环中使用
+stats = get_cache_stats()
+```
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from my_utils import config_manager as CConfig
+from my_utils import embedding
+from my_utils.embedding_batcher import get_batcher
+
+# 默认缓存条数
+DEFAULT_CACHE_SIZE = 4096
+
+
+def normalize_text(text: str) -> str:
+    """
+    规范化缓存键文本：去除首尾空白并合并连续空白
+
+    参数：
+    - text: 原始文本
+
+    返回：
+    - 规范化后的文本（同时也是实际送入模型编码的文本）
+    """
+    return " ".join(text.split())
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """按行 L2 归一化，零向量保持不变"""
+    arr = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return arr / norms
+
+
+class EmbeddingCache:
+    """
+    线程安全的有界 LRU 向量缓存
+
+    Attributes:
+        max_size: 最大缓存条数，0 表示不缓存
+        hits: 命中次数
+        misses: 未命中次数
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max(0, int(max_size))
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> np.ndarray | None:
+        """查询缓存，命中时将条目移到最近使用端"""
+        with self._lock:
+            vector = self._data.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: tuple[str, str], vector: np.ndarray) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = vector
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存并重置计数"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """返回缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+def _get_cache_size() -> int:
+    """读取缓存容量配置"""
+    config = CConfig.config.get("Embedding", {}) or {}
+    return int(config.get("cache_size", DEFAULT_CACHE_SIZE))
+
+
+_cache = EmbeddingCache(_get_cache_size())
+
+
+def _lookup_cache(normalized: list[str]) -> tuple[dict[str, np.ndarray], list[str]]:
+    """
+    查询缓存
+
+    返回：
+    - (已命中的 文本→向量, 未命中且去重后的文本列表)
+    """
+    model_id = embedding.get_model_id()
+    found: dict[str, np.ndarray] = {}
+    missing: dict[str, None] = {}
+    for text in normalized:
+        if text in found or text in missing:
+            continue
+        vector = _cache.get((text, model_id))
+        if vector is None:
+            missing[text] = None
+        else:
+            found[text] = vector
+    return found, list(missing)
+
+
+def _store_cache(
+    found: dict[str, np.ndarray], missing: list[str], raw_vectors: np.ndarray
+) -> None:
+    """将新编码的向量归一化后写入缓存与 found"""
+    model_id = embedding.get_model_id()
+    vectors = _l2_normalize(raw_vectors)
+    for text, vector in zip(missing, vectors):
+        # 单独拷贝每行，避免缓存条目拖住整批数组；只读防止调用方原地修改
+        vector = vector.copy()
+        vector.setflags(write=False)
+        found[text] = vector
+        _cache.put((text, model_id), vector)
+
+
+def _assemble(normalized: list[str], found: dict[str, np.ndarray]) -> np.ndarray:
+    """按输入顺序拼装结果矩阵"""
+    return np.stack([found[text] for text in normalized]).astype(np.float32, copy=False)
+
+
+def encode(texts: list[str], use_cache: bool = True) -> np.ndarray:
+    """
+    编码文本列表为 L2 归一化的 float32 向量
+
+    缓存未命中的文本交给微批处理器，与其他线程同时到达的请求合并推理；
+    批内重复文本只编码一次。批量建索引等一次性编码可传 use_cache=False，
+    避免冲掉检索热点。
+
+    参数：
+    - texts: 文本列表
+    - use_cache: 是否读写缓存
+
+    返回：
+    - (len(texts), D) 的 float32 数组，每行已归一化
+    """
+    normalized = [normalize_text(t) for t in texts]
+    if not normalized:
+        return np.empty((0, 0), dtype=np.float32)
+    if not use_cache or _cache.max_size <= 0:
+        return _l2_normalize(get_batcher().encode(normalized))
+
+    found, missing = _lookup_cache(normalized)
+    if missing:
+        _store_cache(found, missing, get_batcher().encode(missing))
+    return _assemble(normalized, found)
+
+
+async def encode_async(texts: list[str], use_cache: bool = True) -> np.ndarray:
+    """
+    encode 的异步版本：推理在批处理线程中进行，不阻塞事件循环
+
+    参数与返回值同 encode。
+    """
+    normalized = [normalize_text(t) for t in texts]
+    if not normalized:
+        return np.empty((0, 0), dtype=np.float32)
+    if not use_cache or _cache.max_size <= 0:
+        return _l2_normalize(await get_batcher().encode_async(normalized))
+
+    found, missing = _lookup_cache(normalized)
+    if missing:
+        _store_cache(found, missing, await get_batcher().encode_async(missing))
+    return _assemble(normalized, found)
+
+
+def get_cache_stats() -> dict:
+    """
+    获取缓存统计信息
+
+    返回：
+    - {"size", "max_size", "hits", "misses", "hit_rate"}
+    """
+    return _cache.stats()
+
+
+def clear_cache() -> None:
+    """清空向量缓存（切换 embedding 模型后调用）"""
+    _cache.clear()
@@ -0,0 +1,187 @@
+"""
+目录变更监听
+
+监听目录下指定后缀文件的新增 / 修改 / 删除 / 移动，去抖后把变化的相对路径集合
+交给回调处理，供知识库只对变化的 raw 文件做增量 ingest，而不必定时全量扫描。
+
+监听方式：
+- 已安装 watchdog（pip install watchdog）时使用其系统原生后端
+  （Linux 为 inotify，macOS 为 FSEvents，Windows 为 ReadDirectoryChangesW）
+- 否则回退为轮询：按间隔遍历目录，比较 (size, mtime_ns, inode)
+
+使用示例：
+```python
+watcher = FileWatcher(raw_dir, {".txt", ".md"}, on_change=handle_paths)
+watcher.start()
+```
+"""
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from my_utils.log import logger as Log
+
+DEFAULT_POLL_INTERVAL_SEC = 5.0
+DEFAULT_DEBOUNCE_SEC = 1.0
+
+
+class FileWatcher:
+    """
+    目录变更监听器
+
+    Attributes:
+        root: 监听的根目录
+        suffixes: 关注的文件后缀（小写，含点）
+        mode: 实际使用的监听方式（启动后为 watchdog 后端类名或 "polling"）
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        suffixes: set[str],
+        on_change: Callable[[set[str]], None],
+        poll_interval_sec: float = DEFAULT_POLL_INTERVAL_SEC,
+        debounce_sec: float = DEFAULT_DEBOUNCE_SEC,
+    ):
+        self.root = Path(root).resolve()
+        self.suffixes = {suffix.lower() for suffix in suffixes}
+        self.mode = ""
+        self._on_change = on_change
+        self._poll_interval_sec = max(0.5, float(poll_interval_sec))
+        self._debounce_sec = max(0.0, float(debounce_sec))
+        self._pending: set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._pending_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._observer = None
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> str:
+        """
+        启动监听，重复调用无效
+
+        返回：
+        - 实际使用的监听方式
+        """
+        if self.mode:
+            return self.mode
+
+        try:
+            self._start_watchdog()
+        except ImportError:
+            self.mode = "polling"
+            self._spawn(self._poll_loop, "file-watcher-poll")
+        self._spawn(self._flush_loop, "file-watcher-flush")
+        Log.info(f"[文件监听] 监听 {self.root}，方式: {self.mode}")
+        return self.mode
+
+    def stop(self) -> None:
+        """停止监听"""
+        self._stop_event.set()
+        self._pending_event.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _spawn(self, target: Callable[[], None], name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _relative(self, path: str | bytes) -> str | None:
+        """将事件路径转换为相对根目录的路径，不关注的文件返回 None"""
+        path = os.fsdecode(path)
+        if os.path.splitext(path)[1].lower() not in self.suffixes:
+            return None
+        try:
+            return Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def _add_pending(self, rel_paths: set[str]) -> None:
+        if not rel_paths:
+            return
+        with self._pending_lock:
+            self._pending.update(rel_paths)
+        self._pending_event.set()
+
+    def _start_watchdog(self) -> None:
+        """使用 watchdog 原生后端监听，未安装时抛出 ImportError"""
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+                    return
+                paths = {watcher._relative(event.src_path)}
+                if getattr(event, "dest_path", None):
+                    paths.add(watcher._relative(event.dest_path))
+                paths.discard(None)
+                watcher._add_pending(paths)  # type: ignore[arg-type]
+
+        observer = Observer()
+        observer.schedule(_Handler(), str(self.root), recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        self.mode = type(observer).__name__
+
+    def _snapshot(self) -> dict[str, tuple[int, int, int]]:
+        """遍历目录，返回 {相对路径: (size, mtime_ns, inode)}"""
+        snapshot: dict[str, tuple[int, int, int]] = {}
+        stack = [str(self.root)]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() not in self.suffixes:
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                rel_path = Path(entry.path).relative_to(self.root).as_posix()
+                snapshot[rel_path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+        return snapshot
+
+    def _poll_loop(self) -> None:
+        """轮询模式：比较相邻两次快照"""
+        previous = self._snapshot()
+        while not self._stop_event.wait(self._poll_interval_sec):
+            current = self._snapshot()
+            changed = {
+                rel_path
+                for rel_path in previous.keys() | current.keys()
+                if previous.get(rel_path) != current.get(rel_path)
+            }
+            previous = current
+            self._add_pending(changed)
+
+    def _flush_loop(self) -> None:
+        """去抖：事件停止到达 debounce_sec 后再批量回调"""
+        while not self._stop_event.is_set():
+            self._pending_event.wait()
+            # 等待连续写入结束（编辑器保存、批量拷贝会产生一串事件）
+            while self._debounce_sec > 0 and not self._stop_event.is_set():
+                self._pending_event.clear()
+                if not self._pending_event.wait(self._debounce_sec):
+                    break
+            self._pending_event.clear()
+            with self._pending_lock:
+                rel_paths, self._pending = self._pending, set()
+            if not rel_paths or self._stop_event.is_set():
+                continue
+            try:
+                self._on_change(rel_paths)
+            except Exception as e:
+                Log.error(f"[文件监听] 处理变更失败: {e}", exc_info=True)
@@ -0,0 +1,114 @@
+"""
+检索结果缓存
+
+聊天中用户常在相邻几轮围绕同一话题提问，互动事件也会重复获取动态上下文，
+知识库与记忆检索因此经常以相同的查询重复执行。本模块提供带 TTL 的有界 LRU 缓存，
+供每个助手的知识库（DataBase）与记忆（MemoryV2）实例各自持有一份：
+
+- 键为调用方给出的规范化查询（及检索参数），值为检索结果
+- 每条结果记录写入时数据源的代数（generation），数据源在索引、chunk、记忆发生变化时递增代数，
+  代数不一致的条目视为未命中，因此不会返回过期内容
+- TTL 用于限制与时间相关的评分（如记忆衰减）的漂移
+
+缓存配置（config.yaml → QueryCache，均可省略）：
+- max_entries: 每个实例缓存的最大条数，0 表示关闭
+- ttl_sec: 条目有效期（秒）
+
+使用示例：
+```python
+cache = create_query_cache()
+value = cache.get(key, generation)
+if value is None:
+    value = compute()
+    cache.put(key, generation, value)
+```
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from my_utils import config_manager as CConfig
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SEC = 300.0
+
+
+class QueryResultCache:
+    """
+    线程安全的 TTL + LRU 检索结果缓存
+
+    Attributes:
+        max_entries: 最大缓存条数，0 表示不缓存
+        ttl_sec: 条目有效期（秒）
+        hits: 命中次数
+        misses: 未命中次数
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_sec: float = DEFAULT_TTL_SEC):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_sec = max(0.0, float(ttl_sec))
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[int, float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, generation: int) -> Any | None:
+        """
+        查询缓存
+
+        参数：
+        - key: 查询键
+        - generation: 数据源当前代数
+
+        返回：
+        - 缓存的结果，未命中、已过期或代数不一致时返回 None
+        """
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != generation or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Hashable, generation: int, value: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (generation, time.monotonic() + self.ttl_sec, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """缓存统计：{size, max_entries, hits, misses}"""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def create_query_cache() -> QueryResultCache:
+    """按配置创建检索结果缓存"""
+    config = CConfig.config.get("QueryCache", {}) or {}
+    return QueryResultCache(
+        max_entries=int(config.get("max_entries", DEFAULT_MAX_ENTRIES)),
+        ttl_sec=float(config.get("ttl_sec", DEFAULT_TTL_SEC)),
+    )
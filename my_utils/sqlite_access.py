@@ -0,0 +1,343 @@
+"""
+SQLite 共享访问层
+
+记忆模块（memory_v2 / long_mem / core_mem）原先几乎每个方法都临时 sqlite3.connect，
+每次都要重新打开文件、设置 PRAGMA、编译语句；多个线程同时写入时还会互相等待文件锁。
+本模块为每个数据库文件提供一个进程级共享实例：
+
+- 写入：一个专用写线程串行执行写任务，同时到达的任务合并进同一个事务提交，
+  每个任务包在 SAVEPOINT 中，单个任务失败只回滚自身
+- 读取：WAL 模式下的小型只读连接池，读不阻塞写
+- 连接只在创建时设置一次 PRAGMA，并开启 sqlite3 的预编译语句缓存（cached_statements）
+
+写任务是 fn(conn) 形式的函数，在写线程上执行，不得自行 commit；
+write / execute / executemany 阻塞到所在事务提交后返回，随后的读取可以看到写入结果。
+
+连接配置（config.yaml → SQLite，均可省略）：
+- read_pool_size: 每个数据库的只读连接数
+- max_batch_size: 单个事务最多合并的写任务数
+- busy_timeout_ms: 等待其他进程释放锁的超时
+- cached_statements: 每个连接缓存的预编译语句数
+
+使用示例：
+```python
+db = get_database(db_path)
+db.write(lambda conn: conn.execute(CREATE_TABLE_SQL))
+row_id = db.execute("INSERT INTO t (name) VALUES (?)", (name,)).lastrowid
+rows = db.query("SELECT id, name FROM t WHERE id > ?", (0,))
+```
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from my_utils import config_manager as CConfig
+from my_utils.log import logger as Log
+
+T = TypeVar("T")
+
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHED_STATEMENTS = 256
+
+# 写队列中的停止标记
+_STOP = object()
+
+
+@dataclass(frozen=True, slots=True)
+class WriteResult:
+    """单条写语句的执行结果"""
+
+    rowcount: int
+    lastrowid: int | None
+
+
+class SQLiteDatabase:
+    """
+    单个 SQLite 文件的共享访问对象
+
+    Attributes:
+        path: 数据库文件路径
+        read_pool_size: 只读连接数上限
+        max_batch_size: 单个事务最多合并的写任务数
+    """
+
+    def __init__(
+        self,
+        path: str,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+    ):
+        self.path = path
+        self.read_pool_size = max(1, int(read_pool_size))
+        self.max_batch_size = max(1, int(max_batch_size))
+        self._busy_timeout_ms = max(0, int(busy_timeout_ms))
+        self._cached_statements = max(0, int(cached_statements))
+
+        # 写连接在此创建，以便打开失败时立即报错；此后只在写线程上使用
+        self._writer_conn = self._connect()
+        self._writer_conn.execute("PRAGMA journal_mode=WAL")
+        self._writer_conn.execute("PRAGMA synchronous=NORMAL")
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+        self._idle_readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all_readers: list[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开连接并设置连接级 PRAGMA（autocommit 模式，事务由本类显式控制）"""
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self._busy_timeout_ms / 1000.0,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self._cached_statements,
+        )
+        conn.execute(f"PRAGMA busy_timeout={self._busy_timeout_ms}")
+        return conn
+
+    # ============================================================
+    # 写入
+    # ============================================================
+
+    def _ensure_writer(self) -> None:
+        """首次提交写任务时启动写线程"""
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run,
+                    name=f"sqlite-writer-{os.path.basename(self.path)}",
+                    daemon=True,
+                )
+                self._writer.start()
+
+    def submit(self, fn: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """
+        提交写任务，不等待执行
+
+        参数：
+        - fn: 接收写连接的函数，在写线程的事务中执行，不得自行 commit
+
+        返回：
+        - Future，事务提交后完成，结果为 fn 的返回值
+        """
+        future: Future = Future()
+        if self._closed:
+            future.set_exception(RuntimeError(f"数据库已关闭: {self.path}"))
+            return future
+        if threading.current_thread() is self._writer:
+            # 写任务内部再次写入：直接在当前事务中执行，避免自身等待；
+            # 嵌套 SAVEPOINT 保证内层失败只回滚内层写入
+            conn = self._writer_conn
+            conn.execute("SAVEPOINT nested_task")
+            try:
+                value = fn(conn)
+            except Exception as e:
+                conn.execute("ROLLBACK TO nested_task")
+                conn.execute("RELEASE nested_task")
+                future.set_exception(e)
+            else:
+                conn.execute("RELEASE nested_task")
+                future.set_result(value)
+            return future
+        self._ensure_writer()
+        self._queue.put((fn, future))
+        return future
+
+    def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """执行写任务，阻塞到所在事务提交"""
+        return self.submit(fn).result()
+
+    def execute(self, sql: str, params: Iterable[Any] = ()) -> WriteResult:
+        """执行单条写语句，阻塞到所在事务提交"""
+
+        def run(conn: sqlite3.Connection) -> WriteResult:
+            cursor = conn.execute(sql, tuple(params))
+            return WriteResult(cursor.rowcount, cursor.lastrowid)
+
+        return self.write(run)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Iterable[Any]]) -> int:
+        """批量执行写语句，返回影响的行数"""
+        rows = [tuple(params) for params in seq_of_params]
+        if not rows:
+            return 0
+        return self.write(lambda conn: conn.executemany(sql, rows).rowcount)
+
+    def _collect_batch(self) -> list[Any]:
+        """阻塞取出首个写任务，再取出已在排队的任务直到达到批量上限"""
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """写线程主循环"""
+        while True:
+            batch = self._collect_batch()
+            stop = batch[-1] is _STOP
+            tasks = [
+                item
+                for item in batch
+                if item is not _STOP and item[1].set_running_or_notify_cancel()
+            ]
+            if tasks:
+                self._commit_batch(tasks)
+            if stop:
+                self._writer_conn.close()
+                return
+
+    def _commit_batch(self, tasks: list[tuple[Callable, Future]]) -> None:
+        """在同一个事务中执行一批写任务，提交后再通知各任务结果"""
+        conn = self._writer_conn
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, future in tasks:
+                conn.execute("SAVEPOINT task")
+                try:
+                    value = fn(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO task")
+                    conn.execute("RELEASE task")
+                    outcomes.append((future, None, e))
+                else:
+                    conn.execute("RELEASE task")
+                    outcomes.append((future, value, None))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            Log.error(f"[SQLite] 写事务提交失败 ({self.path}): {e}")
+            for _, future in tasks:
+                future.set_exception(e)
+            return
+
+        for future, value, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+    # ============================================================
+    # 读取
+    # ============================================================
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        借出一个只读连接，用完自动归还
+
+        连接处于 autocommit 模式，每条查询读取最新已提交的数据；连接池满时等待其他调用方归还。
+        """
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            self._idle_readers.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if len(self._all_readers) < self.read_pool_size:
+                conn = self._connect()
+                conn.execute("PRAGMA query_only=ON")
+                self._all_readers.append(conn)
+                return conn
+        return self._idle_readers.get()
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        """执行查询，返回全部结果行"""
+        with self.reader() as conn:
+            return conn.execute(sql, tuple(params)).fetchall()
+
+    def query_one(self, sql: str, params: Iterable[Any] = ()) -> tuple | None:
+        """执行查询，返回第一行（无结果时为 None）"""
+        with self.reader() as conn:
+            return conn.execute(sql, tuple(params)).fetchone()
+
+    # ============================================================
+    # 关闭
+    # ============================================================
+
+    def close(self) -> None:
+        """提交已排队的写任务后关闭全部连接"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+        else:
+            self._writer_conn.close()
+        with self._reader_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+
+
+_databases: dict[str, SQLiteDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path: str) -> SQLiteDatabase:
+    """
+    获取数据库文件对应的进程级共享实例，首次调用时按配置创建
+
+    参数：
+    - path: 数据库文件路径（同一文件的不同写法共享同一实例）
+
+    返回：
+    - SQLiteDatabase
+    """
+    key = os.path.abspath(path)
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            config = CConfig.config.get("SQLite", {}) or {}
+            database = SQLiteDatabase(
+                key,
+                read_pool_size=int(config.get("read_pool_size", DEFAULT_READ_POOL_SIZE)),
+                max_batch_size=int(config.get("max_batch_size", DEFAULT_MAX_BATCH_SIZE)),
+                busy_timeout_ms=int(config.get("busy_timeout_ms", DEFAULT_BUSY_TIMEOUT_MS)),
+                cached_statements=int(
+                    config.get("cached_statements", DEFAULT_CACHED_STATEMENTS)
+                ),
+            )
+            _databases[key] = database
+        return database
+
+
+@atexit.register
+def close_all() -> None:
+    """关闭全部共享实例（进程退出时自动调用，确保排队的写入已提交）"""
+    with _databases_lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for database in databases:
+        try:
+            database.close()
+        except Exception as e:
+            Log.error(f"[SQLite] 关闭数据库失败 ({database.path}): {e}")
@@ -0,0 +1,385 @@
+"""
+FAISS 索引工厂
+
+知识库与记忆模块原先一律使用精确检索的 IndexFlatIP，查询耗时随数据量线性增长，
+且全部向量以 float32 常驻内存。本模块按向量数量选择索引类型：
+
+- 数量低于 flat_threshold：Flat（精确检索）
+- 超过阈值且需要按 ID 删除：IVF（倒排，支持 remove_ids）
+- 超过阈值且只追加：HNSW（图索引，召回与延迟表现最好，但不支持删除）
+
+可选压缩：fp16（每维 2 字节）、sq8（每维 1 字节）或 pq（乘积量化），需要训练的索引在构建时自动训练。
+索引统一使用内积度量，输入向量应已 L2 归一化。
+
+持久化：write_index_atomic 先写临时文件再原子替换，写入中途崩溃不会损坏已有索引文件；
+read_index 直接从文件读取，mmap 模式下向量数据按需换页而不整体常驻内存（适用于只读为主的索引）。
+写入时可附带 embedding 模型标识（保存为同名 .model 文件），加载前用 index_model_matches 校验，
+模型或池化方式改变后旧索引不再被使用。
+mmap 仅在 POSIX 系统上启用：Windows 不允许替换已被映射的文件，原子写入会失败，因此在 Windows 上按普通方式加载。
+
+配置（config.yaml → VectorIndex，均可省略）：
+- type: auto / flat / ivf / hnsw
+- flat_threshold: auto 模式下切换到近似索引的向量数
+- compression: none / fp16 / sq8 / pq
+- pq_m: PQ 子空间数（需整除向量维度）
+- nprobe: IVF 检索时探查的倒排桶数
+- hnsw_m / ef_construction / ef_search: HNSW 参数
+- mmap: 知识库索引是否以内存映射方式加载（仅 POSIX，Windows 上忽略）
+
+使用示例：
+```python
+index = build_index(vectors, ids=chunk_ids, removable=True)
+if needs_rebuild(index, new_count, removable=True):
+    index = build_index(all_vectors, ids=all_ids, removable=True)
+```
+"""
+
+import math
+import os
+import threading
+import time
+from collections.abc import Callable
+
+import faiss
+import numpy as np
+
+from my_utils import config_manager as CConfig
+from my_utils.log import logger as Log
+
+DEFAULT_INDEX_CONFIG = {
+    "type": "auto",
+    "flat_threshold": 50000,
+    "compression": "none",
+    "pq_m": 64,
+    "nprobe": 16,
+    "hnsw_m": 32,
+    "ef_construction": 80,
+    "ef_search": 64,
+    "mmap": False,
+}
+
+# 标量量化类型
+_SQ_TYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "sq8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+# IVF 每个倒排桶至少需要的训练样本数（faiss 建议值）
+_MIN_POINTS_PER_CENTROID = 39
+# 训练样本上限，避免超大语料训练过慢
+_MAX_TRAINING_POINTS = 100000
+
+
+def get_index_config() -> dict:
+    """读取索引配置，缺省项使用默认值"""
+    config = dict(DEFAULT_INDEX_CONFIG)
+    config.update(CConfig.config.get("VectorIndex", {}) or {})
+    config["type"] = str(config["type"]).lower()
+    config["compression"] = str(config["compression"]).lower()
+    return config
+
+
+def choose_index_kind(count: int, removable: bool = False) -> str:
+    """
+    根据向量数量选择索引类型
+
+    参数：
+    - count: 向量数量
+    - removable: 是否需要按 ID 删除向量（HNSW 不支持删除）
+
+    返回：
+    - "flat" / "ivf" / "hnsw"
+    """
+    config = get_index_config()
+    kind = config["type"]
+    if kind in ("flat", "ivf", "hnsw"):
+        if kind == "hnsw" and removable:
+            Log.warning("[向量索引] HNSW 不支持删除，改用 IVF")
+            return "ivf"
+        return kind
+    if count < int(config["flat_threshold"]):
+        return "flat"
+    return "ivf" if removable else "hnsw"
+
+
+def _ideal_nlist(count: int) -> int:
+    """IVF 倒排桶数：约 4·√N，并保证每个桶有足够的训练样本"""
+    nlist = int(4 * math.sqrt(max(count, 1)))
+    return max(1, min(nlist, count // _MIN_POINTS_PER_CENTROID))
+
+
+def _resolve_compression(dimension: int, count: int) -> str:
+    """校验压缩方式是否适用，不适用时降级"""
+    config = get_index_config()
+    compression = config["compression"]
+    if compression == "pq":
+        pq_m = int(config["pq_m"])
+        if dimension % pq_m != 0:
+            Log.warning(f"[向量索引] pq_m={pq_m} 不能整除维度 {dimension}，改用 sq8")
+            return "sq8"
+        if count < 256 * _MIN_POINTS_PER_CENTROID:
+            # PQ 码本需要足够样本训练，数据量小时使用 sq8
+            return "sq8"
+    if compression not in ("none", "fp16", "sq8", "pq"):
+        return "none"
+    return compression
+
+
+def _create_base_index(kind: str, dimension: int, count: int) -> faiss.Index:
+    """创建未训练的基础索引"""
+    config = get_index_config()
+    metric = faiss.METRIC_INNER_PRODUCT
+    compression = _resolve_compression(dimension, count)
+
+    if kind == "hnsw":
+        hnsw_m = int(config["hnsw_m"])
+        if compression == "none":
+            index = faiss.IndexHNSWFlat(dimension, hnsw_m, metric)
+        else:
+            # HNSW 仅支持标量量化压缩，pq 按 sq8 处理
+            qtype = _SQ_TYPES.get(compression, faiss.ScalarQuantizer.QT_8bit)
+            index = faiss.IndexHNSWSQ(dimension, qtype, hnsw_m, metric)
+        index.hnsw.efConstruction = int(config["ef_construction"])
+        return index
+
+    if kind == "ivf":
+        nlist = _ideal_nlist(count)
+        quantizer = faiss.IndexFlatIP(dimension)
+        if compression in _SQ_TYPES:
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer, dimension, nlist, _SQ_TYPES[compression], metric
+            )
+        elif compression == "pq":
+            index = faiss.IndexIVFPQ(
+                quantizer, dimension, nlist, int(config["pq_m"]), 8, metric
+            )
+        else:
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, metric)
+        return index
+
+    if compression in _SQ_TYPES:
+        return faiss.IndexScalarQuantizer(dimension, _SQ_TYPES[compression], metric)
+    if compression == "pq":
+        return faiss.IndexPQ(dimension, int(config["pq_m"]), 8, metric)
+    return faiss.IndexFlatIP(dimension)
+
+
+def _unwrap(index: faiss.Index) -> faiss.Index:
+    """取出 IDMap 包装下的实际索引"""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def index_kind(index: faiss.Index) -> str:
+    """
+    识别索引类型
+
+    返回：
+    - "flat" / "ivf" / "hnsw"
+    """
+    base = _unwrap(index)
+    if isinstance(base, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(base, faiss.IndexIVF):
+        return "ivf"
+    return "flat"
+
+
+def supports_remove(index: faiss.Index) -> bool:
+    """索引是否支持 remove_ids"""
+    return index_kind(index) != "hnsw"
+
+
+def apply_search_params(index: faiss.Index) -> None:
+    """按配置设置检索参数（IVF nprobe / HNSW efSearch），加载已持久化的索引后也应调用"""
+    config = get_index_config()
+    base = _unwrap(index)
+    if isinstance(base, faiss.IndexIVF):
+        base.nprobe = min(int(config["nprobe"]), base.nlist)
+    elif isinstance(base, faiss.IndexHNSW):
+        base.hnsw.efSearch = int(config["ef_search"])
+
+
+def add_vectors(index: faiss.Index, vectors: np.ndarray, ids: np.ndarray | None = None) -> None:
+    """
+    添加向量，兼容 faiss 不同版本的 Python 接口
+
+    参数：
+    - index: 目标索引，提供 ids 时应为 IndexIDMap / IndexIDMap2
+    - vectors: (N, D) float32 向量
+    - ids: 可选的 int64 ID
+    """
+    if ids is None:
+        index.add(vectors)
+        return
+    try:
+        index.add_with_ids(vectors, ids)  # type: ignore[call-arg]
+    except TypeError:
+        index.add_with_ids(
+            int(vectors.shape[0]), faiss.swig_ptr(vectors), faiss.swig_ptr(ids)
+        )
+
+
+def build_index(
+    vectors: np.ndarray,
+    ids: np.ndarray | None = None,
+    removable: bool = False,
+) -> faiss.Index:
+    """
+    按数据量构建并训练索引，写入全部向量
+
+    参数：
+    - vectors: (N, D) 已归一化的 float32 向量
+    - ids: 可选的 int64 ID，提供时返回 IndexIDMap2
+    - removable: 之后是否需要按 ID 删除向量
+
+    返回：
+    - 已写入向量的索引
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, dimension = int(vectors.shape[0]), int(vectors.shape[1])
+    kind = choose_index_kind(count, removable)
+    base = _create_base_index(kind, dimension, count)
+
+    if not base.is_trained:
+        training = vectors
+        if count > _MAX_TRAINING_POINTS:
+            rng = np.random.default_rng(0)
+            rows = rng.choice(count, size=_MAX_TRAINING_POINTS, replace=False)
+            training = np.ascontiguousarray(vectors[np.sort(rows)])
+        base.train(training)
+
+    if ids is not None:
+        index = faiss.IndexIDMap2(base)
+        ids = np.ascontiguousarray(ids, dtype=np.int64)
+    else:
+        index = base
+    add_vectors(index, vectors, ids)
+    apply_search_params(index)
+
+    if kind != "flat":
+        Log.info(f"[向量索引] 构建 {kind} 索引: {count} 条向量，维度 {dimension}")
+    return index
+
+
+def needs_rebuild(index: faiss.Index, count: int, removable: bool = False) -> bool:
+    """
+    判断当前索引是否应按新的数据量重建（重新选择类型或重新训练）
+
+    以下情况返回 True：
+    - 按 count 应选择的索引类型与当前不同（如数据量越过 flat_threshold）
+    - IVF 的倒排桶数与理想值相差一倍以上（数据量变化较大，需要重新训练）
+    - 需要删除向量但当前索引不支持删除
+
+    参数：
+    - index: 当前索引
+    - count: 当前向量数量
+    - removable: 是否需要按 ID 删除向量
+
+    返回：
+    - 是否需要重建
+    """
+    kind = index_kind(index)
+    if removable and not supports_remove(index):
+        return True
+    if kind != choose_index_kind(count, removable):
+        return True
+    if kind == "ivf":
+        nlist = int(_unwrap(index).nlist)
+        ideal = _ideal_nlist(count)
+        return nlist * 2 < ideal or ideal * 2 < nlist
+    return False
+
+
+def _replace_atomic(path: str, write: Callable[[str], None]) -> None:
+    """调用 write 写入同目录下的临时文件并落盘，再原子替换目标文件"""
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        write(tmp_path)
+        # Windows 上 fsync 要求文件以可写方式打开
+        fd = os.open(tmp_path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _model_stamp_path(path: str) -> str:
+    return f"{path}.model"
+
+
+def write_index_atomic(
+    index: faiss.Index, path: str | os.PathLike, model_id: str | None = None
+) -> None:
+    """
+    原子写入索引文件：先写同目录下的临时文件并落盘，再替换目标文件
+
+    参数：
+    - index: 要保存的索引
+    - path: 目标文件路径
+    - model_id: 产生向量的 embedding 模型标识，提供时一并记录（索引替换后再写，中途崩溃只会导致下次重建）
+    """
+    path = os.fspath(path)
+    _replace_atomic(path, lambda tmp_path: faiss.write_index(index, tmp_path))
+    if model_id is not None:
+
+        def write_stamp(tmp_path: str) -> None:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(model_id)
+
+        _replace_atomic(_model_stamp_path(path), write_stamp)
+
+
+def index_model_matches(path: str | os.PathLike, model_id: str) -> bool:
+    """
+    索引文件记录的 embedding 模型标识是否与 model_id 一致（没有记录时视为不一致）
+
+    参数：
+    - path: 索引文件路径
+    - model_id: 当前 embedding 模型标识
+
+    返回：
+    - 是否一致
+    """
+    try:
+        with open(_model_stamp_path(os.fspath(path)), encoding="utf-8") as f:
+            return f.read().strip() == model_id
+    except OSError:
+        return False
+
+
+def read_index(path: str | os.PathLike, mmap: bool = False) -> faiss.Index:
+    """
+    从文件加载索引并应用检索参数
+
+    mmap 模式下 Flat / IVF 的向量数据映射自文件、由操作系统按需换页，加载耗时与常驻内存
+    都不随索引大小增长；映射的索引只读，修改前需先 faiss.clone_index 复制到内存。
+    Windows 上被映射的文件无法被 write_index_atomic 替换，mmap 参数在 Windows 上被忽略。
+
+    参数：
+    - path: 索引文件路径
+    - mmap: 是否以内存映射方式加载
+
+    返回：
+    - 索引
+    """
+    path = os.fspath(path)
+    start = time.perf_counter()
+    mmap = mmap and os.name != "nt"
+    if mmap:
+        flags = faiss.IO_FLAG_MMAP | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+        index = faiss.read_index(path, flags)
+    else:
+        index = faiss.read_index(path)
+    apply_search_params(index)
+    Log.info(
+        f"[向量索引] 加载 {os.path.basename(path)}: {index.ntotal} 条向量，"
+        f"耗时 {(time.perf_counter() - start) * 1000:.1f}ms{'（mmap）' if mmap else ''}"
+    )
+    return index
@@ -4,18 +4,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from router.api_router import api_router
 from exceptions.error_handlers import setup_exception_handlers
 from my_utils.log import logger
+from core.llm import close_shared_clients
 from my_utils.memory_cleanup import DEFAULT_CLEANUP_INTERVAL_SECONDS, start_periodic_cleanup
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """应用生命周期：启动时创建后台周期内存清理任务，退出时取消"""
+    """应用生命周期：启动时创建后台周期内存清理任务，退出时取消并关闭共享 LLM 连接"""
     # 后台周期内存清理（默认 20 分钟一次，随 uvicorn 事件循环运行）
     cleanup_task = start_periodic_cleanup(DEFAULT_CLEANUP_INTERVAL_SECONDS)
     logger.info("已启动后台周期内存清理任务（20 分钟）")
     yield
     cleanup_task.cancel()
     logger.info("后台周期内存清理任务已停止")
+    await close_shared_clients()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -1,5 +1,6 @@
 import os
 import shutil
+import threading
 import time
 import yaml
 from Config import Config
@@ -25,6 +26,10 @@ class AssistantService:
 
     current_assistant: Assistant | None = None
 
+    # 重新加载后旧助手实例延迟关闭的时间（秒），留给仍持有旧实例的进行中请求
+    # （流式回复、回合结束后的记忆写入）正常完成
+    RETIRE_GRACE_SEC = 120.0
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -250,7 +255,8 @@ class AssistantService:
         if assistant_name in self.assistants_cache:
             del self.assistants_cache[assistant_name]
         if assistant_name in self.loaded_agents:
-            del self.loaded_agents[assistant_name]
+            # 目录即将删除，需立即释放数据库连接；进行中的请求随后跳过知识库与记忆访问
+            self.loaded_agents.pop(assistant_name).close()
 
         shutil.rmtree(assistant_dir)
 
@@ -308,6 +314,7 @@ class AssistantService:
         重新加载当前助手
         """
         if self.current_assistant_name:
+            previous = self.current_assistant
             try:
                 agent = Assistant(self.current_assistant_name)
                 self.current_assistant = agent
@@ -320,6 +327,17 @@ class AssistantService:
                 raise FileNotFoundError(
                     f"重新加载助手 '{self.current_assistant_name}' 失败: {str(e)}"
                 )
+            # 进行中的请求可能仍持有旧实例，延迟停止其后台线程
+            if previous is not None:
+                self._retire_assistant(previous)
+
+    def _retire_assistant(self, agent: Assistant) -> None:
+        """
+        在 RETIRE_GRACE_SEC 后关闭被替换的助手实例
+        """
+        timer = threading.Timer(self.RETIRE_GRACE_SEC, agent.close)
+        timer.daemon = True
+        timer.start()
 
     async def initialize_default_assistant(self) -> Assistant | None:
         """
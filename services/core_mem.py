@@ -7,14 +7,13 @@
 - 新增时去重：自动检查相似记忆，避免重复添加
 """
 
-import sqlite3
 import faiss
 import os
 import time
 import numpy as np
 from typing import Any
 from models.types.assistant_info import AssistantInfo
-from my_utils import embedding
+from my_utils import embedding, sqlite_access, vector_index
 from my_utils import log as Log
 
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
@@ -45,6 +44,8 @@ class CoreMemory:
         # 核心记忆文本列表，保持与FAISS索引顺序一致
         self.mems = []
         self.index: Any = None
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._db = sqlite_access.get_database(self.db_path)
 
         self._init_db()
         self._load_data()
@@ -59,12 +60,7 @@ class CoreMemory:
 
     def _init_db(self):
         """初始化SQLite数据库"""
-        os.makedirs(self.data_dir, exist_ok=True)
-
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
+        self._db.execute(
             """
             CREATE TABLE IF NOT EXISTS memories (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,16 +69,10 @@ class CoreMemory:
             )
         """
         )
-        conn.commit()
-        conn.close()
 
     def _load_data(self):
         """从SQLite加载记忆数据"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT time, text FROM memories ORDER BY time")
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._db.query("SELECT time, text FROM memories ORDER BY time")
 
         for row in rows:
             t, text = row
@@ -97,14 +87,10 @@ class CoreMemory:
         t_n = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time()))
         text = "第一次相遇"
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        self._db.execute(
             "INSERT INTO memories (time, text) VALUES (?, ?)",
             (t_n, text),
         )
-        conn.commit()
-        conn.close()
 
         self.times.append(t_n)
         self.mems.append(text)
@@ -116,13 +102,11 @@ class CoreMemory:
             self.index = faiss.IndexFlatIP(vect.shape[1])
             return
 
-        if os.path.exists(self.index_path):
+        if os.path.exists(self.index_path) and vector_index.index_model_matches(
+            self.index_path, embedding.get_model_id()
+        ):
             try:
-                with open(self.index_path, "rb") as f:
-                    index_bytes = f.read()
-                self.index = faiss.deserialize_index(
-                    np.frombuffer(index_bytes, dtype="uint8")
-                )
+                self.index = vector_index.read_index(self.index_path)
             except Exception as e:
                 Log.logger.warning(f"加载FAISS索引失败: {e}, 将重建索引")
                 self._rebuild_index()
@@ -133,9 +117,7 @@ class CoreMemory:
         """构建FAISS索引"""
         try:
             vectors = self._encode_texts(self.mems)
-            dim = len(vectors[0])
-            self.index = faiss.IndexFlatIP(dim)
-            self.index.add(vectors)
+            self.index = vector_index.build_index(vectors)
             self._save_index()
         except Exception as e:
             Log.logger.warning(f"构建FAISS索引失败: {e}")
@@ -143,17 +125,15 @@ class CoreMemory:
     def _rebuild_index(self):
         """重建FAISS索引"""
         vectors = self._encode_texts(self.mems)
-        dim = len(vectors[0])
-        self.index = faiss.IndexFlatIP(dim)
-        self.index.add(vectors)
+        self.index = vector_index.build_index(vectors)
         self._save_index()
 
     def _save_index(self):
         """持久化FAISS索引"""
         try:
-            index_data = faiss.serialize_index(self.index)
-            with open(self.index_path, "wb") as f:
-                f.write(index_data.tobytes())
+            vector_index.write_index_atomic(
+                self.index, self.index_path, model_id=embedding.get_model_id()
+            )
         except Exception as e:
             print(self.index)
             Log.logger.warning(f"保存FAISS索引失败: {e}")
@@ -213,21 +193,15 @@ class CoreMemory:
             Log.logger.info(f"[核心记忆]所有记忆都已存在，跳过添加")
             return
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
+        rows = []
         for m in new_memories:
             t_n = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time()))
-            cursor.execute(
-                "INSERT INTO memories (time, text) VALUES (?, ?)",
-                (t_n, m),
-            )
+            rows.append((t_n, m))
+        self._db.executemany("INSERT INTO memories (time, text) VALUES (?, ?)", rows)
+        for t_n, m in rows:
             self.times.append(t_n)
             self.mems.append(m)
 
-        conn.commit()
-        conn.close()
-
         try:
             vector = self._encode_texts(new_memories)
             self.index.add(vector)
@@ -15,15 +15,43 @@ import yaml
 
 from models.types.assistant_info import AssistantInfo
 from my_utils import config_manager as CConfig
-from my_utils import embedding
+from my_utils import embedding, embedding_service, vector_index
+from my_utils.file_watcher import FileWatcher
+from my_utils.query_cache import create_query_cache
 from my_utils import log as Log
+from core.llm.client_pool import run_in_temporary_loop
 from core.llm.llm_client import LLMClient
 from core.llm.response_parser import JsonParser
 
 RAW_SUFFIXES = {".txt", ".md"}
+# 计算文件 MD5 时的读取缓冲大小
+HASH_BUFFER_SIZE = 1 << 20
 # 知识库抽取提示词模板
 INVALID_FILE_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
 
+# 每个知识库目录一把进程级重建锁：多个助手各自持有 DataBase 实例，但共享同一目录下的 wiki/索引/SQLite
+_base_dir_locks: dict[str, threading.RLock] = {}
+_base_dir_locks_guard = threading.Lock()
+# 启用 watch_raw 的实例按 raw 目录登记：每个目录只由最后登记的实例监听，它关闭后交给上一个实例
+_raw_watch_instances: dict[str, list["DataBase"]] = {}
+_raw_watch_guard = threading.Lock()
+
+
+def _get_base_dir_lock(base_dir: Path) -> threading.RLock:
+    """
+    获取知识库目录对应的进程级重建锁。
+    Parameters:
+        base_dir (Path): 知识库目录（不同写法的同一目录共享同一把锁）
+    Returns:
+        threading.RLock: 重建锁
+    """
+    key = os.path.abspath(base_dir)
+    with _base_dir_locks_guard:
+        lock = _base_dir_locks.get(key)
+        if lock is None:
+            lock = _base_dir_locks[key] = threading.RLock()
+        return lock
+
 
 def _now_date() -> str:
     """
@@ -52,26 +80,26 @@ def _sum_md5(file_path: Path) -> str:
         str: 文件 MD5
     """
     md5_obj = hashlib.md5()
-    with file_path.open("rb") as file:
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with file_path.open("rb", buffering=0) as file:
         while True:
-            data = file.read(4096)
-            if not data:
+            size = file.readinto(buffer)
+            if not size:
                 break
-            md5_obj.update(data)
+            md5_obj.update(view[:size])
     return md5_obj.hexdigest()
 
 
-def _normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+def _text_hash(text: str) -> str:
     """
-    统一向量格式并进行 L2 归一化。
+    计算 chunk 文本的内容哈希，作为向量缓存键。
     Parameters:
-        vectors (np.ndarray): 输入向量
+        text (str): chunk 文本
     Returns:
-        np.ndarray: 归一化向量
+        str: SHA-256 十六进制摘要
     """
-    arr = np.ascontiguousarray(vectors.astype(np.float32))
-    faiss.normalize_L2(arr)
-    return arr
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
 def _clean_text(text: str) -> str:
@@ -182,26 +210,27 @@ def _split_semantic_blocks(
     return merged
 
 
-def _sync_run_coroutine(coro: Any, timeout: int = 120) -> Any:
+def _sync_run_coroutine(coro: Any, timeout: int | None = 120) -> Any:
     """
     在同步上下文安全执行协程。
+    协程运行在临时事件循环中，结束时关闭该循环上创建的共享 LLM 客户端。
     Parameters:
         coro (Coroutine): 协程对象
-        timeout (int): 超时时间（秒）
+        timeout (int | None): 超时时间（秒），None 表示一直等待
     Returns:
         Any: 协程返回值
     """
     try:
         asyncio.get_running_loop()
     except RuntimeError:
-        return asyncio.run(coro)
+        return run_in_temporary_loop(coro)
 
     result_container: dict[str, Any] = {}
     error_container: dict[str, Exception] = {}
 
     def runner() -> None:
         try:
-            result_container["result"] = asyncio.run(coro)
+            result_container["result"] = run_in_temporary_loop(coro)
         except Exception as exc:
             error_container["error"] = exc
 
@@ -219,6 +248,46 @@ def _sync_run_coroutine(coro: Any, timeout: int = 120) -> Any:
     return result_container.get("result")
 
 
+class HealthCheckCancelled(Exception):
+    """后台健康检查被取消"""
+
+
+class _ChunkStore:
+    """
+    检索用的 chunk 列式内存表，按 faiss id（即 chunk_id）有序存放 chunk 文本与所属页面信息。
+
+    与向量索引一同构建、一同替换，search 命中后只做数组查找，不再逐条查询 SQLite。
+    """
+
+    def __init__(self, rows: list[tuple[int, str, str, str]]):
+        """
+        Parameters:
+            rows (list[tuple[int, str, str, str]]): (chunk_id, chunk_text, title, page_type)
+        """
+        rows = sorted(rows, key=lambda row: row[0])
+        self.ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        self.texts = np.array([row[1] for row in rows], dtype=object)
+        self.titles = np.array([row[2] for row in rows], dtype=object)
+        self.page_types = np.array([row[3] for row in rows], dtype=object)
+
+    def __len__(self) -> int:
+        return int(self.ids.size)
+
+    def lookup(self, chunk_ids: np.ndarray) -> np.ndarray:
+        """
+        将 faiss id 映射为表内行号。
+        Parameters:
+            chunk_ids (np.ndarray): int64 faiss id
+        Returns:
+            np.ndarray: 行号，不存在的 id 为 -1
+        """
+        if self.ids.size == 0:
+            return np.full(chunk_ids.shape, -1, dtype=np.int64)
+        rows = np.searchsorted(self.ids, chunk_ids)
+        rows = np.minimum(rows, self.ids.size - 1)
+        return np.where(self.ids[rows] == chunk_ids, rows, -1)
+
+
 class DataBase:
     """
     新知识库引擎（LLM + Wiki + FAISS）。
@@ -248,6 +317,8 @@ class DataBase:
         self.wiki_source_dir = self.wiki_dir / "source"
 
         self.index_path = self.embeddings_dir / "vectors.faiss"
+        # 是否以内存映射方式加载索引文件（VectorIndex.mmap）
+        self.index_mmap = bool(vector_index.get_index_config()["mmap"])
         self.sqlite_path = self.embeddings_dir / "metadata.db"
         # 健康检查间隔和是否启用 LLM 抽取
         self.health_check_interval_sec = int(
@@ -255,26 +326,87 @@ class DataBase:
         )
         # 启用 LLM 抽取会增加新文件的处理时间，但能获得更丰富的结构化信息，提升检索质量。可根据实际情况调整。
         self.enable_llm_extract = bool(kb_config.get("enable_llm_extract", True))
+        # 并发 ingest：同时进行的 LLM 抽取数、单文件重试次数、重试退避基数和单次请求超时
+        self.ingest_concurrency = max(1, int(kb_config.get("ingest_concurrency", 4)))
+        self.ingest_max_retries = max(0, int(kb_config.get("ingest_max_retries", 2)))
+        self.ingest_retry_backoff_sec = float(kb_config.get("ingest_retry_backoff_sec", 2.0))
+        self.ingest_timeout_sec = float(kb_config.get("ingest_timeout_sec", 120))
+        # raw 目录监听：启用后只对变化的文件做增量 ingest
+        self.watch_raw = bool(kb_config.get("watch_raw", False))
+        self.watch_poll_interval_sec = float(kb_config.get("watch_poll_interval_sec", 5))
+        self.watch_debounce_sec = float(kb_config.get("watch_debounce_sec", 1))
         # FAISS 索引
         self.index: faiss.IndexIDMap2 | None = None
+        # 检索快照：(索引, chunk 内存表)，两者作为一个整体替换
+        self._search_snapshot: tuple[Any, _ChunkStore] | None = None
+        # 检索快照代数，每次替换后递增；search 结果缓存以此判断是否过期
+        self._generation = 0
+        self._search_cache = create_query_cache()
         # 向量维度
         self.dimension: int | None = None
         # 数据总量（块数量）
         self.data_count = 0
+        # 自上次索引同步以来新增/修改/删除过的页面，下次同步时只处理这些页面的 chunk
+        self._dirty_pages: set[str] = set()
         # 上次健康检查时间戳和上次重建摘要
         self._last_health_check_ts = 0
+        # 本次扫描中重新计算过 MD5 的 raw 文件的 (size, mtime_ns, inode)，ingest 写入 raw_files 时一并记录
+        self._raw_stats: dict[str, tuple[int, int, int]] = {}
+        self._raw_watcher: FileWatcher | None = None
+        # 自上次健康检查以来改动过的页面（含出链/入链变化的页面）和事实键 (subject, predicate)
+        self._health_dirty_pages: set[str] = set()
+        self._health_dirty_facts: set[tuple[str, str]] = set()
         # 上次重建摘要用于快速判断重建结果是否有实质性变化，避免频繁无效重建
         self._last_rebuild_summary: dict[str, Any] = {}
         # LLM 客户端实例
         self._llm_client = LLMClient(model_key="LLM")
         # 初始化目录和数据库连接
         self._ensure_directories()
-        # search/rebuild 会在 run_in_executor 线程中执行，需允许跨线程访问同一连接。
+        # rebuild/健康检查在后台线程中写入，需允许跨线程访问同一连接。
         self._conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
         self._conn.execute("PRAGMA foreign_keys = ON")
         self._init_db()
+        # get_status 使用独立的只读连接：WAL 下只看到已提交的数据，不受后台写入事务影响
+        self._read_conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+        self._read_lock = threading.Lock()
+        # 同一时间只允许一个重建/健康检查修改知识库（可重入：rebuild 内部会调用健康检查）；
+        # 锁按目录在进程内共享，同一目录的多个实例之间也互斥
+        self._rebuild_lock = _get_base_dir_lock(self.base_dir)
+        self._rebuild_thread: threading.Thread | None = None
+        # 后台重建进度
+        self._rebuild_state: dict[str, Any] = {
+            "state": "idle",
+            "stage": "",
+            "done": 0,
+            "total": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
 
-        self.rebuild(startup=True)
+        # 后台健康检查：独立线程按 health_check_interval_sec 定时执行，也可通过 API 手动触发/取消
+        self._health_thread: threading.Thread | None = None
+        # close() 后置位，调度线程据此退出
+        self._closed = threading.Event()
+        self._health_wakeup = threading.Event()
+        self._health_cancel = threading.Event()
+        self._health_request: dict[str, bool] | None = None
+        self._health_state: dict[str, Any] = {
+            "state": "idle",
+            "mode": "",
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "report": None,
+        }
+
+        # 先加载上次持久化的索引立即提供检索，重建在后台进行，完成后原子替换索引
+        self._load_persisted_index()
+        self.start_rebuild(startup=True)
+        self._start_health_scheduler()
+        if self.watch_raw:
+            self._start_raw_watcher()
 
     def _ensure_directories(self) -> None:
         """
@@ -292,14 +424,24 @@ class DataBase:
         初始化元数据库。
         """
         # raw_files 记录原始文件的相对路径、MD5、对应页面和更新时间
+        # file_size / mtime_ns / inode 是计算 MD5 时的文件状态，扫描时状态未变则直接复用 MD5
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS raw_files (
                 raw_path TEXT PRIMARY KEY,
                 file_md5 TEXT NOT NULL,
                 source_page_id TEXT NOT NULL,
-                updated TEXT NOT NULL
+                updated TEXT NOT NULL,
+                file_size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER
             )
             """)
+        raw_columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(raw_files)")
+        }
+        for column in ("file_size", "mtime_ns", "inode"):
+            if column not in raw_columns:
+                self._conn.execute(f"ALTER TABLE raw_files ADD COLUMN {column} INTEGER")
         # wiki_pages 记录页面的基本信息和内容
         # page_id 格式为 "{page_type}/{sanitized_title}"
         # page_type 是 entity/concept/source 之一
@@ -361,6 +503,34 @@ class DataBase:
             )
             """)
 
+        # ingest_queue 是持久化的 ingest 工作队列，中断后可从中恢复
+        # status: pending（待抽取）/ extracted（已抽取待写入）/ failed（写入失败）
+        # result_json 保存已完成的抽取结果，恢复时 md5 未变则直接写入，不再请求 LLM
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_queue (
+                raw_path TEXT PRIMARY KEY,
+                file_md5 TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result_json TEXT,
+                last_error TEXT,
+                updated TEXT NOT NULL
+            )
+            """)
+        # embedding_cache 持久化 chunk 向量，键为 chunk 文本哈希 + embedding 模型 ID
+        # 重建索引时文本未变的 chunk 直接复用向量，只编码新文本
+        # vector 为 L2 归一化后的 float32 原始字节，dim 为向量维度
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                text_hash TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                updated TEXT NOT NULL,
+                PRIMARY KEY(text_hash, model_id)
+            )
+            """)
+
         self._conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_wiki_pages_type ON wiki_pages(page_type)"
         )
@@ -378,23 +548,61 @@ class DataBase:
         )
         self._conn.commit()
 
-    def _scan_raw_files(self) -> dict[str, str]:
+    def _scan_raw_files(self, rel_paths: set[str] | None = None) -> dict[str, str]:
         """
         扫描 raw 目录并返回文件 MD5 映射。
+
+        文件的 (size, mtime_ns, inode) 与 raw_files 中记录一致时直接复用已记录的 MD5，
+        只对状态变化的文件重新计算。内容未变而状态变化（如 touch）的文件会回写新的状态。
+        Parameters:
+            rel_paths (set[str] | None): 只扫描这些相对路径，None 表示整个 raw 目录
         Returns:
             dict[str, str]: {raw_relative_path: file_md5}
         """
+        cursor = self._conn.execute(
+            "SELECT raw_path, file_md5, file_size, mtime_ns, inode FROM raw_files"
+        )
+        known = {row[0]: (row[1], (row[2], row[3], row[4])) for row in cursor.fetchall()}
+
+        if rel_paths is None:
+            candidates = self.raw_dir.rglob("*")
+        else:
+            candidates = (self.raw_dir / rel_path for rel_path in sorted(rel_paths))
+
         results: dict[str, str] = {}
-        for file_path in self.raw_dir.rglob("*"):
+        refreshed: list[tuple[int, int, int, str, str]] = []
+        for file_path in candidates:
             if not file_path.is_file():
                 continue
             if file_path.suffix.lower() not in RAW_SUFFIXES:
                 continue
             rel_path = file_path.relative_to(self.raw_dir).as_posix()
             try:
-                results[rel_path] = _sum_md5(file_path)
+                st = file_path.stat()
+                stat_key = (st.st_size, st.st_mtime_ns, st.st_ino)
+                known_md5, known_stat = known.get(rel_path, (None, None))
+                if known_md5 and known_stat == stat_key:
+                    results[rel_path] = known_md5
+                    continue
+                file_md5 = _sum_md5(file_path)
             except Exception as exc:
                 Log.logger.warning(f"扫描 raw 文件失败，已跳过: {file_path}, {exc}")
+                continue
+            results[rel_path] = file_md5
+            if file_md5 == known_md5:
+                refreshed.append((*stat_key, rel_path, file_md5))
+            else:
+                self._raw_stats[rel_path] = stat_key
+
+        if refreshed:
+            self._conn.executemany(
+                """
+                UPDATE raw_files SET file_size = ?, mtime_ns = ?, inode = ?
+                WHERE raw_path = ? AND file_md5 = ?
+                """,
+                refreshed,
+            )
+            self._conn.commit()
         return results
 
     def _get_known_raw_files(self) -> dict[str, str]:
@@ -558,12 +766,24 @@ class DataBase:
             if old_path.exists():
                 old_path.unlink(missing_ok=True)
 
+        # 不能用 INSERT OR REPLACE：REPLACE 会先删除旧行，
+        # 外键 ON DELETE CASCADE 会连带删除该页的 chunks
         self._conn.execute(
             """
-            INSERT OR REPLACE INTO wiki_pages (
+            INSERT INTO wiki_pages (
                 page_id, page_type, title, file_path, content,
                 tags_json, sources_json, created, updated, raw_path
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(page_id) DO UPDATE SET
+                page_type = excluded.page_type,
+                title = excluded.title,
+                file_path = excluded.file_path,
+                content = excluded.content,
+                tags_json = excluded.tags_json,
+                sources_json = excluded.sources_json,
+                created = excluded.created,
+                updated = excluded.updated,
+                raw_path = excluded.raw_path
             """,
             (
                 page_id,
@@ -579,6 +799,8 @@ class DataBase:
             ),
         )
         self._conn.commit()
+        self._dirty_pages.add(page_id)
+        self._health_dirty_pages.add(page_id)
         return page_id
 
     def _delete_page(self, page_id: str) -> None:
@@ -593,11 +815,18 @@ class DataBase:
             if file_path.exists():
                 file_path.unlink(missing_ok=True)
 
+        # 被该页面引用的页面失去一条入链，需在下次健康检查中复查
+        cursor = self._conn.execute(
+            "SELECT to_page_id FROM page_refs WHERE from_page_id = ?", (page_id,)
+        )
+        self._health_dirty_pages.update(row[0] for row in cursor.fetchall())
+        self._health_dirty_pages.add(page_id)
         self._conn.execute("DELETE FROM page_refs WHERE from_page_id = ?", (page_id,))
         self._conn.execute("DELETE FROM page_refs WHERE to_page_id = ?", (page_id,))
         self._conn.execute("DELETE FROM chunks WHERE page_id = ?", (page_id,))
         self._conn.execute("DELETE FROM wiki_pages WHERE page_id = ?", (page_id,))
         self._conn.commit()
+        self._dirty_pages.add(page_id)
 
     def _ensure_stub_page(self, page_type: str, title: str, source_hint: str) -> str:
         """
@@ -631,6 +860,12 @@ class DataBase:
             refs (list[tuple[str, str]]): [(to_page_id, ref_type)]
         """
         now_dt = _now_datetime()
+        cursor = self._conn.execute(
+            "SELECT to_page_id FROM page_refs WHERE from_page_id = ?", (from_page_id,)
+        )
+        self._health_dirty_pages.update(row[0] for row in cursor.fetchall())
+        self._health_dirty_pages.add(from_page_id)
+        self._health_dirty_pages.update(to_page_id for to_page_id, _ in refs)
         self._conn.execute(
             "DELETE FROM page_refs WHERE from_page_id = ?", (from_page_id,)
         )
@@ -682,26 +917,21 @@ class DataBase:
             "relations": [],
         }
 
-    def _extract_structured_info(
-        self, raw_rel_path: str, cleaned_text: str
-    ) -> dict[str, Any]:
+    def _build_extract_prompt(self, raw_rel_path: str, cleaned_text: str) -> str:
         """
-        调用 LLM 阅读理解并提取结构化信息。
+        构建 LLM 结构化抽取提示词。
         Parameters:
             raw_rel_path (str): raw 相对路径
             cleaned_text (str): 清洗后的文本
         Returns:
-            dict[str, Any]: 抽取结果
+            str: 提示词
         """
-        if not self.enable_llm_extract:
-            return self._fallback_extract(raw_rel_path, cleaned_text)
-
         stem = Path(raw_rel_path).stem
         sample_text = cleaned_text
         if len(sample_text) > 9000:
             sample_text = f"{sample_text[:5500]}\n\n...\n\n{sample_text[-2500:]}"
 
-        prompt = f"""
+        return f"""
 你是知识工程助手。请阅读下面的原始资料，并输出严格 JSON（不要输出多余文字）：
 
 {{
@@ -727,18 +957,63 @@ class DataBase:
 {sample_text}
         """.strip()
 
-        try:
-            content = _sync_run_coroutine(
-                self._llm_client.request([{"role": "user", "content": prompt}]),
-                timeout=120,
-            )
-            if not content:
-                return self._fallback_extract(raw_rel_path, cleaned_text)
-            parsed = JsonParser().parse(content)
-        except Exception as exc:
-            Log.logger.warning(f"LLM 抽取失败，使用回退逻辑: {exc}")
-            return self._fallback_extract(raw_rel_path, cleaned_text)
+    async def _extract_structured_info(
+        self, raw_rel_path: str, cleaned_text: str
+    ) -> tuple[dict[str, Any], int, str | None]:
+        """
+        调用 LLM 阅读理解并提取结构化信息，失败时按配置重试，最终回退到规则抽取。
+        Parameters:
+            raw_rel_path (str): raw 相对路径
+            cleaned_text (str): 清洗后的文本
+        Returns:
+            tuple[dict[str, Any], int, str | None]: 抽取结果、LLM 请求次数、最后一次错误
+        """
+        if not self.enable_llm_extract:
+            return self._fallback_extract(raw_rel_path, cleaned_text), 0, None
+
+        prompt = self._build_extract_prompt(raw_rel_path, cleaned_text)
+        last_error: str | None = None
+        attempts = 0
+        for attempt in range(self.ingest_max_retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(self.ingest_retry_backoff_sec * (2 ** (attempt - 1)))
+            attempts += 1
+            try:
+                content = await asyncio.wait_for(
+                    self._llm_client.request([{"role": "user", "content": prompt}]),
+                    timeout=self.ingest_timeout_sec,
+                )
+                if not content:
+                    last_error = "LLM 返回为空"
+                    continue
+                parsed = JsonParser().parse(content)
+                if not isinstance(parsed, dict):
+                    last_error = "LLM 返回的不是 JSON 对象"
+                    continue
+            except Exception as exc:
+                last_error = f"{type(exc).__name__}: {exc}"
+                Log.logger.warning(
+                    f"LLM 抽取失败（第 {attempts} 次）: {raw_rel_path}, {last_error}"
+                )
+                continue
+            return self._normalize_extraction(parsed, raw_rel_path, cleaned_text), attempts, None
+
+        Log.logger.warning(f"LLM 抽取多次失败，使用回退逻辑: {raw_rel_path}")
+        return self._fallback_extract(raw_rel_path, cleaned_text), attempts, last_error
 
+    def _normalize_extraction(
+        self, parsed: dict[str, Any], raw_rel_path: str, cleaned_text: str
+    ) -> dict[str, Any]:
+        """
+        规范化 LLM 抽取结果。
+        Parameters:
+            parsed (dict[str, Any]): LLM 返回的 JSON
+            raw_rel_path (str): raw 相对路径
+            cleaned_text (str): 清洗后的文本
+        Returns:
+            dict[str, Any]: 结构化结果
+        """
+        stem = Path(raw_rel_path).stem
         title = str(parsed.get("title") or stem).strip() # type: ignore
         if not title:
             title = stem
@@ -949,28 +1224,45 @@ class DataBase:
         self._conn.execute("DELETE FROM raw_files WHERE raw_path = ?", (raw_rel_path,))
         self._conn.commit()
 
-    def _ingest_raw_file(self, raw_rel_path: str, file_md5: str) -> dict[str, Any]:
+    def _read_raw_file(self, raw_rel_path: str) -> str | None:
         """
-        处理单个 raw 文件，生成 Wiki 页面与元数据。
+        读取并清洗 raw 文件。
         Parameters:
             raw_rel_path (str): raw 相对路径
-            file_md5 (str): 文件 md5
         Returns:
-            dict[str, Any]: ingest 摘要
+            str | None: 清洗后的文本，文件不存在时为 None
         """
         raw_abs_path = self.raw_dir / raw_rel_path
         if not raw_abs_path.exists():
-            return {"raw": raw_rel_path, "status": "missing"}
-
+            return None
         raw_text = raw_abs_path.read_text(encoding="utf-8", errors="ignore")
-        cleaned = _clean_text(raw_text)
+        return _clean_text(raw_text)
+
+    def _apply_ingest(
+        self,
+        raw_rel_path: str,
+        file_md5: str,
+        cleaned: str | None,
+        structured: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """
+        将抽取结果写入 Wiki 页面与元数据（只由写入方调用，保证 SQLite 写入串行）。
+        Parameters:
+            raw_rel_path (str): raw 相对路径
+            file_md5 (str): 文件 md5
+            cleaned (str | None): 清洗后的文本，None 表示文件已不存在
+            structured (dict[str, Any] | None): 结构化抽取结果
+        Returns:
+            dict[str, Any]: ingest 摘要
+        """
+        if cleaned is None:
+            return {"raw": raw_rel_path, "status": "missing"}
 
         self._delete_raw_related_data(raw_rel_path)
 
-        if not cleaned:
+        if not cleaned or structured is None:
             return {"raw": raw_rel_path, "status": "empty"}
 
-        structured = self._extract_structured_info(raw_rel_path, cleaned)
         source_title = _sanitize_page_name(
             structured.get("title") or Path(raw_rel_path).stem
         )
@@ -1039,14 +1331,18 @@ class DataBase:
                 """,
                 (subject, predicate, obj, source_page_id, raw_rel_path, now_dt),
             )
+            self._health_dirty_facts.add((subject, predicate))
         self._conn.commit()
 
+        # 记录计算该 MD5 时的文件状态；没有记录时留空，下次扫描会重新计算
+        file_stat = self._raw_stats.pop(raw_rel_path, (None, None, None))
         self._conn.execute(
             """
-            INSERT OR REPLACE INTO raw_files (raw_path, file_md5, source_page_id, updated)
-            VALUES (?, ?, ?, ?)
+            INSERT OR REPLACE INTO raw_files (
+                raw_path, file_md5, source_page_id, updated, file_size, mtime_ns, inode
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            (raw_rel_path, file_md5, source_page_id, now_dt),
+            (raw_rel_path, file_md5, source_page_id, now_dt, *file_stat),
         )
         self._conn.commit()
 
@@ -1059,6 +1355,183 @@ class DataBase:
             "relations": len(relations),
         }
 
+    def _enqueue_ingest(self, items: list[tuple[str, str]]) -> dict[str, dict[str, Any]]:
+        """
+        将待 ingest 文件写入持久化队列，md5 未变的已有条目保留（含已完成的抽取结果）。
+        Parameters:
+            items (list[tuple[str, str]]): [(raw_rel_path, file_md5)]
+        Returns:
+            dict[str, dict[str, Any]]: {raw_rel_path: 队列条目}
+        """
+        cursor = self._conn.execute(
+            "SELECT raw_path, file_md5, status, attempts, result_json FROM ingest_queue"
+        )
+        existing = {row[0]: row for row in cursor.fetchall()}
+
+        now_dt = _now_datetime()
+        queue: dict[str, dict[str, Any]] = {}
+        for raw_rel_path, file_md5 in items:
+            row = existing.get(raw_rel_path)
+            if row and row[1] == file_md5 and row[2] == "extracted" and row[4]:
+                queue[raw_rel_path] = {
+                    "file_md5": file_md5,
+                    "attempts": int(row[3]),
+                    "structured": json.loads(row[4]),
+                }
+                continue
+            attempts = int(row[3]) if row and row[1] == file_md5 else 0
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO ingest_queue
+                (raw_path, file_md5, status, attempts, result_json, last_error, updated)
+                VALUES (?, ?, 'pending', ?, NULL, NULL, ?)
+                """,
+                (raw_rel_path, file_md5, attempts, now_dt),
+            )
+            queue[raw_rel_path] = {"file_md5": file_md5, "attempts": attempts, "structured": None}
+        self._conn.commit()
+        return queue
+
+    def _prune_ingest_queue(self, keep: set[str]) -> None:
+        """
+        移除不再需要 ingest 的队列条目（文件已删除或已 ingest）。
+        Parameters:
+            keep (set[str]): 仍需保留的 raw 相对路径
+        """
+        cursor = self._conn.execute("SELECT raw_path FROM ingest_queue")
+        stale = [(row[0],) for row in cursor.fetchall() if row[0] not in keep]
+        if stale:
+            self._conn.executemany("DELETE FROM ingest_queue WHERE raw_path = ?", stale)
+            self._conn.commit()
+
+    def _record_extractions(self, results: list[tuple[str, str, dict[str, Any], int, str | None]]) -> None:
+        """
+        持久化已完成的抽取结果。
+        Parameters:
+            results (list[tuple]): [(raw_rel_path, file_md5, structured, attempts, last_error)]
+        """
+        now_dt = _now_datetime()
+        self._conn.executemany(
+            """
+            UPDATE ingest_queue
+            SET status = 'extracted', attempts = attempts + ?, result_json = ?, last_error = ?, updated = ?
+            WHERE raw_path = ? AND file_md5 = ?
+            """,
+            [
+                (
+                    attempts,
+                    json.dumps(structured, ensure_ascii=False),
+                    last_error,
+                    now_dt,
+                    raw_rel_path,
+                    file_md5,
+                )
+                for raw_rel_path, file_md5, structured, attempts, last_error in results
+            ],
+        )
+        self._conn.commit()
+
+    def _finish_ingest(self, raw_rel_path: str, error: str | None = None) -> None:
+        """
+        结束单个队列条目：成功则移出队列，失败则标记 failed 留待下次重建重试。
+        Parameters:
+            raw_rel_path (str): raw 相对路径
+            error (str | None): 失败原因
+        """
+        if error is None:
+            self._conn.execute("DELETE FROM ingest_queue WHERE raw_path = ?", (raw_rel_path,))
+        else:
+            self._conn.execute(
+                "UPDATE ingest_queue SET status = 'failed', last_error = ?, updated = ? WHERE raw_path = ?",
+                (error, _now_datetime(), raw_rel_path),
+            )
+        self._conn.commit()
+
+    def _ingest_files(self, items: list[tuple[str, str]]) -> list[dict[str, Any]]:
+        """
+        并发 ingest 一批 raw 文件。
+
+        LLM 抽取按 ingest_concurrency 并发进行，单文件失败按 ingest_max_retries 重试；
+        所有 SQLite 写入由唯一的写入协程串行执行。抽取结果先落入 ingest_queue，
+        进程中断后再次重建时，md5 未变的文件直接复用已完成的抽取结果。
+        Parameters:
+            items (list[tuple[str, str]]): [(raw_rel_path, file_md5)]
+        Returns:
+            list[dict[str, Any]]: ingest 摘要列表
+        """
+        if not items:
+            return []
+        queue = self._enqueue_ingest(items)
+        return _sync_run_coroutine(self._run_ingest_pipeline(queue), timeout=None) or []
+
+    async def _run_ingest_pipeline(
+        self, queue: dict[str, dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        ingest 流水线：并发抽取 → 单写入方落库。
+        Parameters:
+            queue (dict[str, dict[str, Any]]): _enqueue_ingest 返回的队列条目
+        Returns:
+            list[dict[str, Any]]: ingest 摘要列表
+        """
+        total = len(queue)
+        semaphore = asyncio.Semaphore(self.ingest_concurrency)
+        ready: asyncio.Queue = asyncio.Queue()
+        details: list[dict[str, Any]] = []
+
+        async def extract(raw_rel_path: str, item: dict[str, Any]) -> None:
+            try:
+                cleaned = await asyncio.to_thread(self._read_raw_file, raw_rel_path)
+                structured = item["structured"]
+                attempts, last_error = 0, None
+                if cleaned and structured is None:
+                    async with semaphore:
+                        structured, attempts, last_error = await self._extract_structured_info(
+                            raw_rel_path, cleaned
+                        )
+                await ready.put((raw_rel_path, item["file_md5"], cleaned, structured, attempts, last_error, None))
+            except Exception as exc:
+                await ready.put((raw_rel_path, item["file_md5"], None, None, 0, None, exc))
+
+        async def writer() -> None:
+            done = 0
+            while done < total:
+                # 取出所有已就绪的结果，先批量持久化抽取结果，再逐个写入页面
+                batch = [await ready.get()]
+                while not ready.empty():
+                    batch.append(ready.get_nowait())
+
+                extracted = [
+                    (raw, md5, structured, attempts, last_error)
+                    for raw, md5, _cleaned, structured, attempts, last_error, error in batch
+                    if error is None and structured is not None
+                ]
+                if extracted:
+                    await asyncio.to_thread(self._record_extractions, extracted)
+
+                for raw, md5, cleaned, structured, attempts, last_error, error in batch:
+                    try:
+                        if error is not None:
+                            raise error
+                        detail = await asyncio.to_thread(
+                            self._apply_ingest, raw, md5, cleaned, structured
+                        )
+                        if attempts:
+                            detail["llm_attempts"] = attempts
+                        if last_error:
+                            detail["llm_error"] = last_error
+                        details.append(detail)
+                        await asyncio.to_thread(self._finish_ingest, raw)
+                    except Exception as exc:
+                        Log.logger.error(f"ingest 失败: {raw}, {exc}")
+                        details.append({"raw": raw, "status": "failed", "error": str(exc)})
+                        await asyncio.to_thread(self._finish_ingest, raw, str(exc))
+                    done += 1
+                    self._set_rebuild_progress("ingest", done, total)
+
+        await asyncio.gather(writer(), *(extract(raw, item) for raw, item in queue.items()))
+        return details
+
     def _list_all_pages(self) -> list[tuple[str, str, str]]:
         """
         列出全部页面。
@@ -1070,12 +1543,139 @@ class DataBase:
         )
         return [(row[0], row[1], row[2]) for row in cursor.fetchall()]
 
+    def _chunk_page_content(self, content: str) -> list[str]:
+        """
+        将页面内容切分为检索用 chunk。
+        Parameters:
+            content (str): 页面完整内容（含 frontmatter）
+        Returns:
+            list[str]: chunk 文本列表
+        """
+        body = self._strip_frontmatter(content)
+        return _split_semantic_blocks(body, max_chars=650, min_chars=90)
+
+    def _encode_chunks(self, texts: list[str]) -> np.ndarray:
+        """
+        编码 chunk 文本，优先复用 embedding_cache 中的持久化向量。
+        Parameters:
+            texts (list[str]): chunk 文本列表
+        Returns:
+            np.ndarray: (len(texts), D) 归一化 float32 向量
+        """
+        model_id = embedding.get_model_id()
+        hashes = [_text_hash(text) for text in texts]
+
+        cached: dict[str, np.ndarray] = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique_hashes), 500):
+            batch = unique_hashes[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            cursor = self._conn.execute(
+                f"""
+                SELECT text_hash, dim, vector FROM embedding_cache
+                WHERE model_id = ? AND text_hash IN ({placeholders})
+                """,
+                [model_id, *batch],
+            )
+            for text_hash, dim, blob in cursor.fetchall():
+                vector = np.frombuffer(blob, dtype=np.float32)
+                if vector.shape[0] == int(dim):
+                    cached[text_hash] = vector
+
+        missing: dict[str, str] = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+
+        if missing:
+            vectors = embedding_service.encode(list(missing.values()), use_cache=False)
+            now_dt = _now_datetime()
+            rows = []
+            for text_hash, vector in zip(missing.keys(), vectors):
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                cached[text_hash] = vector
+                rows.append(
+                    (text_hash, model_id, int(vector.shape[0]), vector.tobytes(), now_dt)
+                )
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO embedding_cache (text_hash, model_id, dim, vector, updated)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.commit()
+
+        Log.logger.info(
+            f"chunk 向量编码: 共 {len(texts)} 条，复用缓存 {len(texts) - len(missing)} 条，"
+            f"新编码 {len(missing)} 条"
+        )
+        return np.ascontiguousarray(
+            np.stack([cached[text_hash] for text_hash in hashes]), dtype=np.float32
+        )
+
+    def _gc_embedding_cache(self) -> int:
+        """
+        清理 embedding_cache 中不再被任何 chunk 引用的向量，以及其他模型产生的向量。
+        Returns:
+            int: 删除的条目数
+        """
+        model_id = embedding.get_model_id()
+        cursor = self._conn.execute("SELECT chunk_text FROM chunks")
+        referenced = {_text_hash(row[0]) for row in cursor.fetchall()}
+
+        cursor = self._conn.execute(
+            "DELETE FROM embedding_cache WHERE model_id != ?", (model_id,)
+        )
+        removed = max(cursor.rowcount, 0)
+
+        cursor = self._conn.execute(
+            "SELECT text_hash FROM embedding_cache WHERE model_id = ?", (model_id,)
+        )
+        stale = [(row[0], model_id) for row in cursor.fetchall() if row[0] not in referenced]
+        if stale:
+            self._conn.executemany(
+                "DELETE FROM embedding_cache WHERE text_hash = ? AND model_id = ?", stale
+            )
+        self._conn.commit()
+        return removed + len(stale)
+
+    def _add_vectors_to_index(self, index_obj: Any, vectors: np.ndarray, ids: np.ndarray) -> None:
+        """
+        按 ID 向索引添加向量。
+        Parameters:
+            index_obj (faiss.IndexIDMap2): 目标索引
+            vectors (np.ndarray): 归一化向量
+            ids (np.ndarray): int64 ID
+        """
+        try:
+            index_obj.add_with_ids(vectors, ids)  # type: ignore[call-arg]
+        except TypeError:
+            index_obj.add_with_ids(
+                int(vectors.shape[0]),
+                faiss.swig_ptr(vectors),
+                faiss.swig_ptr(ids),
+            )
+
+    def _mark_chunks_indexed(self, chunk_ids: list[int]) -> None:
+        """
+        回写 chunk 的 faiss_id（与 chunk_id 相同）。
+        Parameters:
+            chunk_ids (list[int]): 已写入索引的 chunk_id
+        """
+        self._conn.executemany(
+            "UPDATE chunks SET faiss_id = ? WHERE chunk_id = ?",
+            [(chunk_id, chunk_id) for chunk_id in chunk_ids],
+        )
+        self._conn.commit()
+
     def _rebuild_embeddings_index(self) -> None:
         """
-        基于 Wiki 页面重建向量索引。
+        基于 Wiki 页面全量重建向量索引。
         """
         self._conn.execute("DELETE FROM chunks")
         self._conn.commit()
+        self._dirty_pages.clear()
 
         pages = self._list_all_pages()
         all_chunk_ids: list[int] = []
@@ -1083,8 +1683,7 @@ class DataBase:
 
         now_dt = _now_datetime()
         for page_id, _title, content in pages:
-            body = self._strip_frontmatter(content)
-            chunks = _split_semantic_blocks(body, max_chars=650, min_chars=90)
+            chunks = self._chunk_page_content(content)
             if not chunks:
                 continue
 
@@ -1105,40 +1704,179 @@ class DataBase:
         self._conn.commit()
 
         if not all_chunk_ids:
-            self.index = None
-            self.dimension = None
-            self.data_count = 0
+            self._swap_index(None)
             if self.index_path.exists():
                 self.index_path.unlink(missing_ok=True)
             return
 
-        vectors = _normalize_vectors(embedding.t2vect(all_chunk_texts))
-        dimension = int(vectors.shape[1])
-
-        base_index = faiss.IndexFlatIP(dimension)
-        index_obj = faiss.IndexIDMap2(base_index)
+        vectors = self._encode_chunks(all_chunk_texts)
         ids = np.asarray(all_chunk_ids, dtype=np.int64)
+        # 按 chunk 数量选择 Flat / IVF 索引，增量同步需要按 ID 删除
+        index_obj = vector_index.build_index(vectors, ids=ids, removable=True)
+        self._mark_chunks_indexed(all_chunk_ids)
+        self._persist_and_swap_index(index_obj)
 
-        try:
-            index_obj.add_with_ids(vectors, ids)  # type: ignore[call-arg]
-        except TypeError:
-            index_obj.add_with_ids(
-                int(vectors.shape[0]),
-                faiss.swig_ptr(vectors),
-                faiss.swig_ptr(ids),
+    def _persist_and_swap_index(self, index_obj: Any) -> None:
+        """
+        原子写入索引文件后替换检索索引；启用 mmap 时改用映射方式重新打开写入的文件，释放内存中的副本。
+        Parameters:
+            index_obj (faiss.IndexIDMap2): 新索引
+        """
+        vector_index.write_index_atomic(
+            index_obj, self.index_path, model_id=embedding.get_model_id()
+        )
+        if self.index_mmap:
+            index_obj = vector_index.read_index(self.index_path, mmap=True)
+        self._swap_index(index_obj)
+
+    def _load_chunk_store(self) -> _ChunkStore:
+        """
+        从 chunks 表加载已入索引的 chunk 及其页面信息。
+        Returns:
+            _ChunkStore: chunk 内存表
+        """
+        cursor = self._conn.execute(
+            """
+            SELECT c.chunk_id, c.chunk_text, p.title, p.page_type
+            FROM chunks c
+            JOIN wiki_pages p ON c.page_id = p.page_id
+            WHERE c.faiss_id IS NOT NULL
+            """
+        )
+        return _ChunkStore(cursor.fetchall())
+
+    def _swap_index(self, index_obj: Any) -> None:
+        """
+        原子替换检索使用的索引及对应的 chunk 内存表。
+
+        重建在索引副本上进行，完成后一次性替换引用；search 读取的是替换前或替换后的完整快照，
+        不会看到修改到一半的状态，也不会出现索引与 chunk 表不对应的情况。
+        Parameters:
+            index_obj (faiss.IndexIDMap2 | None): 新索引
+        """
+        if index_obj is None:
+            self._search_snapshot = None
+        else:
+            self._search_snapshot = (index_obj, self._load_chunk_store())
+        # 先替换快照再递增代数：search 先读代数再读快照，缓存条目不会以新代数保存旧快照的结果
+        self._generation += 1
+        self.index = index_obj
+        self.dimension = int(index_obj.d) if index_obj is not None else None
+        self.data_count = int(index_obj.ntotal) if index_obj is not None else 0
+
+    def _load_persisted_index(self) -> bool:
+        """
+        确保内存中有可用的索引，必要时从磁盘加载上次持久化的索引。
+        Returns:
+            bool: 是否已有索引（否则需要全量重建）
+        """
+        if self.index is None and self.index_path.exists():
+            if not vector_index.index_model_matches(
+                self.index_path, embedding.get_model_id()
+            ):
+                Log.logger.info("向量索引由其他 embedding 模型或池化方式生成，将全量重建")
+                return False
+            try:
+                loaded = vector_index.read_index(self.index_path, mmap=self.index_mmap)
+                if isinstance(loaded, faiss.IndexIDMap2):
+                    self._swap_index(loaded)
+            except Exception as exc:
+                Log.logger.warning(f"加载向量索引失败，将全量重建: {exc}")
+        return self.index is not None
+
+    def _sync_embeddings_index(self) -> dict[str, int]:
+        """
+        增量同步向量索引：只重新切分、编码被改动过的页面。
+
+        1. 对脏页面重新切分，chunk 文本未变化的页面保持原样；
+        2. 索引中存在而 chunks 表已不存在的 ID 从索引移除；
+        3. chunks 表中尚未入索引的 chunk 编码后按 ID 加入索引。
+
+        第 2、3 步以索引与 chunks 表的 ID 差集为准，因此也能自愈中断或外部改动造成的不一致。
+        chunk 数量变化导致应使用的索引类型改变（或 IVF 需要重新训练）时改为全量重建，
+        已编码的向量由 embedding_cache 复用。
+        Returns:
+            dict[str, int]: {"pages": 处理的脏页面数, "removed": 移除向量数, "added": 新增向量数}
+        """
+        if not self._load_persisted_index():
+            self._rebuild_embeddings_index()
+            return {"pages": -1, "removed": 0, "added": self.data_count}
+
+        dirty_pages = sorted(self._dirty_pages)
+        self._dirty_pages.clear()
+        # 在副本上增删向量，完成后再替换，检索线程始终使用完整的旧索引（mmap 加载的只读索引也由此复制到内存）
+        work_index = faiss.clone_index(self.index)
+
+        now_dt = _now_datetime()
+        for page_id in dirty_pages:
+            page = self._get_page(page_id)
+            new_chunks = self._chunk_page_content(page["content"]) if page else []
+            cursor = self._conn.execute(
+                "SELECT chunk_text FROM chunks WHERE page_id = ? ORDER BY chunk_id",
+                (page_id,),
             )
+            old_chunks = [row[0] for row in cursor.fetchall()]
+            if old_chunks == new_chunks:
+                continue
 
-        for chunk_id in all_chunk_ids:
-            self._conn.execute(
-                "UPDATE chunks SET faiss_id = ? WHERE chunk_id = ?",
-                (chunk_id, chunk_id),
+            self._conn.execute("DELETE FROM chunks WHERE page_id = ?", (page_id,))
+            self._conn.executemany(
+                """
+                INSERT INTO chunks (page_id, chunk_text, faiss_id, updated)
+                VALUES (?, ?, NULL, ?)
+                """,
+                [(page_id, chunk_text, now_dt) for chunk_text in new_chunks],
             )
         self._conn.commit()
 
-        self.index = index_obj
-        self.dimension = dimension
-        self.data_count = len(all_chunk_ids)
-        faiss.write_index(self.index, str(self.index_path))
+        cursor = self._conn.execute("SELECT chunk_id FROM chunks")
+        db_ids = np.asarray([row[0] for row in cursor.fetchall()], dtype=np.int64)
+        if vector_index.needs_rebuild(work_index, int(db_ids.size), removable=True):
+            Log.logger.info(
+                f"知识库 chunk 数量变为 {db_ids.size}，按新规模重建向量索引"
+            )
+            self._rebuild_embeddings_index()
+            return {"pages": -1, "removed": 0, "added": self.data_count}
+        index_ids = faiss.vector_to_array(work_index.id_map).astype(np.int64)
+
+        stale_ids = np.setdiff1d(index_ids, db_ids)
+        if stale_ids.size:
+            work_index.remove_ids(stale_ids)
+
+        missing_ids = np.setdiff1d(db_ids, index_ids).tolist()
+        added = 0
+        if missing_ids:
+            texts_by_id: dict[int, str] = {}
+            for start in range(0, len(missing_ids), 500):
+                batch = missing_ids[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                cursor = self._conn.execute(
+                    f"SELECT chunk_id, chunk_text FROM chunks WHERE chunk_id IN ({placeholders})",
+                    batch,
+                )
+                texts_by_id.update({int(row[0]): row[1] for row in cursor.fetchall()})
+
+            vectors = self._encode_chunks(
+                [texts_by_id[chunk_id] for chunk_id in missing_ids]
+            )
+            if int(vectors.shape[1]) != int(work_index.d):
+                # embedding 模型维度变化，旧索引不可复用
+                self._rebuild_embeddings_index()
+                return {"pages": -1, "removed": 0, "added": self.data_count}
+
+            self._add_vectors_to_index(
+                work_index, vectors, np.asarray(missing_ids, dtype=np.int64)
+            )
+            self._mark_chunks_indexed(missing_ids)
+            added = len(missing_ids)
+
+        if stale_ids.size or added:
+            self._persist_and_swap_index(work_index)
+        elif dirty_pages:
+            # chunk 未变但页面信息可能已更新，刷新内存表
+            self._swap_index(self.index)
+
+        return {"pages": len(dirty_pages), "removed": int(stale_ids.size), "added": added}
 
     def _refresh_wiki_index_page(self) -> None:
         """
@@ -1227,23 +1965,59 @@ class DataBase:
         self._conn.commit()
         return count
 
+    def _query_in(self, sql: str, values: set[str] | list[str]) -> list[tuple[Any, ...]]:
+        """
+        分批执行带 IN 列表的查询，避免超出 SQLite 参数数量上限。
+        Parameters:
+            sql (str): 含 {placeholders} 的查询语句，可出现多次（每处使用同一批参数）
+            values (set[str] | list[str]): IN 列表取值
+        Returns:
+            list[tuple[Any, ...]]: 各批次结果合并
+        """
+        values = sorted(values)
+        repeat = sql.count("{placeholders}")
+        rows: list[tuple[Any, ...]] = []
+        for start in range(0, len(values), 500):
+            batch = values[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            cursor = self._conn.execute(
+                sql.replace("{placeholders}", placeholders), batch * repeat
+            )
+            rows.extend(cursor.fetchall())
+        return rows
+
     def _check_and_fix_contradictions(
-        self, auto_fix: bool
+        self, auto_fix: bool, keys: set[tuple[str, str]] | None = None
     ) -> tuple[list[dict[str, Any]], int]:
         """
         检查并修复事实冲突。
         Parameters:
             auto_fix (bool): 是否自动修复
+            keys (set[tuple[str, str]] | None): 只检查这些 (subject, predicate)，None 表示全部
         Returns:
             tuple[list[dict[str, Any]], int]: 冲突列表与修复数量
         """
-        cursor = self._conn.execute("""
-            SELECT subject, predicate, COUNT(DISTINCT object) AS obj_count
-            FROM facts
-            GROUP BY subject, predicate
-            HAVING obj_count > 1
-            """)
-        groups = cursor.fetchall()
+        if keys is None:
+            cursor = self._conn.execute("""
+                SELECT subject, predicate, COUNT(DISTINCT object) AS obj_count
+                FROM facts
+                GROUP BY subject, predicate
+                HAVING obj_count > 1
+                """)
+            groups = cursor.fetchall()
+        else:
+            groups = []
+            for subject, predicate in sorted(keys):
+                cursor = self._conn.execute(
+                    """
+                    SELECT COUNT(DISTINCT object) FROM facts
+                    WHERE subject = ? AND predicate = ?
+                    """,
+                    (subject, predicate),
+                )
+                obj_count = int(cursor.fetchone()[0])
+                if obj_count > 1:
+                    groups.append((subject, predicate, obj_count))
 
         conflicts: list[dict[str, Any]] = []
         fixed = 0
@@ -1284,17 +2058,75 @@ class DataBase:
 
         return conflicts, fixed
 
-    def run_health_check(self, auto_fix: bool = True) -> dict[str, Any]:
+    def run_health_check(self, auto_fix: bool = True, full: bool = False) -> dict[str, Any]:
         """
         执行健康检查并按策略修复。
         Parameters:
             auto_fix (bool): 是否自动修复
+            full (bool): 是否全量检查（默认只检查上次检查以来改动过的页面、引用和事实）
         Returns:
             dict[str, Any]: 健康检查报告
         """
+        with self._rebuild_lock:
+            return self._run_health_check(auto_fix, full)
+
+    def _run_health_check(
+        self, auto_fix: bool, full: bool = True, cancel: threading.Event | None = None
+    ) -> dict[str, Any]:
+        """
+        健康检查实现（调用方持有 _rebuild_lock）。
+
+        检查中断（取消或异常）时保留改动记录，下次检查会重新覆盖这些页面。
+        Parameters:
+            auto_fix (bool): 是否自动修复
+            full (bool): 是否全量检查
+            cancel (threading.Event | None): 取消信号，在各检查阶段之间响应
+        Returns:
+            dict[str, Any]: 健康检查报告
+        """
+        dirty_pages = set(self._health_dirty_pages)
+        dirty_facts = set(self._health_dirty_facts)
+        self._health_dirty_pages.clear()
+        self._health_dirty_facts.clear()
+        try:
+            report = self._check_health(auto_fix, full, dirty_pages, dirty_facts, cancel)
+        except BaseException:
+            self._health_dirty_pages.update(dirty_pages)
+            self._health_dirty_facts.update(dirty_facts)
+            raise
+
+        self._last_health_check_ts = int(time.time())
+        return report
+
+    def _check_health(
+        self,
+        auto_fix: bool,
+        full: bool,
+        dirty_pages: set[str],
+        dirty_facts: set[tuple[str, str]],
+        cancel: threading.Event | None,
+    ) -> dict[str, Any]:
+        """
+        按范围执行各项健康检查。
+        Parameters:
+            auto_fix (bool): 是否自动修复
+            full (bool): 是否全量检查
+            dirty_pages (set[str]): 增量检查范围内的页面
+            dirty_facts (set[tuple[str, str]]): 增量检查范围内的事实键
+            cancel (threading.Event | None): 取消信号
+        Returns:
+            dict[str, Any]: 健康检查报告
+        """
+
+        def check_cancelled() -> None:
+            if cancel is not None and cancel.is_set():
+                raise HealthCheckCancelled()
+
         report: dict[str, Any] = {
             "checked_at": _now_datetime(),
             "auto_fix": auto_fix,
+            "mode": "full" if full else "incremental",
+            "checked_pages": None if full else len(dirty_pages),
             "contradictions": [],
             "orphan_pages": [],
             "missing_targets": [],
@@ -1310,34 +2142,54 @@ class DataBase:
             },
         }
 
+        check_cancelled()
         contradictions, contradiction_fixed = self._check_and_fix_contradictions(
-            auto_fix=auto_fix
+            auto_fix=auto_fix, keys=None if full else dirty_facts
         )
         report["contradictions"] = contradictions
         report["fixed"]["contradictions"] = contradiction_fixed
 
-        cursor = self._conn.execute("""
+        check_cancelled()
+        orphan_sql = """
             SELECT p.page_id
             FROM wiki_pages p
             LEFT JOIN page_refs r ON p.page_id = r.to_page_id
-            WHERE p.page_type IN ('entity', 'concept')
+            WHERE p.page_type IN ('entity', 'concept') {scope}
             GROUP BY p.page_id
             HAVING COUNT(r.from_page_id) = 0
-            """)
-        orphan_ids = [row[0] for row in cursor.fetchall()]
+            """
+        if full:
+            rows = self._conn.execute(orphan_sql.replace("{scope}", "")).fetchall()
+        else:
+            rows = self._query_in(
+                orphan_sql.replace("{scope}", "AND p.page_id IN ({placeholders})"),
+                dirty_pages,
+            )
+        orphan_ids = [row[0] for row in rows]
         report["orphan_pages"] = orphan_ids
 
         if auto_fix and orphan_ids:
             linked = self._ensure_orphan_summary_page(orphan_ids)
             report["fixed"]["orphan_links"] = linked
 
-        cursor = self._conn.execute("""
+        check_cancelled()
+        missing_sql = """
             SELECT DISTINCT r.to_page_id
             FROM page_refs r
             LEFT JOIN wiki_pages p ON r.to_page_id = p.page_id
-            WHERE p.page_id IS NULL
-            """)
-        missing_targets = [row[0] for row in cursor.fetchall()]
+            WHERE p.page_id IS NULL {scope}
+            """
+        if full:
+            rows = self._conn.execute(missing_sql.replace("{scope}", "")).fetchall()
+        else:
+            rows = self._query_in(
+                missing_sql.replace(
+                    "{scope}",
+                    "AND (r.from_page_id IN ({placeholders}) OR r.to_page_id IN ({placeholders}))",
+                ),
+                dirty_pages,
+            )
+        missing_targets = list(dict.fromkeys(row[0] for row in rows))
         report["missing_targets"] = missing_targets
 
         if auto_fix and missing_targets:
@@ -1352,28 +2204,34 @@ class DataBase:
                 fixed_missing += 1
             report["fixed"]["missing_pages"] = fixed_missing
 
-        cursor = self._conn.execute("""
-            SELECT rf.raw_path, rf.updated, p.updated, rf.file_md5
-            FROM raw_files rf
-            JOIN wiki_pages p ON rf.source_page_id = p.page_id
-            """)
-        outdated = []
+        check_cancelled()
+        # 只对文件状态变化的 raw 文件计算 MD5
         current_raw = self._scan_raw_files()
-        for raw_path, _raw_updated, _page_updated, stored_md5 in cursor.fetchall():
-            current_md5 = current_raw.get(raw_path)
-            if current_md5 and current_md5 != stored_md5:
-                outdated.append(raw_path)
+        outdated = []
+        if current_raw:
+            cursor = self._conn.execute("""
+                SELECT rf.raw_path, rf.updated, p.updated, rf.file_md5
+                FROM raw_files rf
+                JOIN wiki_pages p ON rf.source_page_id = p.page_id
+                """)
+            for raw_path, _raw_updated, _page_updated, stored_md5 in cursor.fetchall():
+                current_md5 = current_raw.get(raw_path)
+                if current_md5 and current_md5 != stored_md5:
+                    outdated.append(raw_path)
         report["outdated_sources"] = outdated
 
         if auto_fix and outdated:
-            fixed_count = 0
-            for raw_path in outdated:
-                current_md5 = current_raw.get(raw_path)
-                if not current_md5:
-                    continue
-                self._ingest_raw_file(raw_path, current_md5)
-                fixed_count += 1
-            report["fixed"]["outdated_reingest"] = fixed_count
+            check_cancelled()
+            details = self._ingest_files(
+                [(raw_path, current_raw[raw_path]) for raw_path in outdated]
+            )
+            report["fixed"]["outdated_reingest"] = sum(
+                1 for detail in details if detail.get("status") != "failed"
+            )
+
+        # 修复过程中改动的页面只增量同步其 chunk
+        if auto_fix and self._dirty_pages:
+            self._sync_embeddings_index()
 
         cursor = self._conn.execute("SELECT COUNT(*) FROM chunks")
         chunk_count = int(cursor.fetchone()[0])
@@ -1383,38 +2241,310 @@ class DataBase:
         report["index_sync_ok"] = index_ok
 
         if auto_fix and not index_ok:
-            self._rebuild_embeddings_index()
+            # 增量同步按 ID 差集对齐索引与 chunks 表
+            self._sync_embeddings_index()
             report["fixed"]["index_rebuilt"] = True
 
-        cursor = self._conn.execute("""
+        check_cancelled()
+        candidates_sql = """
             SELECT to_page_id, COUNT(*) AS inbound_count
-            FROM page_refs
+            FROM page_refs {scope}
             GROUP BY to_page_id
             HAVING inbound_count >= 5
-            ORDER BY inbound_count DESC
-            """)
-        candidates = [row[0] for row in cursor.fetchall()]
-        report["summary_page_candidates"] = candidates
+            """
+        if full:
+            rows = self._conn.execute(candidates_sql.replace("{scope}", "")).fetchall()
+        else:
+            rows = self._query_in(
+                candidates_sql.replace("{scope}", "WHERE to_page_id IN ({placeholders})"),
+                dirty_pages,
+            )
+        rows.sort(key=lambda row: row[1], reverse=True)
+        report["summary_page_candidates"] = [row[0] for row in rows]
 
-        self._refresh_wiki_index_page()
-        self._last_health_check_ts = int(time.time())
+        if full or dirty_pages or self._health_dirty_pages:
+            self._refresh_wiki_index_page()
 
         return report
 
-    def _maybe_periodic_health_check(self) -> None:
+    def _start_health_scheduler(self) -> None:
         """
-        按周期触发健康检查。
+        启动后台健康检查线程。
         """
-        if self.health_check_interval_sec <= 0:
-            return
-        now_ts = int(time.time())
-        if now_ts - self._last_health_check_ts < self.health_check_interval_sec:
+        if self._health_thread is not None:
             return
+        self._health_thread = threading.Thread(
+            target=self._health_scheduler_loop, name="knowledge-health-check", daemon=True
+        )
+        self._health_thread.start()
+
+    def _health_scheduler_loop(self) -> None:
+        """
+        健康检查调度循环：按间隔定时执行增量检查，或响应 start_health_check 的手动请求。
+        """
+        while not self._closed.is_set():
+            interval = self.health_check_interval_sec
+            self._health_wakeup.wait(interval if interval > 0 else None)
+            self._health_wakeup.clear()
+            if self._closed.is_set():
+                return
+            request, self._health_request = self._health_request, None
+            if request is None:
+                if interval <= 0:
+                    continue
+                # 重建进行中时跳过，重建结束前会执行一次健康检查；间隔内已检查过也跳过
+                if self._rebuild_state["state"] in ("pending", "running"):
+                    continue
+                if time.time() - self._last_health_check_ts < interval:
+                    continue
+                request = {"auto_fix": True, "full": False}
+            self._execute_health_check(request["auto_fix"], request["full"])
 
+    def _execute_health_check(self, auto_fix: bool, full: bool) -> None:
+        """
+        在调度线程中执行一次健康检查并记录状态。
+        Parameters:
+            auto_fix (bool): 是否自动修复
+            full (bool): 是否全量检查
+        """
+        self._health_state.update(
+            {"state": "pending", "mode": "full" if full else "incremental", "error": None}
+        )
+        # 等锁期间（其他实例或本实例正在重建）也要能响应 close()
+        while not self._rebuild_lock.acquire(timeout=1):
+            if self._closed.is_set():
+                self._health_state.update(
+                    {"state": "cancelled", "finished_at": _now_datetime()}
+                )
+                return
         try:
-            self.run_health_check(auto_fix=True)
-        except Exception as exc:
-            Log.logger.warning(f"周期健康检查失败: {exc}")
+            self._health_state.update(
+                {"state": "running", "started_at": _now_datetime(), "finished_at": None}
+            )
+            try:
+                report = self._run_health_check(auto_fix, full, cancel=self._health_cancel)
+            except HealthCheckCancelled:
+                Log.logger.info("知识库健康检查已取消")
+                self._health_state.update(
+                    {"state": "cancelled", "finished_at": _now_datetime()}
+                )
+            except Exception as exc:
+                Log.logger.warning(f"知识库健康检查失败: {exc}", exc_info=True)
+                self._health_state.update(
+                    {"state": "failed", "finished_at": _now_datetime(), "error": str(exc)}
+                )
+            else:
+                self._health_state.update(
+                    {"state": "done", "finished_at": _now_datetime(), "report": report}
+                )
+            finally:
+                self._health_cancel.clear()
+        finally:
+            self._rebuild_lock.release()
+
+    def start_health_check(self, auto_fix: bool = True, full: bool = False) -> dict[str, Any]:
+        """
+        请求后台健康检查，立即返回。已有检查在排队或运行时不会重复提交。
+        Parameters:
+            auto_fix (bool): 是否自动修复
+            full (bool): 是否全量检查
+        Returns:
+            dict[str, Any]: 当前健康检查状态
+        """
+        if self._health_state["state"] not in ("pending", "running"):
+            self._health_state.update(
+                {"state": "pending", "mode": "full" if full else "incremental", "error": None}
+            )
+            self._health_request = {"auto_fix": auto_fix, "full": full}
+            self._health_wakeup.set()
+        return self.get_health_check_state()
+
+    def cancel_health_check(self) -> dict[str, Any]:
+        """
+        取消排队或运行中的后台健康检查，检查在当前阶段结束后停止。
+        Returns:
+            dict[str, Any]: 当前健康检查状态
+        """
+        if self._health_state["state"] in ("pending", "running"):
+            self._health_cancel.set()
+        return self.get_health_check_state()
+
+    def get_health_check_state(self, include_report: bool = True) -> dict[str, Any]:
+        """
+        获取后台健康检查状态。
+        Parameters:
+            include_report (bool): 是否包含上次完成的检查报告
+        Returns:
+            dict[str, Any]: {state, mode, started_at, finished_at, error, report, pending_pages}
+        """
+        state = dict(self._health_state)
+        state["pending_pages"] = len(self._health_dirty_pages)
+        if not include_report:
+            state.pop("report", None)
+        return state
+
+    def _set_rebuild_progress(self, stage: str, done: int = 0, total: int = 0) -> None:
+        """
+        更新重建进度。
+        Parameters:
+            stage (str): 当前阶段（scan / ingest / index / health_check）
+            done (int): 当前阶段已完成数量
+            total (int): 当前阶段总数量
+        """
+        self._rebuild_state.update({"stage": stage, "done": done, "total": total})
+
+    def start_rebuild(self, startup: bool = False) -> dict[str, Any]:
+        """
+        在后台线程中执行重建，立即返回。已有重建在运行时不会重复启动。
+        Parameters:
+            startup (bool): 是否为启动触发
+        Returns:
+            dict[str, Any]: 当前重建状态
+        """
+        if self._closed.is_set() or (
+            self._rebuild_thread is not None and self._rebuild_thread.is_alive()
+        ):
+            return self.get_rebuild_state()
+
+        def runner() -> None:
+            try:
+                self.rebuild(startup=startup)
+            except Exception as exc:
+                Log.logger.error(f"知识库后台重建失败: {exc}", exc_info=True)
+
+        self._rebuild_state.update(
+            {"state": "pending", "stage": "", "done": 0, "total": 0, "error": None}
+        )
+        self._rebuild_thread = threading.Thread(
+            target=runner, name="knowledge-rebuild", daemon=True
+        )
+        self._rebuild_thread.start()
+        return self.get_rebuild_state()
+
+    def close(self) -> None:
+        """
+        停止后台健康检查线程和 raw 目录监听并关闭数据库连接，助手被重新加载或删除时调用。
+        正在运行的重建不会被中断，连接在其结束后关闭。
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._health_cancel.set()
+        self._health_wakeup.set()
+        self._release_raw_watcher()
+        if self._health_thread is not None:
+            self._health_thread.join()
+        # 重建锁可能被重建线程（或同目录的其他实例）长时间持有，在后台等待后再关闭连接
+        threading.Thread(
+            target=self._close_connections, name="knowledge-close", daemon=True
+        ).start()
+
+    def _close_connections(self) -> None:
+        """
+        等待进行中的重建/健康检查结束后关闭 SQLite 连接。
+        """
+        with self._rebuild_lock:
+            self._conn.close()
+            with self._read_lock:
+                self._read_conn.close()
+
+    def _start_raw_watcher(self) -> None:
+        """
+        启动 raw 目录监听，变化的文件由监听线程增量 ingest。
+        同一 raw 目录只保留一个监听：先前实例的监听会被停止，由本实例接管。
+        """
+        key = os.path.abspath(self.raw_dir)
+        with _raw_watch_guard:
+            instances = _raw_watch_instances.setdefault(key, [])
+            if instances:
+                instances[-1]._stop_raw_watcher()
+            instances.append(self)
+            self._create_raw_watcher()
+
+    def _create_raw_watcher(self) -> None:
+        """
+        创建并启动本实例的 raw 目录监听（调用方持有 _raw_watch_guard）。
+        """
+        self._raw_watcher = FileWatcher(
+            self.raw_dir,
+            RAW_SUFFIXES,
+            on_change=self.ingest_raw_changes,
+            poll_interval_sec=self.watch_poll_interval_sec,
+            debounce_sec=self.watch_debounce_sec,
+        )
+        self._raw_watcher.start()
+
+    def _stop_raw_watcher(self) -> None:
+        """
+        停止本实例的 raw 目录监听（调用方持有 _raw_watch_guard）。
+        """
+        if self._raw_watcher is not None:
+            self._raw_watcher.stop()
+            self._raw_watcher = None
+
+    def _release_raw_watcher(self) -> None:
+        """
+        注销本实例的 raw 目录监听；本实例正在监听时交给同目录上一个仍在使用的实例。
+        """
+        key = os.path.abspath(self.raw_dir)
+        with _raw_watch_guard:
+            instances = _raw_watch_instances.get(key, [])
+            if self not in instances:
+                return
+            was_watching = instances[-1] is self
+            instances.remove(self)
+            self._stop_raw_watcher()
+            if not instances:
+                del _raw_watch_instances[key]
+            elif was_watching:
+                instances[-1]._create_raw_watcher()
+
+    def ingest_raw_changes(self, rel_paths: set[str]) -> dict[str, Any]:
+        """
+        只处理指定的 raw 文件：删除已不存在的文件的关联数据，ingest 内容变化的文件，并增量同步索引。
+        Parameters:
+            rel_paths (set[str]): raw 相对路径
+        Returns:
+            dict[str, Any]: {"changed", "deleted", "ingest_details", "index_sync"}
+        """
+        with self._rebuild_lock:
+            if self._closed.is_set():
+                # 监听停止前已派发的变化：交给接管监听的实例或下次启动重建处理
+                return {"changed": 0, "deleted": 0, "ingest_details": [], "index_sync": None}
+            current_raw = self._scan_raw_files(rel_paths)
+            known_raw = self._get_known_raw_files()
+
+            deleted = [
+                raw for raw in sorted(rel_paths) if raw in known_raw and raw not in current_raw
+            ]
+            changed = [raw for raw, md5 in current_raw.items() if known_raw.get(raw) != md5]
+            if not deleted and not changed:
+                return {"changed": 0, "deleted": 0, "ingest_details": [], "index_sync": None}
+
+            Log.logger.info(
+                f"raw 文件变化: 新增/修改 {len(changed)} 个，删除 {len(deleted)} 个，开始增量 ingest"
+            )
+            for raw_rel_path in deleted:
+                self._delete_raw_related_data(raw_rel_path)
+            ingest_details = self._ingest_files(
+                [(raw_rel_path, current_raw[raw_rel_path]) for raw_rel_path in changed]
+            )
+            index_sync = self._sync_embeddings_index()
+            self._refresh_wiki_index_page()
+            return {
+                "changed": len(changed),
+                "deleted": len(deleted),
+                "ingest_details": ingest_details,
+                "index_sync": index_sync,
+            }
+
+    def get_rebuild_state(self) -> dict[str, Any]:
+        """
+        获取重建进度。
+        Returns:
+            dict[str, Any]: {state, stage, done, total, started_at, finished_at, error}
+        """
+        return dict(self._rebuild_state)
 
     def rebuild(self, startup: bool = False) -> dict[str, Any]:
         """
@@ -1424,6 +2554,42 @@ class DataBase:
         Returns:
             dict[str, Any]: 重建摘要
         """
+        with self._rebuild_lock:
+            if self._closed.is_set():
+                # close() 之前已排队的重建：连接即将关闭，不再执行
+                self._rebuild_state.update(
+                    {"state": "cancelled", "finished_at": _now_datetime()}
+                )
+                return {}
+            self._rebuild_state.update(
+                {
+                    "state": "running",
+                    "started_at": _now_datetime(),
+                    "finished_at": None,
+                    "error": None,
+                }
+            )
+            try:
+                summary = self._rebuild(startup)
+            except Exception as exc:
+                self._rebuild_state.update(
+                    {"state": "failed", "finished_at": _now_datetime(), "error": str(exc)}
+                )
+                raise
+            self._rebuild_state.update(
+                {"state": "done", "stage": "", "finished_at": _now_datetime()}
+            )
+            return summary
+
+    def _rebuild(self, startup: bool) -> dict[str, Any]:
+        """
+        重建实现（调用方持有 _rebuild_lock）。
+        Parameters:
+            startup (bool): 是否为启动触发
+        Returns:
+            dict[str, Any]: 重建摘要
+        """
+        self._set_rebuild_progress("scan")
         current_raw = self._scan_raw_files()
         known_raw = self._get_known_raw_files()
 
@@ -1439,16 +2605,18 @@ class DataBase:
             self._delete_raw_related_data(raw_rel_path)
             deleted_count += 1
 
-        ingest_details: list[dict[str, Any]] = []
-        for raw_rel_path in changed:
-            try:
-                detail = self._ingest_raw_file(raw_rel_path, current_raw[raw_rel_path])
-                ingest_details.append(detail)
-            except Exception as exc:
-                Log.logger.error(f"ingest 失败: {raw_rel_path}, {exc}")
+        self._prune_ingest_queue(set(changed))
+        self._set_rebuild_progress("ingest", 0, len(changed))
+        ingest_details = self._ingest_files(
+            [(raw_rel_path, current_raw[raw_rel_path]) for raw_rel_path in changed]
+        )
 
-        self._rebuild_embeddings_index()
-        health_report = self.run_health_check(auto_fix=True)
+        self._set_rebuild_progress("index")
+        index_sync = self._sync_embeddings_index()
+        self._set_rebuild_progress("health_check")
+        # 启动时全量检查一次，之后只检查本次及后续改动
+        health_report = self._run_health_check(auto_fix=True, full=startup)
+        index_sync["cache_gc"] = self._gc_embedding_cache()
 
         summary = {
             "startup": startup,
@@ -1458,19 +2626,22 @@ class DataBase:
             "ingest_details": ingest_details,
             "wiki_pages": self._count_wiki_pages(),
             "vector_chunks": self.data_count,
+            "index_sync": index_sync,
             "health": health_report,
             "updated_at": _now_datetime(),
         }
         self._last_rebuild_summary = summary
         return summary
 
-    def _count_wiki_pages(self) -> dict[str, int]:
+    def _count_wiki_pages(self, conn: sqlite3.Connection | None = None) -> dict[str, int]:
         """
         统计各类页面数量。
+        Parameters:
+            conn (sqlite3.Connection | None): 使用的连接，默认为写连接
         Returns:
             dict[str, int]: 统计结果
         """
-        cursor = self._conn.execute(
+        cursor = (conn or self._conn).execute(
             "SELECT page_type, COUNT(*) FROM wiki_pages GROUP BY page_type"
         )
         data = {"source": 0, "entity": 0, "concept": 0}
@@ -1485,13 +2656,17 @@ class DataBase:
         Returns:
             dict[str, Any]: 状态摘要
         """
-        cursor = self._conn.execute("SELECT COUNT(*) FROM raw_files")
-        raw_count = int(cursor.fetchone()[0])
+        with self._read_lock:
+            cursor = self._read_conn.execute("SELECT COUNT(*) FROM raw_files")
+            raw_count = int(cursor.fetchone()[0])
 
-        cursor = self._conn.execute("SELECT COUNT(*) FROM chunks")
-        chunk_count = int(cursor.fetchone()[0])
+            cursor = self._read_conn.execute("SELECT COUNT(*) FROM chunks")
+            chunk_count = int(cursor.fetchone()[0])
 
-        index_count = int(self.index.ntotal) if self.index is not None else 0
+            wiki_pages = self._count_wiki_pages(self._read_conn)
+
+        index = self.index
+        index_count = int(index.ntotal) if index is not None else 0
 
         return {
             "base_dir": str(self.base_dir),
@@ -1499,41 +2674,17 @@ class DataBase:
             "wiki_dir": str(self.wiki_dir),
             "embeddings_dir": str(self.embeddings_dir),
             "raw_count": raw_count,
-            "wiki_pages": self._count_wiki_pages(),
+            "wiki_pages": wiki_pages,
             "chunk_count": chunk_count,
             "index_count": index_count,
             "threshold": self.thresholds,
             "top_k": self.top_k,
             "last_rebuild": self._last_rebuild_summary,
             "last_health_check_ts": self._last_health_check_ts,
-        }
-
-    def _fetch_chunk_payload(self, chunk_id: int) -> dict[str, str] | None:
-        """
-        根据 chunk_id 获取文本和页面信息。
-        Parameters:
-            chunk_id (int): chunk 主键
-        Returns:
-            dict[str, str] | None: 查询结果
-        """
-        cursor = self._conn.execute(
-            """
-            SELECT c.chunk_text, p.title, p.page_type, p.file_path
-            FROM chunks c
-            JOIN wiki_pages p ON c.page_id = p.page_id
-            WHERE c.chunk_id = ?
-            LIMIT 1
-            """,
-            (chunk_id,),
-        )
-        row = cursor.fetchone()
-        if not row:
-            return None
-        return {
-            "chunk_text": row[0],
-            "title": row[1],
-            "page_type": row[2],
-            "file_path": row[3],
+            "health_check": self.get_health_check_state(include_report=False),
+            "raw_watcher": self._raw_watcher.mode if self._raw_watcher else None,
+            "search_cache": self._search_cache.stats(),
+            "rebuild": self.get_rebuild_state(),
         }
 
     def search(self, text: list[str]) -> str:
@@ -1544,23 +2695,30 @@ class DataBase:
         Returns:
             str: 可注入 Prompt 的检索结果
         """
-        self._maybe_periodic_health_check()
-
-        if self.index is None or self.data_count == 0:
+        generation = self._generation
+        # 取当前检索快照的引用，后台重建替换索引不会影响本次检索
+        snapshot = self._search_snapshot
+        if snapshot is None or snapshot[0].ntotal == 0:
             return ""
+        index, chunk_store = snapshot
 
         queries = [item.strip() for item in text if item and item.strip()]
         if not queries:
             return ""
 
-        query_vectors = _normalize_vectors(embedding.t2vect(queries))
+        cache_key = tuple(embedding_service.normalize_text(query) for query in queries)
+        cached = self._search_cache.get(cache_key, generation)
+        if cached is not None:
+            return cached
+
+        query_vectors = embedding_service.encode(queries)
         query_count = int(query_vectors.shape[0])
         try:
-            distances, ids = self.index.search(query_vectors, self.top_k)  # type: ignore[call-arg]
+            distances, ids = index.search(query_vectors, self.top_k)  # type: ignore[call-arg]
         except TypeError:
             distances = np.empty((query_count, self.top_k), dtype=np.float32)
             ids = np.empty((query_count, self.top_k), dtype=np.int64)
-            self.index.search(
+            index.search(
                 query_count,
                 faiss.swig_ptr(query_vectors),
                 self.top_k,
@@ -1568,29 +2726,31 @@ class DataBase:
                 faiss.swig_ptr(ids),
             )
 
-        seen_chunk_ids: set[int] = set()
-        output_blocks: list[str] = []
-
-        for row_index in range(query_count):
-            for col_index in range(self.top_k):
-                score = float(distances[row_index][col_index])
-                chunk_id = int(ids[row_index][col_index])
-                if chunk_id < 0:
-                    continue
-                if score < self.thresholds:
-                    continue
-                if chunk_id in seen_chunk_ids:
-                    continue
-
-                payload = self._fetch_chunk_payload(chunk_id)
-                if not payload:
-                    continue
-
-                seen_chunk_ids.add(chunk_id)
-                block = (
-                    f"[{payload['page_type']}] {payload['title']} (score={score:.3f})\n"
-                    f"{payload['chunk_text']}"
-                )
-                output_blocks.append(block)
+        # 过滤无效 id 与低分命中；布尔索引按行优先展开，保持“先查询、后名次”的顺序
+        mask = (ids >= 0) & (distances >= self.thresholds)
+        hit_ids = ids[mask]
+        hit_scores = distances[mask]
+        # 同一 chunk 只保留首次出现
+        _, first = np.unique(hit_ids, return_index=True)
+        first.sort()
+        hit_ids = hit_ids[first]
+        hit_scores = hit_scores[first]
+
+        rows = chunk_store.lookup(hit_ids)
+        found = rows >= 0
+        rows = rows[found]
+        hit_scores = hit_scores[found]
+
+        output_blocks = [
+            f"[{page_type}] {title} (score={score:.3f})\n{chunk_text}"
+            for page_type, title, chunk_text, score in zip(
+                chunk_store.page_types[rows],
+                chunk_store.titles[rows],
+                chunk_store.texts[rows],
+                hit_scores.tolist(),
+            )
+        ]
 
-        return "\n\n".join(output_blocks) + ("\n\n" if output_blocks else "")
+        result = "\n\n".join(output_blocks) + ("\n\n" if output_blocks else "")
+        self._search_cache.put(cache_key, generation, result)
+        return result
@@ -17,7 +17,7 @@ import jionlp as jio
 import numpy as np
 
 from models.types.assistant_info import AssistantInfo
-from my_utils import embedding
+from my_utils import embedding, sqlite_access
 from my_utils import log as Log
 from core.llm.llm_client import LLMClient
 from my_utils.token_counter import estimate_tokens
@@ -55,20 +55,18 @@ class Memory:
         self.data_dir = f"./data/agents/{self.agent_id}/memory"
         self.db_path = os.path.join(self.data_dir, "memory.db")
         os.makedirs(self.data_dir, exist_ok=True)
+        # 共享的 SQLite 访问对象：写入由专用写线程合批提交，读取走 WAL 只读连接池
+        self._db = sqlite_access.get_database(self.db_path)
         self._init_db()
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """创建数据库连接。每次操作使用独立连接，减少并发线程共享问题。"""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        return conn
-
     def _init_db(self):
         """
         初始化表结构：聊天历史表 + 日记表。
         """
-        conn = self._get_connection()
+        self._db.write(self._create_tables)
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        """建表（在写线程的事务中执行）。"""
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -98,9 +96,6 @@ class Memory:
             "CREATE INDEX IF NOT EXISTS idx_diary_days_day ON diary_days(day)"
         )
 
-        conn.commit()
-        conn.close()
-
     def _day_str(self, ts: int) -> str:
         """将时间戳转换为日期字符串，格式为 YYYY-MM-DD。"""
         return time.strftime("%Y-%m-%d", time.localtime(ts))
@@ -146,17 +141,13 @@ class Memory:
         vectors = embedding.t2vect(text_list)
         vec_blobs = [self._vector_to_blob(v) for v in vectors]
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.executemany(
+        self._db.executemany(
             "INSERT INTO chat_turns (timestamp_sec, role, content, vec_blob) VALUES (?, ?, ?, ?)",
             [
                 (ts, role, content, vec_blob)
                 for (ts, role, content), vec_blob in zip(rows, vec_blobs)
             ],
         )
-        conn.commit()
-        conn.close()
 
     def get_recent_chat_turns(
         self, limit: int, only_assistant: bool = False
@@ -170,11 +161,8 @@ class Memory:
         if limit <= 0:
             return []
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         if only_assistant:
-            cursor.execute(
+            rows = self._db.query(
                 """
                 SELECT role, content
                 FROM chat_turns
@@ -185,7 +173,7 @@ class Memory:
                 (limit,),
             )
         else:
-            cursor.execute(
+            rows = self._db.query(
                 """
                 SELECT role, content
                 FROM chat_turns
@@ -195,18 +183,12 @@ class Memory:
                 (limit,),
             )
 
-        rows = cursor.fetchall()
-        conn.close()
         # 查询使用倒序取最近 N 条，这里反转回正常时间顺序。
         rows.reverse()
         return [{"role": r[0], "content": r[1]} for r in rows]
 
     def _get_last_diary_ts(self) -> int:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT MAX(day_last_timestamp_sec) FROM diary_days")
-        row = cursor.fetchone()
-        conn.close()
+        row = self._db.query_one("SELECT MAX(day_last_timestamp_sec) FROM diary_days")
         return int(row[0]) if row and row[0] is not None else 0
 
     async def finalize_previous_days(self, now_ts: int):
@@ -228,9 +210,7 @@ class Memory:
         )
         last_diary_ts = self._get_last_diary_ts()
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = self._db.query(
             """
             SELECT timestamp_sec, role, content
             FROM chat_turns
@@ -239,8 +219,6 @@ class Memory:
             """,
             (last_diary_ts, today_start),
         )
-        rows = cursor.fetchall()
-        conn.close()
 
         if not rows:
             return
@@ -269,17 +247,13 @@ class Memory:
             vec_blob = self._vector_to_blob(vector)
             day_last_ts = day_rows[-1][0]
 
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
+            self._db.execute(
                 """
                 INSERT OR REPLACE INTO diary_days (day, summary, facts, vec_blob, day_last_timestamp_sec)
                 VALUES (?, ?, ?, ?, ?)
                 """,
                 (day, summary, facts, vec_blob, day_last_ts),
             )
-            conn.commit()
-            conn.close()
 
             Log.logger.info(f"[长期记忆] 已归档日记: {day}")
 
@@ -482,13 +456,10 @@ class Memory:
         - 时间未命中时：对全部日记做向量评分。
         - 若关闭语义增强，则按照日期倒序返回。
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         if time_range:
             low_day = self._day_str(time_range[0])
             high_day = self._day_str(time_range[1])
-            cursor.execute(
+            rows = self._db.query(
                 """
                 SELECT day, summary, facts, vec_blob
                 FROM diary_days
@@ -498,15 +469,12 @@ class Memory:
                 (low_day, high_day),
             )
         else:
-            cursor.execute("""
+            rows = self._db.query("""
                 SELECT day, summary, facts, vec_blob
                 FROM diary_days
                 ORDER BY day DESC
                 """)
 
-        rows = cursor.fetchall()
-        conn.close()
-
         if not rows:
             return []
         # 如果没有语义增强，直接返回最近的 top_k 条日记，相关度分数默认为 1.0。
@@ -545,12 +513,10 @@ class Memory:
         """
         last_diary_ts = self._get_last_diary_ts()
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
         if time_range:
             low, high = time_range
             low = max(low, last_diary_ts + 1)
-            cursor.execute(
+            rows = self._db.query(
                 """
                 SELECT timestamp_sec, role, content, vec_blob
                 FROM chat_turns
@@ -560,7 +526,7 @@ class Memory:
                 (low, high),
             )
         else:
-            cursor.execute(
+            rows = self._db.query(
                 """
                 SELECT timestamp_sec, role, content, vec_blob
                 FROM chat_turns
@@ -570,9 +536,6 @@ class Memory:
                 (last_diary_ts,),
             )
 
-        rows = cursor.fetchall()
-        conn.close()
-
         if not rows:
             return []
 
@@ -638,26 +601,23 @@ class Memory:
         if where_clauses:
             where_sql = "WHERE " + " AND ".join(where_clauses)
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(f"SELECT COUNT(*) FROM diary_days {where_sql}", tuple(params))
-        count_row = cursor.fetchone()
-        total = int(count_row[0]) if count_row and count_row[0] is not None else 0
+        with self._db.reader() as conn:
+            count_row = conn.execute(
+                f"SELECT COUNT(*) FROM diary_days {where_sql}", tuple(params)
+            ).fetchone()
+            total = int(count_row[0]) if count_row and count_row[0] is not None else 0
 
-        query_params = params + [limit, offset]
-        cursor.execute(
-            f"""
-            SELECT day, summary, facts, day_last_timestamp_sec
-            FROM diary_days
-            {where_sql}
-            ORDER BY day DESC
-            LIMIT ? OFFSET ?
-            """,
-            tuple(query_params),
-        )
-        rows = cursor.fetchall()
-        conn.close()
+            query_params = params + [limit, offset]
+            rows = conn.execute(
+                f"""
+                SELECT day, summary, facts, day_last_timestamp_sec
+                FROM diary_days
+                {where_sql}
+                ORDER BY day DESC
+                LIMIT ? OFFSET ?
+                """,
+                tuple(query_params),
+            ).fetchall()
 
         records = []
         for day, summary, facts, last_ts in rows:
@@ -0,0 +1,219 @@
+"""
+MemoryV2 的列式内存表
+
+替代原先九个并行 Python 列表：
+- 数值列（id / importance / decay_rate / access_count / archived）使用按需扩容的 NumPy 数组
+- created_at 在载入和追加时解析为 float64 时间戳列，检索打分无需逐条解析 ISO 字符串
+- 文本列（content / category / memory_type / created_at）仍为 Python 列表
+- id → 行号字典，按 id 定位为 O(1)
+- 删除只打墓碑标记（alive=False），墓碑占比过高时由调用方执行 compact
+
+FAISS 索引以记忆 ID 为向量 ID，检索结果经 rows_of 映射回行号，行号可随 compact 变化。
+所有方法都不是线程安全的，由 MemoryV2._lock 保护。
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+
+def parse_timestamp(created_at: str | None) -> float:
+    """将 ISO 时间字符串解析为 Unix 时间戳，无法解析时返回 NaN"""
+    try:
+        return datetime.fromisoformat(created_at).timestamp()  # type: ignore[arg-type]
+    except Exception:
+        return float("nan")
+
+
+class MemoryStore:
+    """
+    记忆列式内存表
+
+    Attributes:
+        size: 已使用的行数（含墓碑行）
+        ids: 记忆 ID 列
+        importances: 重要度列
+        decay_rates: 衰减速率列
+        access_counts: 访问次数列
+        archived: 归档标记列
+        alive: 存活标记列（False 为已删除的墓碑行）
+        created_ts: 创建时间戳列（created_at 无法解析时为 NaN）
+        contents / categories / memory_types / created_times: 文本列
+    """
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        self.size = 0
+        self._row_of: dict[int, int] = {}
+        self._allocate(self.INITIAL_CAPACITY)
+        self.contents: list[str] = []
+        self.categories: list[str] = []
+        self.memory_types: list[str] = []
+        self.created_times: list[str] = []
+
+    def _allocate(self, capacity: int) -> None:
+        """分配指定容量的空数值列"""
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.importances = np.zeros(capacity, dtype=np.float64)
+        self.decay_rates = np.zeros(capacity, dtype=np.float64)
+        self.access_counts = np.zeros(capacity, dtype=np.int64)
+        self.archived = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.created_ts = np.zeros(capacity, dtype=np.float64)
+
+    def _numeric_columns(self) -> tuple[str, ...]:
+        return (
+            "ids",
+            "importances",
+            "decay_rates",
+            "access_counts",
+            "archived",
+            "alive",
+            "created_ts",
+        )
+
+    def _ensure_capacity(self, capacity: int) -> None:
+        """容量不足时按 1.5 倍扩容，已有数据拷贝到新数组"""
+        current = self.ids.shape[0]
+        if capacity <= current:
+            return
+        new_capacity = max(capacity, int(current * 1.5) + 1)
+        for name in self._numeric_columns():
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def __len__(self) -> int:
+        """存活记忆数"""
+        return len(self._row_of)
+
+    @property
+    def tombstones(self) -> int:
+        """墓碑行数"""
+        return self.size - len(self._row_of)
+
+    def clear(self) -> None:
+        """清空全部数据"""
+        self.size = 0
+        self._row_of.clear()
+        self._allocate(self.INITIAL_CAPACITY)
+        self.contents.clear()
+        self.categories.clear()
+        self.memory_types.clear()
+        self.created_times.clear()
+
+    def load(self, rows: list[tuple]) -> None:
+        """
+        以数据库行整体替换内存表
+
+        Args:
+            rows: (id, category, content, importance, memory_type,
+                   created_at, decay_rate, archived, access_count) 列表
+        """
+        self.clear()
+        count = len(rows)
+        self._allocate(max(count, self.INITIAL_CAPACITY))
+        if count:
+            columns = list(zip(*rows))
+            self.ids[:count] = columns[0]
+            self.categories = list(columns[1])
+            self.contents = list(columns[2])
+            self.importances[:count] = columns[3]
+            self.memory_types = list(columns[4])
+            self.created_times = list(columns[5])
+            self.created_ts[:count] = [parse_timestamp(t) for t in columns[5]]
+            self.decay_rates[:count] = [rate or 0.0 for rate in columns[6]]
+            self.archived[:count] = [bool(flag) for flag in columns[7]]
+            self.access_counts[:count] = [ac or 0 for ac in columns[8]]
+            self.alive[:count] = True
+        self.size = count
+        self._row_of = {int(mem_id): row for row, mem_id in enumerate(self.ids[:count])}
+
+    def append(
+        self,
+        mem_id: int,
+        category: str,
+        content: str,
+        importance: float,
+        memory_type: str,
+        created_at: str,
+        decay_rate: float,
+        archived: bool = False,
+        access_count: int = 0,
+    ) -> int:
+        """
+        追加一条记忆
+
+        Returns:
+            新行的行号
+        """
+        row = self.size
+        self._ensure_capacity(row + 1)
+        self.ids[row] = mem_id
+        self.importances[row] = importance
+        self.decay_rates[row] = decay_rate
+        self.access_counts[row] = access_count
+        self.archived[row] = archived
+        self.alive[row] = True
+        self.created_ts[row] = parse_timestamp(created_at)
+        self.contents.append(content)
+        self.categories.append(category)
+        self.memory_types.append(memory_type)
+        self.created_times.append(created_at)
+        self.size = row + 1
+        self._row_of[int(mem_id)] = row
+        return row
+
+    def row_of(self, mem_id: int) -> int | None:
+        """按记忆 ID 查找行号，不存在或已删除时返回 None"""
+        return self._row_of.get(int(mem_id))
+
+    def rows_of(self, mem_ids: np.ndarray) -> np.ndarray:
+        """批量按记忆 ID 查找行号，不存在、已删除或为 -1（FAISS 空位）的 ID 对应 -1"""
+        row_of = self._row_of
+        return np.fromiter(
+            (row_of.get(int(mem_id), -1) for mem_id in mem_ids),
+            dtype=np.int64,
+            count=len(mem_ids),
+        )
+
+    def delete(self, mem_id: int) -> bool:
+        """
+        删除记忆（打墓碑标记，直到 compact 前行号保持不变）
+
+        Returns:
+            是否删除成功
+        """
+        row = self._row_of.pop(int(mem_id), None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        self.contents[row] = ""
+        return True
+
+    def live_rows(self) -> np.ndarray:
+        """存活行的行号"""
+        return np.flatnonzero(self.alive[: self.size])
+
+    def compact(self) -> np.ndarray:
+        """
+        移除墓碑行，存活行按原顺序前移
+
+        Returns:
+            压缩后每一行对应的原行号
+        """
+        keep = self.live_rows()
+        count = int(keep.size)
+        for name in self._numeric_columns():
+            column = getattr(self, name)
+            column[:count] = column[keep]
+            column[count : self.size] = 0
+        self.contents = [self.contents[row] for row in keep]
+        self.categories = [self.categories[row] for row in keep]
+        self.memory_types = [self.memory_types[row] for row in keep]
+        self.created_times = [self.created_times[row] for row in keep]
+        self.size = count
+        self._row_of = {int(mem_id): row for row, mem_id in enumerate(self.ids[:count])}
+        return keep
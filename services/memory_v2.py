@@ -17,17 +17,19 @@
 
 增强特性：
 1. 并发安全：threading.RLock 保护所有共享内存 + FAISS 索引
-2. 访问计数缓存：避免 search() 中每条记忆都查一次 DB
+2. 访问计数缓存：避免 search() 中每条记忆都查一次 DB，访问统计由后台线程定期批量写回
 3. 日记语义检索：日记内容独立 FAISS 索引，替代硬编码最近 N 天
 4. 记忆关联网络：memory_links 表 + 语义关联自动发现 + 检索提升
 5. recall 工具支持：供助手主动查询自身记忆（增强人格化）
 6. 更新记忆工具：update_memory 工具，支持覆盖/修正已有信息
+7. 增量索引：FAISS 索引以记忆 ID 为键、向量存于 SQLite，编辑/删除/归档只更新单条，不整库重新编码
 
 架构替代关系：
 - core_mem.py -> 合并入此模块
 - long_mem.py -> 合并入此模块
 """
 
+import atexit
 import sqlite3
 import faiss
 import os
@@ -39,7 +41,9 @@ import numpy as np
 from datetime import datetime
 from typing import Any
 from models.types.assistant_info import AssistantInfo
-from my_utils import embedding
+from my_utils import embedding, embedding_service, sqlite_access, vector_index
+from my_utils.query_cache import create_query_cache
+from services.memory_store import MemoryStore
 from my_utils import log as Log
 from core.llm.llm_client import LLMClient
 
@@ -139,6 +143,10 @@ class MemoryV2:
     # 日记检索时的时间衰减因子（天），30 天前的日记语义分打 5 折
     DIARY_TIME_DECAY_DAYS = 30.0
 
+    # 访问统计写回间隔（秒）：检索只在内存中累计，由后台线程按此间隔批量写库，
+    # 进程崩溃时最多丢失这段时间内的访问统计
+    ACCESS_FLUSH_INTERVAL_SEC = 5.0
+
     def __init__(self, agent_config: AssistantInfo, firstMeetTime: int = 0):
         self.agent_config = agent_config
         self.agent_id = agent_config.name
@@ -154,19 +162,16 @@ class MemoryV2:
         # 并发安全锁（保护所有共享内存 + FAISS 索引）
         self._lock = threading.RLock()
 
-        # 内存缓存（与 FAISS 索引顺序保持严格一致）
-        self.ids: list[int] = []
-        self.contents: list[str] = []
-        self.categories: list[str] = []
-        self.importances: list[float] = []
-        self.memory_types: list[str] = []
-        self.archived: list[bool] = []
-        self.created_times: list[str] = []
-        self.decay_rates: list[float] = []
-        self.access_counts: list[int] = []
+        # 列式内存表
+        self._store = MemoryStore()
 
+        # 记忆 FAISS 索引（IndexIDMap2，向量 ID 即记忆 ID，按 ID 增删）
         self.index: Any = None
 
+        # 数据代数：记忆、日记、关联发生变化时递增，get_context 结果缓存以此判断是否过期
+        self._generation = 0
+        self._context_cache = create_query_cache()
+
         # 日记 FAISS 索引（独立于 memories，支持语义检索）
         self.diary_index: Any = None
         self.diary_day_list: list[str] = []
@@ -180,10 +185,14 @@ class MemoryV2:
         # 多次对话触发多个并发生成任务重复处理相同的时间范围
         self._diary_task: asyncio.Task | None = None
 
-        # 日记系统专用数据库连接（lazy 初始化 + WAL 模式）
-        # 与 memory_v2.py 其他方法的临时连接策略不同，日记系统在异步任务中
-        # 频繁调用，使用单例连接避免反复创建/销毁的开销
-        self._conn: sqlite3.Connection | None = None
+        # SQLite 共享访问（写线程合批提交 + WAL 只读连接池），同一数据库文件在进程内共享
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._db = sqlite_access.get_database(self.db_path)
+
+        # 待写回的访问统计 {mem_id: (新增访问次数, 最后访问时间)}
+        self._pending_access: dict[int, tuple[int, str]] = {}
+        self._access_lock = threading.Lock()
+        self._access_flush_stop = threading.Event()
 
         # 角色画像直接从 agent_config 读取
 
@@ -192,16 +201,26 @@ class MemoryV2:
         self._init_index()
         self._init_diary_index()
 
+        self._access_flush_thread = threading.Thread(
+            target=self._access_flush_loop,
+            name=f"memory-access-flush-{self.agent_id}",
+            daemon=True,
+        )
+        self._access_flush_thread.start()
+        atexit.register(self.close)
+
     # ============================================================
     # 向量编码
     # ============================================================
 
-    def _encode_texts(self, texts: list[str]) -> np.ndarray:
-        """文本编码并做 L2 归一化，配合 IndexFlatIP 实现余弦相似度检索"""
-        vectors = embedding.t2vect(texts)
-        vectors = np.ascontiguousarray(vectors.astype("float32"))
-        faiss.normalize_L2(vectors)
-        return vectors
+    def _encode_texts(self, texts: list[str], use_cache: bool = True) -> np.ndarray:
+        """
+        文本编码并做 L2 归一化，配合 IndexFlatIP 实现余弦相似度检索
+
+        经由 embedding_service 的进程级缓存，同一轮中记忆检索、日记检索、
+        去重与关联发现对同一文本只编码一次；整库重建时传 use_cache=False。
+        """
+        return embedding_service.encode(texts, use_cache=use_cache)
 
     # ============================================================
     # 数据库初始化与加载
@@ -209,9 +228,10 @@ class MemoryV2:
 
     def _init_db(self):
         """初始化 SQLite 数据库"""
-        os.makedirs(self.data_dir, exist_ok=True)
+        self._db.write(self._create_tables)
 
-        conn = sqlite3.connect(self.db_path)
+    def _create_tables(self, conn: sqlite3.Connection):
+        """建表与旧库迁移（在写线程的事务中执行）"""
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -225,10 +245,20 @@ class MemoryV2:
                 last_accessed TEXT,
                 access_count INTEGER DEFAULT 0,
                 decay_rate REAL NOT NULL DEFAULT 0.001,
-                archived INTEGER DEFAULT 0
+                archived INTEGER DEFAULT 0,
+                embedding BLOB,
+                embedding_model TEXT
             )
         """)
 
+        # 旧库补充 embedding 列（归一化后的 float32 向量）及产生该向量的模型标识，
+        # 启动与重建索引时只重新编码缺失或由其他模型产生的向量
+        memory_columns = {row[1] for row in cursor.execute("PRAGMA table_info(memories)")}
+        if "embedding" not in memory_columns:
+            cursor.execute("ALTER TABLE memories ADD COLUMN embedding BLOB")
+        if "embedding_model" not in memory_columns:
+            cursor.execute("ALTER TABLE memories ADD COLUMN embedding_model TEXT")
+
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_memories_archived
             ON memories(archived)
@@ -288,50 +318,19 @@ class MemoryV2:
             ON memory_links(memory_id_b)
         """)
 
-        conn.commit()
-        conn.close()
-
     def _load_data(self):
         """从 SQLite 加载所有记忆到内存缓存（线程安全）"""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
+            rows = self._db.query(
                 "SELECT id, category, content, importance, memory_type, "
                 "created_at, decay_rate, archived, access_count "
                 "FROM memories ORDER BY id"
             )
-            rows = cursor.fetchall()
-            conn.close()
-
-            self.ids.clear()
-            self.categories.clear()
-            self.contents.clear()
-            self.importances.clear()
-            self.memory_types.clear()
-            self.created_times.clear()
-            self.decay_rates.clear()
-            self.archived.clear()
-            self.access_counts.clear()
-
-            for row in rows:
-                self.ids.append(row[0])
-                self.categories.append(row[1])
-                self.contents.append(row[2])
-                self.importances.append(row[3])
-                self.memory_types.append(row[4])
-                self.created_times.append(row[5])
-                self.decay_rates.append(row[6])
-                self.archived.append(bool(row[7]))
-                self.access_counts.append(row[8] if row[8] is not None else 0)
+            self._store.load(rows)
 
     def _load_diary_index_data(self):
         """从 SQLite 加载日记数据到内存缓存（线程安全，_lock 由调用者持有）"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT day, content FROM diary_days ORDER BY day")
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._db.query("SELECT day, content FROM diary_days ORDER BY day")
 
         self.diary_day_list.clear()
         self.diary_content_list.clear()
@@ -346,53 +345,105 @@ class MemoryV2:
     def _init_index(self):
         """初始化或加载 FAISS 索引"""
         with self._lock:
-            if not self.contents:
-                vect = self._encode_texts(["占位"])
-                self.index = faiss.IndexFlatIP(vect.shape[1])
-                return
-
-            if os.path.exists(self.index_path):
+            if os.path.exists(self.index_path) and vector_index.index_model_matches(
+                self.index_path, embedding.get_model_id()
+            ):
                 try:
-                    with open(self.index_path, "rb") as f:
-                        index_bytes = f.read()
-                    self.index = faiss.deserialize_index(
-                        np.frombuffer(index_bytes, dtype="uint8")
-                    )
+                    index = vector_index.read_index(self.index_path)
+                    # 旧版位置索引，或写库后未保存索引就退出导致的不一致，均从已存储向量重建
+                    if isinstance(index, faiss.IndexIDMap2) and np.array_equal(
+                        np.sort(faiss.vector_to_array(index.id_map)),
+                        np.sort(self._store.ids[self._store.live_rows()]),
+                    ):
+                        self.index = index
+                        return
+                    Log.logger.warning("[记忆 v2] 索引与记忆表不一致，将重建")
                 except Exception as e:
                     Log.logger.warning(f"加载 FAISS 索引失败: {e}，将重建")
-                    self._rebuild_index()
+            self._build_index()
+
+    def _load_vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        读取全部记忆的已存储向量
+
+        缺少向量（旧库）、由其他嵌入模型产生或维度不符的记忆会重新编码并回写。
+
+        Returns:
+            (ids, vectors)：int64 记忆 ID 数组与对应的 float32 向量矩阵
+        """
+        dim = self._encode_texts(["占位"]).shape[1]
+        model_id = embedding.get_model_id()
+        rows = self._db.query(
+            "SELECT id, content, embedding, embedding_model FROM memories ORDER BY id"
+        )
+
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        vectors = np.zeros((len(rows), dim), dtype=np.float32)
+        missing: list[int] = []
+        for i, (_, _, blob, blob_model) in enumerate(rows):
+            if blob is not None and blob_model == model_id and len(blob) == dim * 4:
+                vectors[i] = np.frombuffer(blob, dtype=np.float32)
             else:
-                self._build_index()
+                missing.append(i)
+
+        if missing:
+            Log.logger.info(f"[记忆 v2] 为 {len(missing)} 条记忆编码并保存向量")
+            encoded = self._encode_texts([rows[i][1] for i in missing], use_cache=False)
+            vectors[missing] = encoded
+            self._db.executemany(
+                "UPDATE memories SET embedding = ?, embedding_model = ? WHERE id = ?",
+                [
+                    (encoded[j].tobytes(), model_id, rows[i][0])
+                    for j, i in enumerate(missing)
+                ],
+            )
+        return ids, vectors
 
     def _build_index(self):
-        """根据当前内存缓存构建 FAISS 索引（调用者持有 _lock）"""
-        if not self.contents:
-            return
+        """根据 SQLite 中存储的向量构建 FAISS 索引，不重新编码（调用者持有 _lock）"""
         try:
-            vectors = self._encode_texts(self.contents)
-            dim = vectors.shape[1]
-            self.index = faiss.IndexFlatIP(dim)
-            self.index.add(vectors)
+            ids, vectors = self._load_vectors()
+            if ids.size:
+                self.index = vector_index.build_index(vectors, ids=ids, removable=True)
+            else:
+                self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(vectors.shape[1]))
             self._save_index()
         except Exception as e:
             Log.logger.warning(f"构建 FAISS 索引失败: {e}")
 
-    def _rebuild_index(self):
-        """重建 FAISS 索引（调用者持有 _lock）"""
-        if not self.contents:
+    def _index_put(self, mem_id: int, vector: np.ndarray, replace: bool = False):
+        """
+        按记忆 ID 写入单条向量并持久化索引（调用者持有 _lock）
+
+        数据量变化使索引类型或 IVF 桶数不再合适时，改为从已存储向量整体重建。
+
+        Args:
+            mem_id: 记忆 ID
+            vector: (1, D) 归一化向量，须已写入 SQLite
+            replace: 是否先移除该 ID 的旧向量
+        """
+        ids = np.array([mem_id], dtype=np.int64)
+        if replace:
+            self.index.remove_ids(ids)
+        if vector_index.needs_rebuild(self.index, self.index.ntotal + 1, removable=True):
+            self._build_index()
             return
-        vectors = self._encode_texts(self.contents)
-        dim = vectors.shape[1]
-        self.index = faiss.IndexFlatIP(dim)
-        self.index.add(vectors)
+        vector_index.add_vectors(
+            self.index, np.ascontiguousarray(vector, dtype=np.float32), ids
+        )
+        self._save_index()
+
+    def _index_remove(self, mem_id: int):
+        """按记忆 ID 从索引移除向量并持久化（调用者持有 _lock）"""
+        self.index.remove_ids(np.array([mem_id], dtype=np.int64))
         self._save_index()
 
     def _save_index(self):
         """持久化 FAISS 索引到磁盘（调用者持有 _lock）"""
         try:
-            index_data = faiss.serialize_index(self.index)
-            with open(self.index_path, "wb") as f:
-                f.write(index_data.tobytes())
+            vector_index.write_index_atomic(
+                self.index, self.index_path, model_id=embedding.get_model_id()
+            )
         except Exception as e:
             Log.logger.warning(f"保存 FAISS 索引失败: {e}")
 
@@ -409,13 +460,11 @@ class MemoryV2:
                 self.diary_index = faiss.IndexFlatIP(dim)
                 return
 
-            if os.path.exists(self.diary_index_path):
+            if os.path.exists(self.diary_index_path) and vector_index.index_model_matches(
+                self.diary_index_path, embedding.get_model_id()
+            ):
                 try:
-                    with open(self.diary_index_path, "rb") as f:
-                        index_bytes = f.read()
-                    self.diary_index = faiss.deserialize_index(
-                        np.frombuffer(index_bytes, dtype="uint8")
-                    )
+                    self.diary_index = vector_index.read_index(self.diary_index_path)
                     # 验证索引与缓存一致
                     if self.diary_index.ntotal != len(self.diary_content_list):
                         Log.logger.warning("[日记] 索引大小不匹配，将重建")
@@ -433,10 +482,8 @@ class MemoryV2:
             self.diary_index = faiss.IndexFlatIP(dim)
             return
         try:
-            vectors = self._encode_texts(self.diary_content_list)
-            dim = vectors.shape[1]
-            self.diary_index = faiss.IndexFlatIP(dim)
-            self.diary_index.add(vectors)
+            vectors = self._encode_texts(self.diary_content_list, use_cache=False)
+            self.diary_index = vector_index.build_index(vectors)
             self._save_diary_index()
         except Exception as e:
             Log.logger.warning(f"构建日记 FAISS 索引失败: {e}")
@@ -449,14 +496,20 @@ class MemoryV2:
     def _save_diary_index(self):
         """持久化日记 FAISS 索引到磁盘（调用者持有 _lock）"""
         try:
-            index_data = faiss.serialize_index(self.diary_index)
-            with open(self.diary_index_path, "wb") as f:
-                f.write(index_data.tobytes())
+            vector_index.write_index_atomic(
+                self.diary_index, self.diary_index_path, model_id=embedding.get_model_id()
+            )
         except Exception as e:
             Log.logger.warning(f"保存日记 FAISS 索引失败: {e}")
 
+    def _bump_generation(self):
+        """记忆 / 日记 / 关联变化后递增数据代数，使已缓存的检索结果失效"""
+        with self._lock:
+            self._generation += 1
+
     def _add_to_diary_index(self, day: str, content: str):
         """向日记索引添加一条条目（调用者持有 _lock）"""
+        self._bump_generation()
         self.diary_day_list.append(day)
         self.diary_content_list.append(content)
         try:
@@ -471,6 +524,7 @@ class MemoryV2:
 
     def _remove_from_diary_index(self, day: str):
         """从日记索引移除指定日期的条目（重建方式，调用者持有 _lock）"""
+        self._bump_generation()
         self._rebuild_diary_index()
 
     # ============================================================
@@ -485,12 +539,12 @@ class MemoryV2:
             True 表示已存在相似记忆（去重阈值为 0.75）
         """
         with self._lock:
-            if not self.contents:
+            if not len(self._store):
                 return False
             try:
                 vect = self._encode_texts([content])
-                D, _ = self.index.search(vect, 1)
-                return float(D[0][0]) >= 0.75
+                D, I = self.index.search(vect, 1)
+                return int(I[0][0]) >= 0 and float(D[0][0]) >= 0.75
             except Exception:
                 return False
 
@@ -529,40 +583,37 @@ class MemoryV2:
 
         decay_rate = self.DEFAULT_DECAY_RATE if memory_type == "normal" else 0.0
         now_str = datetime.now().isoformat()
+        vector = self._encode_texts([content])
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        result = self._db.execute(
             "INSERT INTO memories (category, content, importance, memory_type, "
-            "created_at, decay_rate) VALUES (?, ?, ?, ?, ?, ?)",
-            (category, content, importance, memory_type, now_str, decay_rate),
+            "created_at, decay_rate, embedding, embedding_model) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                category,
+                content,
+                importance,
+                memory_type,
+                now_str,
+                decay_rate,
+                vector[0].tobytes(),
+                embedding.get_model_id(),
+            ),
         )
-        conn.commit()
-        mem_id = cursor.lastrowid
-        conn.close()
+        mem_id = result.lastrowid
 
         if mem_id is None:
             Log.logger.warning("[记忆 v2] 插入记忆失败：未获取到 ID")
             return None
 
         with self._lock:
-            self.ids.append(mem_id)
-            self.categories.append(category)
-            self.contents.append(content)
-            self.importances.append(importance)
-            self.memory_types.append(memory_type)
-            self.created_times.append(now_str)
-            self.decay_rates.append(decay_rate)
-            self.archived.append(False)
-            self.access_counts.append(0)
+            self._store.append(
+                mem_id, category, content, importance, memory_type, now_str, decay_rate
+            )
+            self._bump_generation()
 
             try:
-                vector = self._encode_texts([content])
-                if self.index is not None and self.index.ntotal > 0:
-                    self.index.add(vector)
-                else:
-                    self._rebuild_index()
-                self._save_index()
+                self._index_put(mem_id, vector)
             except Exception as e:
                 Log.logger.warning(f"[记忆 v2] 更新 FAISS 索引失败: {e}")
 
@@ -600,23 +651,23 @@ class MemoryV2:
         Returns:
             是否更新成功
         """
-        # 查找当前内存索引
-        idx = None
         with self._lock:
-            for i, mid in enumerate(self.ids):
-                if mid == mem_id:
-                    idx = i
-                    break
-
-        if idx is None:
-            Log.logger.warning(f"[记忆 v2] 更新失败：id={mem_id} 不存在")
-            return False
+            idx = self._store.row_of(mem_id)
+            if idx is None:
+                Log.logger.warning(f"[记忆 v2] 更新失败：id={mem_id} 不存在")
+                return False
 
-        new_category = category if category is not None else self.categories[idx]
-        new_importance = importance if importance is not None else self.importances[idx]
-        new_memory_type = (
-            memory_type if memory_type is not None else self.memory_types[idx]
-        )
+            new_category = (
+                category if category is not None else self._store.categories[idx]
+            )
+            new_importance = (
+                importance
+                if importance is not None
+                else float(self._store.importances[idx])
+            )
+            new_memory_type = (
+                memory_type if memory_type is not None else self._store.memory_types[idx]
+            )
 
         if new_category not in self.CATEGORIES:
             new_category = "about_user"
@@ -626,12 +677,12 @@ class MemoryV2:
 
         now_str = datetime.now().isoformat()
         new_decay_rate = self.DEFAULT_DECAY_RATE if new_memory_type == "normal" else 0.0
+        vector = self._encode_texts([content])
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        result = self._db.execute(
             "UPDATE memories SET category=?, content=?, importance=?, "
-            "memory_type=?, decay_rate=?, last_accessed=? WHERE id=?",
+            "memory_type=?, decay_rate=?, last_accessed=?, embedding=?, "
+            "embedding_model=? WHERE id=?",
             (
                 new_category,
                 content,
@@ -639,21 +690,28 @@ class MemoryV2:
                 new_memory_type,
                 new_decay_rate,
                 now_str,
+                vector[0].tobytes(),
+                embedding.get_model_id(),
                 mem_id,
             ),
         )
-        updated = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        updated = result.rowcount > 0
 
         if updated:
             with self._lock:
-                self.contents[idx] = content
-                self.categories[idx] = new_category
-                self.importances[idx] = new_importance
-                self.memory_types[idx] = new_memory_type
-                self.decay_rates[idx] = new_decay_rate
-                self._rebuild_index()
+                # 更新期间记忆可能已被删除或内存表已压缩，按 ID 重新定位
+                idx = self._store.row_of(mem_id)
+                if idx is not None:
+                    self._store.contents[idx] = content
+                    self._store.categories[idx] = new_category
+                    self._store.importances[idx] = new_importance
+                    self._store.memory_types[idx] = new_memory_type
+                    self._store.decay_rates[idx] = new_decay_rate
+                    try:
+                        self._index_put(mem_id, vector, replace=True)
+                    except Exception as e:
+                        Log.logger.warning(f"[记忆 v2] 更新 FAISS 索引失败: {e}")
+                self._bump_generation()
 
             Log.logger.info(f"[记忆 v2] 更新记忆 id={mem_id}")
             return True
@@ -672,7 +730,7 @@ class MemoryV2:
         范围内的已有记忆自动建立关联。
         """
         with self._lock:
-            if not self.contents or len(self.contents) <= 1:
+            if len(self._store) <= 1:
                 return
 
             try:
@@ -685,11 +743,8 @@ class MemoryV2:
 
             linked_pairs = []
             for i in range(len(D[0])):
-                idx = I[0][i]
-                if idx >= len(self.ids):
-                    continue
-                existing_id = self.ids[idx]
-                if existing_id == new_mem_id:
+                existing_id = int(I[0][i])
+                if existing_id < 0 or existing_id == new_mem_id:
                     continue
 
                 sim = float(D[0][i])
@@ -700,25 +755,21 @@ class MemoryV2:
                 return
 
             now_str = datetime.now().isoformat()
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            for existing_id, sim in linked_pairs:
-                try:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO memory_links "
-                        "(memory_id_a, memory_id_b, similarity, created_at) "
-                        "VALUES (?, ?, ?, ?)",
-                        (
-                            min(new_mem_id, existing_id),
-                            max(new_mem_id, existing_id),
-                            round(sim, 4),
-                            now_str,
-                        ),
+            self._db.executemany(
+                "INSERT OR IGNORE INTO memory_links "
+                "(memory_id_a, memory_id_b, similarity, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        min(new_mem_id, existing_id),
+                        max(new_mem_id, existing_id),
+                        round(sim, 4),
+                        now_str,
                     )
-                except Exception:
-                    continue
-            conn.commit()
-            conn.close()
+                    for existing_id, sim in linked_pairs
+                ],
+            )
+            self._bump_generation()
 
             Log.logger.info(
                 f"[记忆 v2] 自动关联: id={new_mem_id} 关联了 {len(linked_pairs)} 条记忆"
@@ -726,15 +777,11 @@ class MemoryV2:
 
     def _get_linked_memory_ids(self, mem_id: int) -> list[int]:
         """获取指定记忆的所有关联记忆 ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = self._db.query(
             "SELECT memory_id_a, memory_id_b, similarity FROM memory_links "
             "WHERE memory_id_a = ? OR memory_id_b = ?",
             (mem_id, mem_id),
         )
-        rows = cursor.fetchall()
-        conn.close()
 
         linked = []
         for a, b, sim in rows:
@@ -748,10 +795,8 @@ class MemoryV2:
         if mem_id_a == mem_id_b:
             return False
         now_str = datetime.now().isoformat()
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         try:
-            cursor.execute(
+            result = self._db.execute(
                 "INSERT OR IGNORE INTO memory_links "
                 "(memory_id_a, memory_id_b, similarity, created_at) "
                 "VALUES (?, ?, ?, ?)",
@@ -762,64 +807,59 @@ class MemoryV2:
                     now_str,
                 ),
             )
-            conn.commit()
-            return cursor.rowcount > 0
         except Exception:
             return False
-        finally:
-            conn.close()
+        if result.rowcount > 0:
+            self._bump_generation()
+            return True
+        return False
 
     def remove_memory_link(self, mem_id_a: int, mem_id_b: int) -> bool:
         """删除两条记忆之间的关联"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        result = self._db.execute(
             "DELETE FROM memory_links "
             "WHERE (memory_id_a = ? AND memory_id_b = ?) "
             "OR (memory_id_a = ? AND memory_id_b = ?)",
             (mem_id_a, mem_id_b, mem_id_b, mem_id_a),
         )
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        deleted = result.rowcount > 0
+        if deleted:
+            self._bump_generation()
         return deleted
 
     # ============================================================
     # 核心操作：检索记忆
     # ============================================================
 
-    def _calc_effective_importance(
-        self,
-        importance: float,
-        created_at: str,
-        memory_type: str,
-        decay_rate: float | None,
-        access_count: int,
-    ) -> float:
+    def _calc_effective_importances(self, rows: np.ndarray) -> np.ndarray:
         """
-        计算当前有效重要度
+        批量计算内存表指定行的当前有效重要度（调用者持有 _lock）
 
         core 类型永不衰减；normal 类型按指数衰减，访问次数提供小幅增益。
-        """
-        if memory_type == "core":
-            return importance
-
-        dr = decay_rate if decay_rate is not None else 0.0
-        if dr <= 0:
-            return importance
-
-        try:
-            created = datetime.fromisoformat(created_at).timestamp()
-        except Exception:
-            return importance
+        创建时间使用内存表中预解析的时间戳，无法解析时不衰减。
 
-        now = time.time()
-        days_elapsed = max(0, (now - created) / 86400.0)
+        Args:
+            rows: 内存表行号数组
 
-        time_factor = math.exp(-dr * days_elapsed)
-        access_boost = min(access_count * 0.03, 0.2)
+        Returns:
+            与 rows 等长的 float64 有效重要度数组
+        """
+        store = self._store
+        importances = store.importances[rows]
+        decay_rates = store.decay_rates[rows]
+        created_ts = store.created_ts[rows]
+        is_core = np.fromiter(
+            (store.memory_types[row] == "core" for row in rows),
+            dtype=bool,
+            count=len(rows),
+        )
 
-        return importance * time_factor + access_boost
+        decaying = ~is_core & (decay_rates > 0) & ~np.isnan(created_ts)
+        days_elapsed = np.maximum(0.0, (time.time() - created_ts) / 86400.0)
+        access_boost = np.minimum(store.access_counts[rows] * 0.03, 0.2)
+        with np.errstate(invalid="ignore"):
+            decayed = importances * np.exp(-decay_rates * days_elapsed) + access_boost
+        return np.where(decaying, decayed, importances)
 
     def _calc_diary_time_score(self, day: str) -> float:
         """
@@ -860,7 +900,8 @@ class MemoryV2:
 
         with self._lock:
             # ---- 1. 检索 memories ----
-            if self.contents and self.index is not None and self.index.ntotal > 0:
+            store = self._store
+            if len(store) and self.index is not None and self.index.ntotal > 0:
                 try:
                     query_vec = self._encode_texts([query])
                     search_k = min(top_k * 3, self.index.ntotal)
@@ -869,40 +910,30 @@ class MemoryV2:
                     Log.logger.warning(f"[记忆 v2] 检索失败: {e}")
                     return []
 
-                # 收集每个记忆的有效重要度（使用缓存的 access_count）
-                importance_cache: dict[int, float] = {}
-                for idx, mem_id in enumerate(self.ids):
-                    ac = self.access_counts[idx] if idx < len(self.access_counts) else 0
-                    imp = self._calc_effective_importance(
-                        self.importances[idx],
-                        self.created_times[idx],
-                        self.memory_types[idx],
-                        self.decay_rates[idx],
-                        ac,
-                    )
-                    importance_cache[mem_id] = imp
+                # 只对候选行计算有效重要度（使用缓存的 access_count）
+                rows = store.rows_of(I[0])
+                keep = rows >= 0
+                if not include_archived:
+                    keep &= ~store.archived[rows]
+                similarities = D[0]
+                rows, similarities = rows[keep], similarities[keep]
+                effective_imps = self._calc_effective_importances(rows)
 
                 memory_results: list[dict[str, Any]] = []
-                for i in range(len(D[0])):
-                    idx = I[0][i]
-                    if idx >= len(self.ids):
-                        continue
-                    if self.archived[idx] and not include_archived:
-                        continue
-
-                    similarity = float(D[0][i])
-                    mem_id = self.ids[idx]
-                    effective_imp = importance_cache.get(mem_id, 0.0)
+                for idx, similarity, effective_imp in zip(
+                    rows.tolist(), similarities.tolist(), effective_imps.tolist()
+                ):
+                    mem_id = int(store.ids[idx])
                     final_score = similarity * effective_imp
 
                     memory_results.append(
                         {
                             "id": mem_id,
-                            "content": self.contents[idx],
-                            "category": self.categories[idx],
-                            "importance": self.importances[idx],
+                            "content": store.contents[idx],
+                            "category": store.categories[idx],
+                            "importance": float(store.importances[idx]),
                             "effective_importance": round(effective_imp, 4),
-                            "memory_type": self.memory_types[idx],
+                            "memory_type": store.memory_types[idx],
                             "score": round(final_score, 4),
                             "source": "memory",
                         }
@@ -980,24 +1011,71 @@ class MemoryV2:
         return top_results
 
     def _update_access(self, mem_id: int):
-        """更新记忆的最后访问时间和访问计数（同时更新内存缓存）"""
+        """
+        记录一次记忆访问
+
+        内存缓存中的访问计数立即更新（参与有效重要度计算），
+        数据库中的 access_count / last_accessed 由 flush_access_stats 批量写回。
+        """
         now_str = datetime.now().isoformat()
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE memories SET last_accessed = ?, "
-            "access_count = access_count + 1 WHERE id = ?",
-            (now_str, mem_id),
-        )
-        conn.commit()
-        conn.close()
+        with self._access_lock:
+            count, _ = self._pending_access.get(mem_id, (0, now_str))
+            self._pending_access[mem_id] = (count + 1, now_str)
 
-        # 同步更新内存缓存
         with self._lock:
-            for idx, mid in enumerate(self.ids):
-                if mid == mem_id:
-                    self.access_counts[idx] = self.access_counts[idx] + 1
-                    break
+            idx = self._store.row_of(mem_id)
+            if idx is not None:
+                self._store.access_counts[idx] += 1
+
+        # 已关闭（后台写回线程已停止）后仍有进行中的检索时直接写回
+        if self._access_flush_stop.is_set():
+            self.flush_access_stats()
+
+    def flush_access_stats(self) -> int:
+        """
+        将累计的访问统计在单个事务中写回数据库
+
+        Returns:
+            写回的记忆条数
+        """
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+        if not pending:
+            return 0
+
+        try:
+            self._db.executemany(
+                "UPDATE memories SET access_count = access_count + ?, "
+                "last_accessed = ? WHERE id = ?",
+                [(count, last, mem_id) for mem_id, (count, last) in pending.items()],
+            )
+        except Exception as e:
+            # 写回失败时合并回待写队列，下次重试
+            with self._access_lock:
+                for mem_id, (count, last) in pending.items():
+                    new_count, new_last = self._pending_access.get(mem_id, (0, last))
+                    self._pending_access[mem_id] = (count + new_count, max(last, new_last))
+            Log.logger.warning(f"[记忆 v2] 写回访问统计失败: {e}")
+            return 0
+        return len(pending)
+
+    def _access_flush_loop(self):
+        """后台线程：按 ACCESS_FLUSH_INTERVAL_SEC 定期写回访问统计"""
+        while not self._access_flush_stop.wait(self.ACCESS_FLUSH_INTERVAL_SEC):
+            self.flush_access_stats()
+
+    def close(self):
+        """
+        停止后台写回线程并写入剩余的访问统计
+
+        助手被重新加载或删除时调用；未显式关闭的实例在进程退出时自动调用。
+        """
+        if self._access_flush_stop.is_set():
+            return
+        self._access_flush_stop.set()
+        self._access_flush_thread.join()
+        atexit.unregister(self.close)
+        self.flush_access_stats()
 
     # ============================================================
     # 获取上下文（注入到 LLM prompt 的格式化文本）
@@ -1007,9 +1085,33 @@ class MemoryV2:
         """
         根据用户消息检索相关记忆和日记，返回格式化文本供注入 system prompt
 
+        同一查询在记忆、日记、关联未变化且未超过缓存有效期时直接返回缓存结果，
+        命中的记忆仍会照常累计访问统计。
+
         Returns:
             格式化的文本，无匹配时返回空字符串
         """
+        cache_key = (embedding_service.normalize_text(query), top_k)
+        with self._lock:
+            generation = self._generation
+            cached = self._context_cache.get(cache_key, generation)
+            if cached is not None:
+                context, memory_ids = cached
+                for mem_id in memory_ids:
+                    self._update_access(mem_id)
+                return context
+
+            context, memory_ids = self._build_context(query, top_k)
+            self._context_cache.put(cache_key, generation, (context, memory_ids))
+            return context
+
+    def _build_context(self, query: str, top_k: int) -> tuple[str, tuple[int, ...]]:
+        """
+        检索并格式化上下文（调用者持有 _lock）
+
+        Returns:
+            (格式化文本, 结果中的记忆 ID)
+        """
         lines: list[str] = []
 
         # 统一检索 memories + diaries（语义检索）
@@ -1029,7 +1131,8 @@ class MemoryV2:
                 }.get(r["category"], r["category"])
                 lines.append(f"{prefix}[{cat_label}] {r['content']}")
 
-        return "\n".join(lines)
+        memory_ids = tuple(r["id"] for r in results if r.get("source") == "memory")
+        return "\n".join(lines), memory_ids
 
     def search_raw(
         self,
@@ -1057,45 +1160,39 @@ class MemoryV2:
 
         应由外部调度器定期调用（如每日一次或启动时）。
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, importance, created_at, decay_rate, access_count, archived "
-            "FROM memories WHERE memory_type = 'normal' AND archived = 0"
-        )
-        rows = cursor.fetchall()
-
-        archived_count = 0
-        for row in rows:
-            mem_id, importance, created_at, decay_rate, access_count, archived = row
-            if archived:
-                continue
-
-            effective = self._calc_effective_importance(
-                importance, created_at, "normal", decay_rate, access_count
+        with self._lock:
+            store = self._store
+            rows = store.live_rows()
+            is_normal = np.fromiter(
+                (store.memory_types[row] == "normal" for row in rows),
+                dtype=bool,
+                count=len(rows),
+            )
+            rows = rows[is_normal & ~store.archived[rows]]
+            effective = self._calc_effective_importances(rows)
+            expired = effective < self.ARCHIVE_THRESHOLD
+            expired_ids = store.ids[rows[expired]].tolist()
+            expired_effective = effective[expired].tolist()
+
+            if not expired_ids:
+                return 0
+
+            self._db.executemany(
+                "UPDATE memories SET archived = 1 WHERE id = ?",
+                [(mem_id,) for mem_id in expired_ids],
             )
-            if effective < self.ARCHIVE_THRESHOLD:
-                cursor.execute(
-                    "UPDATE memories SET archived = 1 WHERE id = ?", (mem_id,)
-                )
-                archived_count += 1
-                Log.logger.info(
-                    f"[记忆 v2] 归档记忆 id={mem_id} "
-                    f"effective={effective:.4f} < threshold={self.ARCHIVE_THRESHOLD}"
-                )
-
-        if archived_count > 0:
-            conn.commit()
-
-        conn.close()
 
-        if archived_count > 0:
-            with self._lock:
-                self._load_data()
-                self._rebuild_index()
-            Log.logger.info(f"[记忆 v2] 归档完成: {archived_count} 条")
+            # 只改归档标记：向量仍留在索引中，检索时按标记过滤，无需重建
+            store.archived[rows[expired]] = True
+            self._bump_generation()
 
-        return archived_count
+        for mem_id, value in zip(expired_ids, expired_effective):
+            Log.logger.info(
+                f"[记忆 v2] 归档记忆 id={mem_id} "
+                f"effective={value:.4f} < threshold={self.ARCHIVE_THRESHOLD}"
+            )
+        Log.logger.info(f"[记忆 v2] 归档完成: {len(expired_ids)} 条")
+        return len(expired_ids)
 
     # ============================================================
     # 管理与统计
@@ -1104,22 +1201,22 @@ class MemoryV2:
     def get_statistics(self) -> dict[str, Any]:
         """获取记忆统计信息"""
         with self._lock:
-            total = len(self.contents)
-            core_count = self.memory_types.count("core")
-            normal_count = self.memory_types.count("normal")
-            archived_count = sum(self.archived)
+            store = self._store
+            live = store.live_rows()
+            total = len(store)
+            live_types = [store.memory_types[row] for row in live]
+            core_count = live_types.count("core")
+            normal_count = live_types.count("normal")
+            archived_count = int(store.archived[live].sum())
             active_count = total - archived_count
 
             category_counts: dict[str, int] = {}
-            for cat in self.categories:
+            for row in live:
+                cat = store.categories[row]
                 category_counts[cat] = category_counts.get(cat, 0) + 1
 
             # 统计关联数量
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM memory_links")
-            link_count = int(cursor.fetchone()[0])
-            conn.close()
+            link_count = int(self._db.query_one("SELECT COUNT(*) FROM memory_links")[0])
 
             return {
                 "total": total,
@@ -1129,29 +1226,25 @@ class MemoryV2:
                 "normal": normal_count,
                 "categories": category_counts,
                 "links": link_count,
+                "context_cache": self._context_cache.stats(),
             }
 
     def get_all_memories(self, include_archived: bool = False) -> list[dict[str, Any]]:
         """获取全部记忆（用于管理界面）"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
+        self.flush_access_stats()
         if include_archived:
-            cursor.execute(
+            rows = self._db.query(
                 "SELECT id, category, content, importance, memory_type, "
                 "created_at, last_accessed, access_count, archived "
                 "FROM memories ORDER BY id DESC"
             )
         else:
-            cursor.execute(
+            rows = self._db.query(
                 "SELECT id, category, content, importance, memory_type, "
                 "created_at, last_accessed, access_count, archived "
                 "FROM memories WHERE archived = 0 ORDER BY id DESC"
             )
 
-        rows = cursor.fetchall()
-        conn.close()
-
         return [
             {
                 "id": r[0],
@@ -1169,34 +1262,39 @@ class MemoryV2:
 
     def delete_memory(self, mem_id: int) -> bool:
         """删除指定记忆"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM memories WHERE id = ?", (mem_id,))
-        deleted = cursor.rowcount > 0
 
-        # 同时清理关联
-        if deleted:
-            cursor.execute(
+        def delete(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute("DELETE FROM memories WHERE id = ?", (mem_id,))
+            if cursor.rowcount <= 0:
+                return False
+            # 同时清理关联
+            conn.execute(
                 "DELETE FROM memory_links WHERE memory_id_a = ? OR memory_id_b = ?",
                 (mem_id, mem_id),
             )
+            return True
 
-        conn.commit()
-        conn.close()
+        deleted = self._db.write(delete)
 
         if deleted:
             with self._lock:
-                self._load_data()
-                self._rebuild_index()
+                store = self._store
+                store.delete(mem_id)
+                # 内存表只打墓碑标记，墓碑过多时压缩
+                if store.tombstones > max(16, store.size // 4):
+                    store.compact()
+                try:
+                    self._index_remove(mem_id)
+                except Exception as e:
+                    Log.logger.warning(f"[记忆 v2] 更新 FAISS 索引失败: {e}")
+                self._bump_generation()
             Log.logger.info(f"[记忆 v2] 删除记忆 id={mem_id}")
 
         return deleted
 
     def get_links_for_memory(self, mem_id: int) -> list[dict[str, Any]]:
         """获取指定记忆的所有关联信息"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = self._db.query(
             "SELECT ml.memory_id_a, ml.memory_id_b, ml.similarity, ml.created_at, "
             "m.category, m.content, m.importance "
             "FROM memory_links ml "
@@ -1205,8 +1303,6 @@ class MemoryV2:
             "WHERE ml.memory_id_a = ? OR ml.memory_id_b = ?",
             (mem_id, mem_id, mem_id),
         )
-        rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -1233,35 +1329,26 @@ class MemoryV2:
             content: 消息文本
             timestamp_sec: Unix 时间戳（秒）
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
+        self._db.execute(
             "INSERT INTO chat_turns (timestamp_sec, role, content) VALUES (?, ?, ?)",
             (timestamp_sec, role, content),
         )
-        conn.commit()
 
     def _get_turns_for_time_range(
         self, start_ts: int, end_ts: int
     ) -> list[dict[str, Any]]:
         """获取指定时间范围内的对话轮次（按时间升序）"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = self._db.query(
             "SELECT timestamp_sec, role, content FROM chat_turns "
             "WHERE timestamp_sec >= ? AND timestamp_sec < ? "
             "ORDER BY timestamp_sec ASC, id ASC",
             (start_ts, end_ts),
         )
-        rows = cursor.fetchall()
         return [{"timestamp_sec": r[0], "role": r[1], "content": r[2]} for r in rows]
 
     def _get_last_diary_day(self) -> str | None:
         """获取最后生成日记的日期，None 表示从未生成过"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT MAX(day) FROM diary_days")
-        row = cursor.fetchone()
+        row = self._db.query_one("SELECT MAX(day) FROM diary_days")
         return row[0] if row and row[0] else None
 
     def _format_turns_for_prompt(self, turns: list[dict[str, Any]]) -> str:
@@ -1279,15 +1366,12 @@ class MemoryV2:
 
         包括 core 类型记忆和高 importance 的记忆（如生日、节日等）
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
+        rows = self._db.query(
             "SELECT category, content, importance, memory_type FROM memories "
             "WHERE archived = 0 AND (memory_type = 'core' OR importance >= 0.6) "
             "ORDER BY importance DESC LIMIT ?",
             (top_k,),
         )
-        rows = cursor.fetchall()
 
         if not rows:
             return ""
@@ -1310,26 +1394,6 @@ class MemoryV2:
         if self._diary_llm is None:
             self._diary_llm = LLMClient(model_key="LLM")
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """
-        获取日记系统的持久化 SQLite 连接（lazy 初始化 + WAL 模式）
-
-        与 memory_v2.py 中其他方法（每次都创建新连接）不同，日记系统的方法
-        需在异步任务中频繁调用（schedule_diary_check），每次创建连接的开销不可忽视。
-        因此使用单例连接 + WAL 模式，兼顾性能和并发安全。
-
-        注意：check_same_thread=False 允许在不同协程间共享连接（SQLite 连接本身
-        带有文件锁保护写入），WAL 模式允许多个读取与单个写入并发。
-
-        Returns:
-            持久化的 SQLite 连接实例
-        """
-        if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._conn.execute("PRAGMA journal_mode=WAL")
-            self._conn.execute("PRAGMA synchronous=NORMAL")
-        return self._conn
-
     def _diary_exists(self, day_str: str) -> bool:
         """
         检查指定日期是否已生成日记（幂等判断）
@@ -1343,10 +1407,8 @@ class MemoryV2:
         Returns:
             该日期是否已有日记记录
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM diary_days WHERE day = ?", (day_str,))
-        return cursor.fetchone() is not None
+        row = self._db.query_one("SELECT 1 FROM diary_days WHERE day = ?", (day_str,))
+        return row is not None
 
     async def generate_diary_for_day(
         self, day_str: str, turns: list[dict[str, Any]]
@@ -1473,14 +1535,11 @@ class MemoryV2:
 
         # 第三步：存入 diary_days 独立表
         now_iso = datetime.now().isoformat()
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
+        self._db.execute(
             "INSERT INTO diary_days (day, event_summary, content, created_at) "
             "VALUES (?, ?, ?, ?)",
             (day_str, facts, diary_text, now_iso),
         )
-        conn.commit()
 
         # 第四步：加入日记 FAISS 索引（支持语义检索）
         with self._lock:
@@ -1605,9 +1664,6 @@ class MemoryV2:
         Returns:
             (records, total)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         where_parts: list[str] = []
         params: list[str] = []
 
@@ -1622,19 +1678,20 @@ class MemoryV2:
         if where_parts:
             where_sql = "WHERE " + " AND ".join(where_parts)
 
-        # 总数
-        cursor.execute(f"SELECT COUNT(*) FROM diary_days {where_sql}", tuple(params))
-        total = int(cursor.fetchone()[0])
-
-        # 分页查询
-        cursor.execute(
-            f"SELECT day, event_summary, content, created_at "
-            f"FROM diary_days {where_sql} ORDER BY day DESC "
-            f"LIMIT ? OFFSET ?",
-            tuple(params + [str(limit), str(offset)]),
-        )
-        rows = cursor.fetchall()
-        conn.close()
+        with self._db.reader() as conn:
+            # 总数
+            cursor = conn.execute(
+                f"SELECT COUNT(*) FROM diary_days {where_sql}", tuple(params)
+            )
+            total = int(cursor.fetchone()[0])
+
+            # 分页查询
+            rows = conn.execute(
+                f"SELECT day, event_summary, content, created_at "
+                f"FROM diary_days {where_sql} ORDER BY day DESC "
+                f"LIMIT ? OFFSET ?",
+                tuple(params + [str(limit), str(offset)]),
+            ).fetchall()
 
         records: list[dict[str, Any]] = []
         for r in rows:
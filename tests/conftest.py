@@ -0,0 +1,21 @@
+"""
+测试公共配置
+
+gsv_tts 在 import 时会联网下载 GPT-SoVITS 预训练模型。单元测试不做语音合成，
+在此以占位模块代替，使 core.chat 等依赖 services.tts_service 的模块可以在无模型环境中导入。
+"""
+
+import sys
+import types
+
+
+class _PlaceholderTTS:
+    """gsv_tts.TTS 占位：只接受构造参数，不加载模型"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+_gsv_tts = types.ModuleType("gsv_tts")
+_gsv_tts.TTS = _PlaceholderTTS
+sys.modules.setdefault("gsv_tts", _gsv_tts)
@@ -0,0 +1,94 @@
+"""
+助手重新加载 / 删除时的实例关闭测试
+
+重新加载后旧实例延迟 RETIRE_GRACE_SEC 关闭，进行中的请求可以继续使用它；
+已关闭的实例跳过知识库与记忆检索，而不是访问已关闭的连接和线程池。
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from core.assistant import Assistant
+from services import assistant_service as assistant_service_module
+from services.assistant_service import AssistantService
+
+
+class FakeAssistant:
+    """只记录 close 调用的助手替身"""
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self.closed = threading.Event()
+        self.close_calls = 0
+
+    def close(self) -> None:
+        self.close_calls += 1
+        self.closed.set()
+
+
+@pytest.fixture
+def service(monkeypatch, tmp_path):
+    monkeypatch.setattr(assistant_service_module, "Assistant", FakeAssistant)
+    monkeypatch.setattr(AssistantService, "RETIRE_GRACE_SEC", 0.2)
+    monkeypatch.setattr(assistant_service_module.Config, "BASE_AGENTS_PATH", str(tmp_path))
+    return AssistantService()
+
+
+def test_reload_closes_previous_after_grace(service):
+    previous = FakeAssistant("alice")
+    service.current_assistant = previous
+    service.current_assistant_name = "alice"
+    service.loaded_agents["alice"] = previous
+
+    service.reload_current_assistant()
+    assert service.current_assistant is not previous
+    assert service.loaded_agents["alice"] is service.current_assistant
+    # 宽限期内旧实例仍可用
+    assert not previous.closed.is_set()
+    assert previous.closed.wait(2.0)
+    assert previous.close_calls == 1
+    assert not service.current_assistant.closed.is_set()
+
+
+def test_delete_closes_immediately(service, tmp_path):
+    (tmp_path / "bob" / "memory").mkdir(parents=True)
+    agent = FakeAssistant("bob")
+    service.current_assistant = agent
+    service.current_assistant_name = "bob"
+    service.loaded_agents["bob"] = agent
+
+    service.delete_assistant("bob")
+    assert agent.close_calls == 1
+    assert service.current_assistant is None
+    assert "bob" not in service.loaded_agents
+    assert not (tmp_path / "bob").exists()
+
+
+def test_closed_assistant_skips_lookups():
+    agent = SimpleNamespace(
+        _closed=False,
+        enable_data_base=True,
+        enable_long_memory=True,
+        databaseEngine=mock.Mock(),
+        memoryEngine=mock.Mock(),
+        _executor=mock.Mock(),
+    )
+    Assistant.close(agent)
+    Assistant.close(agent)
+    agent.databaseEngine.close.assert_called_once_with()
+    agent.memoryEngine.close.assert_called_once_with()
+    agent._executor.shutdown.assert_called_once_with(wait=False)
+
+    async def lookups():
+        return await asyncio.gather(
+            Assistant._async_search_knowledge(agent, "今天去哪里玩"),
+            Assistant._async_search_memory(agent, "今天去哪里玩"),
+        )
+
+    assert asyncio.run(lookups()) == [("", 0.0), ("", 0.0)]
+    agent.databaseEngine.search.assert_not_called()
+    agent.memoryEngine.get_context.assert_not_called()
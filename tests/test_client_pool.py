@@ -0,0 +1,96 @@
+"""
+LLM 客户端连接池测试
+
+使用 bench.bench_llm_ttft 的桩服务器统计服务端连接数：同一事件循环内的请求复用连接；
+临时事件循环结束时，其上创建的共享客户端和连接必须被关闭。
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from bench.bench_llm_ttft import API_KEY, StubLLMServer, shared_first_token_latency
+from core.llm import client_pool
+from core.llm.client_pool import get_shared_client, run_in_temporary_loop
+from services import data_base
+
+
+@pytest.fixture
+def server():
+    stub = StubLLMServer(connect_delay_sec=0, first_token_sec=0, token_interval_sec=0)
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+def _wait_closed(server: StubLLMServer, timeout_sec: float = 2.0) -> int:
+    """等待服务端处理完客户端断开，返回仍未关闭的连接数"""
+    deadline = time.monotonic() + timeout_sec
+    while server.open_connections and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return server.open_connections
+
+
+def test_requests_in_one_loop_reuse_connection(server):
+    async def run():
+        first = get_shared_client(server.base_url, API_KEY)
+        for _ in range(5):
+            await shared_first_token_latency(server.base_url)
+        assert get_shared_client(server.base_url, API_KEY) is first
+        # 其他 key 使用独立客户端
+        assert get_shared_client(server.base_url, "other-key") is not first
+
+    run_in_temporary_loop(run())
+    assert server.requests == 5
+    assert server.connections == 1
+
+
+def test_temporary_loop_closes_its_clients(server):
+    clients = []
+
+    async def request():
+        clients.append(get_shared_client(server.base_url, API_KEY))
+        return await shared_first_token_latency(server.base_url)
+
+    for _ in range(3):
+        assert run_in_temporary_loop(request()) is not None
+
+    # 每个临时循环各建一个客户端，循环结束时均已关闭，服务端连接也随之断开
+    assert len({id(client) for client in clients}) == 3
+    assert all(client.is_closed() for client in clients)
+    assert server.connections == 3
+    assert _wait_closed(server) == 0
+
+
+def test_temporary_loop_closes_clients_on_error(server):
+    clients = []
+
+    async def fail():
+        clients.append(get_shared_client(server.base_url, API_KEY))
+        await shared_first_token_latency(server.base_url)
+        raise ValueError("抽取失败")
+
+    with pytest.raises(ValueError):
+        run_in_temporary_loop(fail())
+    assert clients[0].is_closed()
+    assert _wait_closed(server) == 0
+
+
+def test_sync_run_coroutine_from_running_loop(server):
+    clients = []
+
+    async def request():
+        clients.append(get_shared_client(server.base_url, API_KEY))
+        return await shared_first_token_latency(server.base_url)
+
+    async def main():
+        main_client = get_shared_client(server.base_url, API_KEY)
+        # 已有事件循环时在独立线程的临时循环中执行，只关闭该循环的客户端
+        assert data_base._sync_run_coroutine(request()) is not None
+        assert clients[0] is not main_client and clients[0].is_closed()
+        assert not main_client.is_closed()
+        await client_pool.close_shared_clients()
+        assert main_client.is_closed()
+
+    asyncio.run(main())
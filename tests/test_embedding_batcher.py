@@ -0,0 +1,100 @@
+"""
+EmbeddingBatcher 测试
+
+t2vect 替换为按文本确定性生成向量的假实现，记录每次推理的批次。
+"""
+
+import threading
+import time
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from my_utils import embedding
+from my_utils.embedding_batcher import EmbeddingBatcher
+
+
+def _vector(text: str) -> np.ndarray:
+    return np.array([len(text), sum(map(ord, text)) % 997], dtype=np.float32)
+
+
+class FakeModel:
+    """记录推理批次的 t2vect 替身，可选每次推理前等待"""
+
+    def __init__(self, delay_sec: float = 0.0):
+        self.delay_sec = delay_sec
+        self.batches: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        time.sleep(self.delay_sec)
+        with self.lock:
+            self.batches.append(list(texts))
+        return np.stack([_vector(text) for text in texts])
+
+
+@pytest.fixture
+def fake_model():
+    model = FakeModel()
+    with mock.patch.object(embedding, "t2vect", model):
+        yield model
+
+
+def test_merges_concurrent_requests(fake_model):
+    batcher = EmbeddingBatcher(window_ms=50, max_batch_size=16)
+    futures = [batcher.submit([f"文本{i}", "共享"]) for i in range(4)]
+    results = [future.result(timeout=5) for future in futures]
+
+    assert len(fake_model.batches) == 1
+    # 批内重复文本只推理一次
+    assert sorted(fake_model.batches[0]) == sorted({"共享", *(f"文本{i}" for i in range(4))})
+    for i, result in enumerate(results):
+        np.testing.assert_array_equal(result, np.stack([_vector(f"文本{i}"), _vector("共享")]))
+
+
+@pytest.mark.parametrize("window_ms", [0, 1])
+def test_oversized_request_is_split(fake_model, window_ms):
+    batcher = EmbeddingBatcher(window_ms=window_ms, max_batch_size=8)
+    texts = [f"chunk-{i}" for i in range(30)]
+    result = batcher.encode(texts)
+
+    assert [len(batch) for batch in fake_model.batches] == [8, 8, 8, 6]
+    np.testing.assert_array_equal(result, np.stack([_vector(text) for text in texts]))
+
+
+def test_queries_interleave_with_bulk_request():
+    model = FakeModel(delay_sec=0.02)
+    with mock.patch.object(embedding, "t2vect", model):
+        batcher = EmbeddingBatcher(window_ms=1, max_batch_size=8)
+        bulk = batcher.submit([f"chunk-{i}" for i in range(80)])
+        # 等第一片开始推理后再提交检索查询
+        while not model.batches:
+            time.sleep(0.005)
+        query = batcher.submit(["用户的问题"])
+
+        np.testing.assert_array_equal(query.result(timeout=5)[0], _vector("用户的问题"))
+        assert not bulk.done()
+        assert bulk.result(timeout=5).shape == (80, 2)
+
+    query_batch = next(i for i, batch in enumerate(model.batches) if "用户的问题" in batch)
+    # 查询最多等待一片：排在大请求的第二或第三个批次
+    assert query_batch <= 2
+    assert sum(len(batch) for batch in model.batches) == 81
+
+
+def test_failed_chunk_fails_whole_request():
+    calls = []
+
+    def flaky(texts):
+        calls.append(len(texts))
+        if len(calls) == 2:
+            raise RuntimeError("推理失败")
+        return np.stack([_vector(text) for text in texts])
+
+    with mock.patch.object(embedding, "t2vect", flaky):
+        batcher = EmbeddingBatcher(window_ms=1, max_batch_size=4)
+        with pytest.raises(RuntimeError, match="推理失败"):
+            batcher.encode([f"t{i}" for i in range(12)])
+    # 失败后不再排入剩余切片
+    assert calls == [4, 4]
@@ -0,0 +1,136 @@
+"""
+IncrementalJsonLineParser 等价性测试
+
+无论 token 如何切分（包括在 text 字符串、转义序列和行分隔符中间切开），
+提前产出 text 的增量解析器经 MultiParser 分发后，必须与 JsonLineParser
+产出完全相同的 TaskResult 序列；_partial_fields 去重保证整行到达时不会重复产出 text。
+"""
+
+import json
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from bench.bench_json_line_parser import dispatch, replay
+from core.llm.response_parser import IncrementalJsonLineParser, JsonLineParser, PartialJsonLine
+
+# 引号、反斜杠、换行和括号需要转义或容易被误判为 JSON 结构
+TEXT_ALPHABET = '好的ab "\\\n{}:,　'
+
+actions_strategy = st.fixed_dictionaries(
+    {
+        "motions": st.lists(
+            st.fixed_dictionaries(
+                {"name": st.sampled_from(["nod", "blush"]), "anchor": st.text(TEXT_ALPHABET, max_size=4)}
+            ),
+            max_size=2,
+        ),
+        "expression": st.one_of(st.none(), st.sampled_from(["happy", "sad"])),
+    }
+)
+
+line_strategy = st.one_of(
+    # 常见格式：text 在行首，可带 actions
+    st.builds(
+        lambda text, actions: {"text": text, **({"actions": actions} if actions else {})},
+        st.text(TEXT_ALPHABET, max_size=12),
+        st.one_of(st.none(), actions_strategy),
+    ),
+    # text 不在行首或缺失：只能整行解析
+    st.builds(
+        lambda actions, text: {"actions": actions, **({"text": text} if text is not None else {})},
+        actions_strategy,
+        st.one_of(st.none(), st.text(TEXT_ALPHABET, max_size=12)),
+    ),
+)
+
+separators_strategy = st.sampled_from([(", ", ": "), (",", ":"), (" ,  ", " :  ")])
+
+
+def _content(lines: list[dict], separators: tuple[str, str], trailing_newline: bool) -> str:
+    content = "\n".join(
+        json.dumps(line, ensure_ascii=False, separators=separators) for line in lines
+    )
+    return content + "\n" if trailing_newline else content
+
+
+def _split(content: str, cuts: list[int]) -> list[str]:
+    bounds = [0, *sorted(cuts), len(content)]
+    return [content[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+@settings(max_examples=1000, deadline=None)
+@given(
+    lines=st.lists(line_strategy, min_size=1, max_size=6),
+    separators=separators_strategy,
+    trailing_newline=st.booleans(),
+    data=st.data(),
+)
+def test_dispatch_matches_line_parser(lines, separators, trailing_newline, data):
+    content = _content(lines, separators, trailing_newline)
+    cuts = data.draw(st.sets(st.integers(0, len(content)), max_size=40))
+    tokens = _split(content, list(cuts))
+
+    expected = [event[1:] for event in dispatch(JsonLineParser(), [content])]
+    actual = [event[1:] for event in dispatch(IncrementalJsonLineParser(), tokens)]
+    assert actual == expected
+
+
+@settings(max_examples=500, deadline=None)
+@given(lines=st.lists(line_strategy, min_size=1, max_size=6), data=st.data())
+def test_full_lines_unchanged_and_partials_precede(lines, data):
+    content = _content(lines, (", ", ": "), trailing_newline=True)
+    cuts = data.draw(st.sets(st.integers(0, len(content)), max_size=40))
+    tokens = _split(content, list(cuts))
+    results = replay(IncrementalJsonLineParser(), tokens)
+
+    full = [item for _, item in results if not isinstance(item, PartialJsonLine)]
+    assert full == lines
+
+    # 提前产出的 text 位于所属行的整行结果之前，且每行至多一次
+    position = 0
+    partial_seen = False
+    for _, item in results:
+        if isinstance(item, PartialJsonLine):
+            assert not partial_seen
+            assert next(iter(lines[position])) == "text"
+            assert item == {"text": lines[position]["text"]}
+            partial_seen = True
+        else:
+            assert item == lines[position]
+            position += 1
+            partial_seen = False
+
+    # 逐字符输入时，行首为 text 的行都会提前产出
+    partials = [
+        item for _, item in replay(IncrementalJsonLineParser(), list(content))
+        if isinstance(item, PartialJsonLine)
+    ]
+    assert partials == [{"text": line["text"]} for line in lines if next(iter(line)) == "text"]
+
+
+def test_text_emitted_before_line_completes():
+    line = '{"text": "你好\\"呀", "actions": {"motions": [], "expression": "happy"}}\n'
+    tokens = list(line)
+    events = dispatch(IncrementalJsonLineParser(), tokens)
+
+    text_index = next(index for index, task_type, _, _ in events if task_type == "text")
+    # 在 text 的闭合引号处产出，早于行结束
+    assert tokens[text_index] == '"'
+    assert "".join(tokens[: text_index + 1]).endswith('呀"')
+    assert [event[1:] for event in events] == [
+        ("text", '你好"呀', 1),
+        ("motion", {"motions": [], "expression": "happy"}, 1),
+    ]
+
+
+def test_repeated_text_is_not_emitted_twice():
+    # 相邻两行 text 相同时共用句子 ID，整行到达后只补发 actions
+    content = (
+        '{"text": "嗯", "actions": {"motions": [{"name": "nod"}]}}\n'
+        '{"text": "嗯", "actions": {"expression": "happy"}}\n'
+    )
+    tokens = _split(content, [5, 8, 30, 62, 66])
+    assert [event[1:] for event in dispatch(IncrementalJsonLineParser(), tokens)] == [
+        event[1:] for event in dispatch(JsonLineParser(), [content])
+    ]
@@ -0,0 +1,180 @@
+"""
+知识库并发 ingest 流水线测试
+
+LLM 客户端替换为按脚本返回 / 失败的替身，知识库目录放在临时目录中；
+启动时的索引加载、后台重建和健康检查调度均被跳过，只测试 _ingest_files。
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from services import data_base
+
+
+class StubLLM:
+    """
+    LLM 客户端替身
+
+    Attributes:
+        failures: {文件名片段: 失败次数}，-1 表示始终失败
+        calls: 每个文件的请求次数
+        in_flight / max_in_flight: 当前和峰值并发请求数
+    """
+
+    def __init__(self, delay_sec: float = 0.02):
+        self.delay_sec = delay_sec
+        self.failures: dict[str, int] = {}
+        self.calls: dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, messages: list[dict]) -> str:
+        prompt = messages[0]["content"]
+        raw = prompt.split("来源文件：", 1)[1].split("\n", 1)[0].strip()
+        self.calls[raw] = self.calls.get(raw, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay_sec)
+        finally:
+            self.in_flight -= 1
+
+        for marker, count in self.failures.items():
+            if marker in raw and (count < 0 or self.calls[raw] <= count):
+                raise ConnectionError("stub LLM unavailable")
+        stem = raw.rsplit(".", 1)[0]
+        return json.dumps(
+            {
+                "title": f"{stem}-title",
+                "summary": f"{stem} 的摘要",
+                "tags": ["test"],
+                "entities": [f"{stem}-entity"],
+                "concepts": [],
+                "relations": [],
+            },
+            ensure_ascii=False,
+        )
+
+
+class Interrupted(BaseException):
+    """模拟进程在写入页面前被中断"""
+
+
+@pytest.fixture
+def knowledge_base(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_base.DataBase, "_load_persisted_index", lambda self: False)
+    monkeypatch.setattr(data_base.DataBase, "start_rebuild", lambda self, startup=False: {})
+    monkeypatch.setattr(data_base.DataBase, "_start_health_scheduler", lambda self: None)
+    llm = StubLLM()
+    monkeypatch.setattr(data_base, "LLMClient", lambda model_key: llm)
+
+    settings = SimpleNamespace(loreBooksThreshold=0.5, loreBooksDepth=3)
+    db = data_base.DataBase(SimpleNamespace(settings=settings))
+    db.watch_raw = False
+    db.enable_llm_extract = True
+    db.ingest_concurrency = 3
+    db.ingest_max_retries = 2
+    db.ingest_retry_backoff_sec = 0.01
+    db.ingest_timeout_sec = 5
+    yield db, llm
+    db.close()
+
+
+def _write_raw(db: data_base.DataBase, names: list[str]) -> list[tuple[str, str]]:
+    items = []
+    for name in names:
+        (db.raw_dir / name).write_text(f"{name} 的资料内容，用于测试知识库抽取。", encoding="utf-8")
+        items.append((name, f"md5-{name}"))
+    return items
+
+
+def _queue_rows(db: data_base.DataBase) -> dict[str, tuple]:
+    rows = db._conn.execute(
+        "SELECT raw_path, status, attempts, result_json FROM ingest_queue"
+    ).fetchall()
+    return {row[0]: row[1:] for row in rows}
+
+
+def _source_pages(db: data_base.DataBase) -> set[str]:
+    rows = db._conn.execute("SELECT raw_path FROM wiki_pages WHERE raw_path IS NOT NULL")
+    return {row[0] for row in rows}
+
+
+def test_concurrency_is_bounded(knowledge_base):
+    db, llm = knowledge_base
+    names = [f"doc{i}.txt" for i in range(10)]
+    details = db._ingest_files(_write_raw(db, names))
+
+    assert llm.max_in_flight == db.ingest_concurrency
+    assert sorted(detail["raw"] for detail in details) == names
+    assert all(detail["status"] == "ingested" for detail in details)
+    assert _source_pages(db) == set(names)
+    # 全部成功后队列清空
+    assert _queue_rows(db) == {}
+    assert db.get_rebuild_state()["done"] == len(names)
+
+
+def test_retries_then_falls_back(knowledge_base):
+    db, llm = knowledge_base
+    llm.failures = {"flaky": 2, "broken": -1}
+    details = {
+        detail["raw"]: detail
+        for detail in db._ingest_files(_write_raw(db, ["flaky.txt", "broken.txt", "ok.txt"]))
+    }
+
+    # 失败两次后第三次成功
+    assert llm.calls["flaky.txt"] == 3
+    assert details["flaky.txt"]["llm_attempts"] == 3
+    assert "llm_error" not in details["flaky.txt"]
+    # 重试用尽后回退到规则抽取，仍然 ingest 成功并记录最后一次错误
+    assert llm.calls["broken.txt"] == db.ingest_max_retries + 1
+    assert details["broken.txt"]["status"] == "ingested"
+    assert "ConnectionError" in details["broken.txt"]["llm_error"]
+    assert llm.calls["ok.txt"] == 1
+    assert _source_pages(db) == {"flaky.txt", "broken.txt", "ok.txt"}
+
+
+def test_resumes_from_persisted_extractions(knowledge_base, monkeypatch):
+    db, llm = knowledge_base
+    names = [f"doc{i}.txt" for i in range(4)]
+    items = _write_raw(db, names)
+
+    def crash(*args, **kwargs):
+        raise Interrupted()
+
+    # 第一次运行：抽取结果已落入 ingest_queue，写入页面前进程中断
+    with monkeypatch.context() as patch:
+        patch.setattr(db, "_apply_ingest", crash)
+        with pytest.raises(Interrupted):
+            db._ingest_files(items)
+    rows = _queue_rows(db)
+    extracted = {raw for raw, (status, _, result) in rows.items() if status == "extracted" and result}
+    assert extracted
+    assert _source_pages(db) == set()
+    calls_before = dict(llm.calls)
+
+    # 再次运行：已抽取的文件直接复用结果，不再请求 LLM
+    details = db._ingest_files(items)
+    assert all(llm.calls[raw] == calls_before[raw] for raw in extracted)
+    assert sorted(detail["raw"] for detail in details) == names
+    assert _source_pages(db) == set(names)
+    assert _queue_rows(db) == {}
+
+
+def test_changed_file_is_extracted_again(knowledge_base):
+    db, llm = knowledge_base
+    [item] = _write_raw(db, ["doc.txt"])
+    db._enqueue_ingest([item])
+    db._record_extractions([("doc.txt", item[1], {"title": "旧结果"}, 1, None)])
+
+    # md5 变化后旧的抽取结果作废
+    db._ingest_files([("doc.txt", "md5-changed")])
+    assert llm.calls["doc.txt"] == 1
+    title = db._conn.execute(
+        "SELECT title FROM wiki_pages WHERE raw_path = 'doc.txt'"
+    ).fetchone()[0]
+    assert title == "doc-title"
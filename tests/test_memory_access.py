@@ -0,0 +1,160 @@
+"""
+MemoryV2 访问统计写回测试
+
+检索只在内存中累计访问次数，flush_access_stats 把同一记忆的多次访问合并为
+一次 executemany 写回；写回失败时待写统计合并回队列，下次重试不丢失计数。
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from my_utils.sqlite_access import SQLiteDatabase
+from services import memory_v2
+from services.memory_store import MemoryStore
+from services.memory_v2 import MemoryV2
+
+
+class RecordingDatabase:
+    """记录 executemany 调用的 SQLiteDatabase 包装，可让下一次写入执行钩子后失败"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+        self.batches: list[list[tuple]] = []
+        self.fail_next = None
+
+    def executemany(self, sql, seq_of_params):
+        rows = list(seq_of_params)
+        self.batches.append(rows)
+        if self.fail_next is not None:
+            hook, self.fail_next = self.fail_next, None
+            hook()
+            raise OSError("disk I/O error")
+        return self._db.executemany(sql, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "memory.db"))
+    db.write(
+        lambda conn: conn.execute(
+            "CREATE TABLE memories (id INTEGER PRIMARY KEY, "
+            "access_count INTEGER DEFAULT 0, last_accessed TIMESTAMP)"
+        )
+    )
+    db.executemany("INSERT INTO memories (id) VALUES (?)", [(1,), (2,), (3,)])
+
+    store = MemoryStore()
+    store.load(
+        [
+            (mem_id, "about_user", f"记忆 {mem_id}", 0.5, "normal", None, 0.001, 0, 0)
+            for mem_id in (1, 2, 3)
+        ]
+    )
+    engine = SimpleNamespace(
+        _db=RecordingDatabase(db),
+        _store=store,
+        _lock=threading.RLock(),
+        _access_lock=threading.Lock(),
+        _pending_access={},
+        _access_flush_stop=threading.Event(),
+    )
+    engine.flush_access_stats = lambda: MemoryV2.flush_access_stats(engine)
+    yield engine
+    db.close()
+
+
+def _access(engine, mem_id: int, at: str):
+    with mock.patch.object(memory_v2, "datetime") as fake_datetime:
+        fake_datetime.now.return_value.isoformat.return_value = at
+        MemoryV2._update_access(engine, mem_id)
+
+
+def _flush(engine) -> int:
+    return MemoryV2.flush_access_stats(engine)
+
+
+def _stored(engine) -> dict[int, tuple]:
+    rows = engine._db.query("SELECT id, access_count, last_accessed FROM memories")
+    return {row[0]: row[1:] for row in rows}
+
+
+def test_repeated_access_merged_into_one_update(engine):
+    for i in range(5):
+        _access(engine, 1, f"2026-06-01T12:00:0{i}")
+    _access(engine, 2, "2026-06-01T12:00:09")
+
+    # 内存计数立即生效，数据库尚未写入
+    assert engine._store.access_counts[engine._store.row_of(1)] == 5
+    assert engine._db.batches == []
+
+    assert _flush(engine) == 2
+    assert len(engine._db.batches) == 1
+    assert sorted(engine._db.batches[0], key=lambda row: row[2]) == [
+        (5, "2026-06-01T12:00:04", 1),
+        (1, "2026-06-01T12:00:09", 2),
+    ]
+    assert _stored(engine) == {
+        1: (5, "2026-06-01T12:00:04"),
+        2: (1, "2026-06-01T12:00:09"),
+        3: (0, None),
+    }
+    # 没有新访问时不写库
+    assert _flush(engine) == 0
+    assert len(engine._db.batches) == 1
+
+
+def test_failed_flush_merges_counts_back(engine):
+    _access(engine, 1, "2026-06-01T12:00:00")
+    _access(engine, 1, "2026-06-01T12:00:01")
+    _access(engine, 2, "2026-06-01T12:00:02")
+
+    # 写回期间其他线程又访问了记忆 1 和 3，随后写回失败
+    def concurrent_access():
+        _access(engine, 1, "2026-06-01T12:00:05")
+        _access(engine, 3, "2026-06-01T12:00:06")
+
+    engine._db.fail_next = concurrent_access
+    assert _flush(engine) == 0
+    assert engine._pending_access == {
+        1: (3, "2026-06-01T12:00:05"),
+        2: (1, "2026-06-01T12:00:02"),
+        3: (1, "2026-06-01T12:00:06"),
+    }
+    assert _stored(engine) == {1: (0, None), 2: (0, None), 3: (0, None)}
+
+    # 重试时合并后的计数一次写入
+    assert _flush(engine) == 3
+    assert _stored(engine) == {
+        1: (3, "2026-06-01T12:00:05"),
+        2: (1, "2026-06-01T12:00:02"),
+        3: (1, "2026-06-01T12:00:06"),
+    }
+    assert engine._pending_access == {}
+
+
+def test_failed_flush_keeps_latest_access_time(engine):
+    _access(engine, 1, "2026-06-01T12:00:09")
+
+    # 失败期间到达的访问时间更早（时钟回拨），合并后保留较晚的时间
+    engine._db.fail_next = lambda: _access(engine, 1, "2026-06-01T11:59:00")
+    _flush(engine)
+    assert engine._pending_access == {1: (2, "2026-06-01T12:00:09")}
+
+
+def test_access_after_close_written_immediately(engine):
+    _access(engine, 1, "2026-06-01T12:00:00")
+    # 助手关闭后后台写回线程已停止，进行中的检索产生的访问统计直接写回
+    engine._access_flush_stop.set()
+    _access(engine, 2, "2026-06-01T12:00:01")
+    assert engine._pending_access == {}
+    assert _stored(engine) == {
+        1: (1, "2026-06-01T12:00:00"),
+        2: (1, "2026-06-01T12:00:01"),
+        3: (0, None),
+    }
@@ -0,0 +1,90 @@
+"""
+MemoryV2 有效重要度回归测试
+
+批量计算的 _calc_effective_importances 必须与改动前逐条计算的公式
+（bench.bench_memory_store.reference_effective_importance）给出相同的分数和排序。
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from bench.bench_memory_store import reference_effective_importance
+from services import memory_v2
+from services.memory_store import MemoryStore
+from services.memory_v2 import MemoryV2
+
+NOW = datetime(2026, 6, 1, 12, 0, 0).timestamp()
+
+
+def _created_at(offset_hours: float, aware: bool) -> str:
+    created = datetime.fromtimestamp(NOW) - timedelta(hours=offset_hours)
+    if aware:
+        created = created.astimezone(timezone.utc)
+    return created.isoformat()
+
+
+created_at_strategy = st.one_of(
+    # 过去一年内（含少量未来时间），本地时间或带时区
+    st.builds(
+        _created_at,
+        st.floats(min_value=-48, max_value=24 * 365, allow_nan=False),
+        st.booleans(),
+    ),
+    st.sampled_from([None, "", "not-a-date", "2026-13-40"]),
+)
+
+row_strategy = st.tuples(
+    st.floats(min_value=0.0, max_value=1.0, allow_nan=False),
+    created_at_strategy,
+    st.sampled_from(["core", "normal"]),
+    st.one_of(st.none(), st.floats(min_value=-0.1, max_value=0.5, allow_nan=False)),
+    st.integers(min_value=0, max_value=20),
+)
+
+
+def _effective_importances(rows: list[tuple]) -> np.ndarray:
+    store = MemoryStore()
+    store.load(
+        [
+            (mem_id, "general", f"记忆 {mem_id}", importance, memory_type,
+             created_at, decay_rate, 0, access_count)
+            for mem_id, (importance, created_at, memory_type, decay_rate, access_count)
+            in enumerate(rows, start=1)
+        ]
+    )
+    engine = SimpleNamespace(_store=store)
+    with mock.patch.object(memory_v2.time, "time", return_value=NOW):
+        return MemoryV2._calc_effective_importances(engine, np.arange(len(rows)))
+
+
+@settings(max_examples=300, deadline=None)
+@given(rows=st.lists(row_strategy, min_size=1, max_size=40))
+def test_matches_per_row_formula(rows: list[tuple]):
+    actual = _effective_importances(rows)
+    expected = np.array([reference_effective_importance(*row, now=NOW) for row in rows])
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-15)
+    # 排序比较前舍去末位误差，避免相等分数因 exp 实现差异交换顺序
+    assert np.argsort(-actual.round(12), kind="stable").tolist() == np.argsort(
+        -expected.round(12), kind="stable"
+    ).tolist()
+
+
+def test_decay_rules():
+    week_ago = _created_at(24 * 7, aware=False)
+    rows = [
+        (0.8, week_ago, "core", 0.1, 5),  # core 不衰减
+        (0.8, week_ago, "normal", None, 5),  # 无衰减速率
+        (0.8, "not-a-date", "normal", 0.1, 5),  # 时间无法解析
+        (0.8, week_ago, "normal", 0.1, 0),
+        (0.8, week_ago, "normal", 0.1, 100),  # 访问增益封顶 0.2
+    ]
+    actual = _effective_importances(rows)
+    decayed = 0.8 * math.exp(-0.1 * 7)
+    np.testing.assert_allclose(actual, [0.8, 0.8, 0.8, decayed, decayed + 0.2], rtol=1e-12)
@@ -0,0 +1,201 @@
+"""
+MemoryV2 增量向量索引测试
+
+FAISS 索引以记忆 ID 为键（IndexIDMap2），向量存于 SQLite：
+增删改和归档只更新单条；重启时从索引文件加载，索引与记忆表不一致或为旧版位置索引时
+从已存储向量重建，只为缺少向量或向量来自其他模型的记忆重新编码。
+
+编码器替换为按文本确定性生成向量的假实现，并记录每次编码的文本。
+"""
+
+import zlib
+from types import SimpleNamespace
+from unittest import mock
+
+import faiss
+import numpy as np
+import pytest
+
+from my_utils import embedding, embedding_service, sqlite_access, vector_index
+from services.memory_v2 import MemoryV2
+
+DIM = 16
+MODEL_ID = "fake-embedding:mean"
+
+
+def _vector(text: str) -> np.ndarray:
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+    vector = rng.standard_normal(DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeEncoder:
+    """embedding_service.encode 替身，记录每次编码的文本"""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str], use_cache: bool = True) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.stack([_vector(text) for text in texts])
+
+    def encoded(self) -> list[str]:
+        return [text for call in self.calls for text in call if text != "占位"]
+
+
+@pytest.fixture
+def encoder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fake = FakeEncoder()
+    with (
+        mock.patch.object(embedding_service, "encode", fake),
+        mock.patch.object(embedding, "get_model_id", return_value=MODEL_ID),
+    ):
+        yield fake
+    sqlite_access.close_all()
+
+
+@pytest.fixture
+def open_engine(encoder):
+    engines: list[MemoryV2] = []
+
+    def open_engine() -> MemoryV2:
+        engine = MemoryV2(SimpleNamespace(name="tester", user="用户"))
+        engines.append(engine)
+        return engine
+
+    yield open_engine
+    for engine in engines:
+        engine.close()
+
+
+def _index_ids(engine: MemoryV2) -> list[int]:
+    return sorted(faiss.vector_to_array(engine.index.id_map).tolist())
+
+
+def _stored_vectors(engine: MemoryV2) -> dict[int, np.ndarray]:
+    rows = engine._db.query("SELECT id, embedding, embedding_model FROM memories")
+    assert all(model == MODEL_ID for _, _, model in rows)
+    return {mem_id: np.frombuffer(blob, dtype=np.float32) for mem_id, blob, _ in rows}
+
+
+def _assert_index_matches_sqlite(engine: MemoryV2):
+    stored = _stored_vectors(engine)
+    assert _index_ids(engine) == sorted(stored)
+    for mem_id, vector in stored.items():
+        np.testing.assert_array_equal(engine.index.reconstruct(mem_id), vector)
+
+
+def _spy_build_index():
+    return mock.patch.object(
+        MemoryV2, "_build_index", autospec=True, side_effect=MemoryV2._build_index
+    )
+
+
+def _add(engine: MemoryV2, contents: list[str]) -> list[int]:
+    ids = [engine.add_memory(content, "about_user", importance=0.6) for content in contents]
+    assert None not in ids
+    return ids
+
+
+def test_add_update_delete_archive(open_engine, encoder):
+    engine = open_engine()
+    assert isinstance(engine.index, faiss.IndexIDMap2)
+    ids = _add(engine, ["喜欢草莓蛋糕", "讨厌下雨天", "养了一只猫"])
+    _assert_index_matches_sqlite(engine)
+
+    # 更新：只替换该 ID 的向量
+    encoder.calls.clear()
+    assert engine.update_memory(ids[1], "其实喜欢下雨天")
+    assert encoder.encoded() == ["其实喜欢下雨天"]
+    np.testing.assert_array_equal(engine.index.reconstruct(ids[1]), _vector("其实喜欢下雨天"))
+    np.testing.assert_array_equal(engine.index.reconstruct(ids[0]), _vector("喜欢草莓蛋糕"))
+    _assert_index_matches_sqlite(engine)
+
+    # 删除：移除该 ID，其余向量不变
+    assert engine.delete_memory(ids[0])
+    assert _index_ids(engine) == sorted(ids[1:])
+    _assert_index_matches_sqlite(engine)
+
+    # 归档：只改标记，向量留在索引中
+    low = engine.add_memory("随口一提的小事", "about_world", importance=0.05)
+    assert engine.decay_and_archive() == 1
+    assert low in _index_ids(engine)
+    assert engine._db.query_one("SELECT archived FROM memories WHERE id = ?", (low,)) == (1,)
+    _assert_index_matches_sqlite(engine)
+
+
+def test_restart_loads_index_without_encoding(open_engine, encoder):
+    engine = open_engine()
+    ids = _add(engine, ["喜欢草莓蛋糕", "讨厌下雨天", "养了一只猫"])
+    engine.delete_memory(ids[1])
+    engine.close()
+
+    encoder.calls.clear()
+    with _spy_build_index() as build:
+        restarted = open_engine()
+    # 直接加载索引文件，不重建也不编码
+    build.assert_not_called()
+    assert encoder.encoded() == []
+    assert _index_ids(restarted) == [ids[0], ids[2]]
+    _assert_index_matches_sqlite(restarted)
+    # 重启后继续按 ID 增量写入
+    new_id = _add(restarted, ["周末去爬山"])[0]
+    assert _index_ids(restarted) == [ids[0], ids[2], new_id]
+
+
+def test_id_mismatch_rebuilds_from_stored_vectors(open_engine, encoder):
+    engine = open_engine()
+    ids = _add(engine, ["喜欢草莓蛋糕", "讨厌下雨天"])
+    engine.close()
+    # 写库后未保存索引就退出：记忆表比索引多一条
+    engine._db.execute(
+        "INSERT INTO memories (category, content, importance, memory_type, created_at, "
+        "decay_rate, embedding, embedding_model) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ("about_user", "养了一只猫", 0.5, "normal", "2026-06-01T12:00:00", 0.001,
+         _vector("养了一只猫").tobytes(), MODEL_ID),
+    )
+
+    encoder.calls.clear()
+    with _spy_build_index() as build:
+        restarted = open_engine()
+    # 从已存储向量重建，不重新编码
+    build.assert_called_once()
+    assert encoder.encoded() == []
+    assert len(_index_ids(restarted)) == len(ids) + 1
+    _assert_index_matches_sqlite(restarted)
+
+
+def test_legacy_positional_index_is_rebuilt(open_engine, encoder):
+    engine = open_engine()
+    ids = _add(engine, ["喜欢草莓蛋糕", "讨厌下雨天", "养了一只猫", "周末去爬山"])
+    engine.close()
+
+    # 旧版：按行位置编号的 IndexFlatIP，且部分记忆没有可用的已存储向量
+    legacy = faiss.IndexFlatIP(DIM)
+    legacy.add(np.stack([_vector(text) for text in ["a", "b", "c", "d"]]))
+    vector_index.write_index_atomic(legacy, engine.index_path, model_id=MODEL_ID)
+    engine._db.executemany(
+        "UPDATE memories SET embedding = ?, embedding_model = ? WHERE id = ?",
+        [
+            (None, None, ids[0]),  # 旧库没有向量列
+            (_vector("讨厌下雨天").tobytes(), "other-model:cls", ids[1]),  # 其他模型
+            (np.zeros(DIM // 2, dtype=np.float32).tobytes(), MODEL_ID, ids[2]),  # 维度不符
+        ],
+    )
+
+    encoder.calls.clear()
+    restarted = open_engine()
+    # 只重新编码这三条，第四条直接使用已存储向量
+    assert sorted(encoder.encoded()) == sorted(["喜欢草莓蛋糕", "讨厌下雨天", "养了一只猫"])
+    assert isinstance(restarted.index, faiss.IndexIDMap2)
+    assert _index_ids(restarted) == sorted(ids)
+    _assert_index_matches_sqlite(restarted)
+    for mem_id, text in zip(ids, ["喜欢草莓蛋糕", "讨厌下雨天", "养了一只猫", "周末去爬山"]):
+        np.testing.assert_array_equal(restarted.index.reconstruct(mem_id), _vector(text))
+
+    # 回写的向量在下次启动时直接复用
+    restarted.close()
+    encoder.calls.clear()
+    open_engine()
+    assert encoder.encoded() == []
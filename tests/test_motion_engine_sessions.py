@@ -0,0 +1,94 @@
+"""
+动作引擎会话隔离测试
+
+get_motion_engine() 返回进程内共享的只读引擎，跨句子的持续动作和表情
+保存在各自的 MotionSession 中，并发会话互不影响。
+"""
+
+import threading
+
+import pytest
+
+from bench.bench_motion_engine import build_motion_db, fake_query_encoder
+from core.expression_generator import motion_engine_v3
+from core.expression_generator.motion_engine_v3 import get_motion_engine
+
+DIM = 32
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "motion.db")
+    build_motion_db(path, entries=50, motions=5, dim=DIM)
+    return path
+
+
+@pytest.fixture
+def engine(db_path):
+    with fake_query_encoder(DIM):
+        yield get_motion_engine(db_path)
+    motion_engine_v3._engines.pop(db_path).database.close()
+
+
+def test_engine_is_shared(engine, db_path):
+    assert get_motion_engine(db_path) is engine
+    first, second = engine.create_session(), engine.create_session()
+    assert first.engine is second.engine is engine
+    assert first.state is not second.state
+
+
+def test_sessions_keep_separate_state(engine):
+    a, b = engine.create_session(), engine.create_session()
+
+    a.process("你来了呀，我好开心", [{"name": "blush", "anchor": "我好开心"}], "happy")
+    b.process("哼，不理你了", [{"name": "pout", "anchor": "不理你"}], "angry")
+    assert set(a.state.active_sustained) == {"blush"}
+    assert a.state.active_expression == "happy"
+    assert set(b.state.active_sustained) == {"pout"}
+    assert b.state.active_expression == "angry"
+
+    # 未指定表情时沿用本会话上一句的表情，持续动作从本会话的目标值渐出
+    data = a.process("今天做什么好呢", [])
+    assert data.expression == ["happy"]
+    assert data.curves["ParamCheek"][0] == pytest.approx(0.8)
+    assert a.state.active_sustained == {}
+    assert set(b.state.active_sustained) == {"pout"}
+
+    data = b.process("好吧，原谅你了", [])
+    assert data.expression == ["angry"]
+    assert data.curves["ParamMouthForm"][0] == pytest.approx(-0.4)
+
+
+def test_concurrent_sessions(engine):
+    sessions = {
+        "happy": ("blush", "ParamCheek", 0.8),
+        "angry": ("pout", "ParamMouthForm", -0.4),
+    }
+    barrier = threading.Barrier(len(sessions))
+    errors: list[BaseException] = []
+
+    def chat(expression: str, action: str, param: str, target: float):
+        session = engine.create_session()
+        try:
+            barrier.wait()
+            session.process(f"{expression} 的开场白", [{"name": action}], expression)
+            for i in range(30):
+                # 奇数句延续持续动作，偶数句不带动作，使其在下一句句首渐出
+                motions = [{"name": action}] if i % 2 else []
+                data = session.process(f"{expression} 的第{i}句", motions)
+                assert data.expression == [expression]
+                if i % 2 == 0:
+                    assert data.curves[param][0] == pytest.approx(target)
+                assert set(session.state.active_sustained) == ({action} if i % 2 else set())
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=chat, args=(expression, *spec))
+        for expression, spec in sessions.items()
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,125 @@
+"""
+SQLiteDatabase 写线程测试
+
+先提交一个阻塞在 Event 上的写任务占住写线程，其后提交的任务会合并进同一批事务，
+以此确定性地构造合批场景。
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from my_utils.sqlite_access import SQLiteDatabase
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "test.db"))
+    db.write(lambda conn: conn.execute("CREATE TABLE t (name TEXT UNIQUE)"))
+    yield db
+    db.close()
+
+
+def _hold_writer(db: SQLiteDatabase) -> threading.Event:
+    """占住写线程，返回放行用的 Event"""
+    started, release = threading.Event(), threading.Event()
+
+    def block(conn):
+        started.set()
+        release.wait(5)
+
+    db.submit(block)
+    assert started.wait(5)
+    return release
+
+
+def _insert(name: str):
+    return lambda conn: conn.execute("INSERT INTO t (name) VALUES (?)", (name,)).lastrowid
+
+
+def _names(db: SQLiteDatabase) -> list[str]:
+    return [row[0] for row in db.query("SELECT name FROM t ORDER BY rowid")]
+
+
+def test_failed_task_rolls_back_only_its_savepoint(database):
+    release = _hold_writer(database)
+
+    def insert_then_fail(conn):
+        conn.execute("INSERT INTO t (name) VALUES ('b')")
+        raise ValueError("任务失败")
+
+    futures = [
+        database.submit(_insert("a")),
+        database.submit(insert_then_fail),
+        database.submit(_insert("c")),
+        # 违反唯一约束：语句自身失败，同样只回滚该任务
+        database.submit(_insert("a")),
+        database.submit(_insert("d")),
+    ]
+    release.set()
+
+    assert futures[0].result(5) and futures[2].result(5) and futures[4].result(5)
+    with pytest.raises(ValueError, match="任务失败"):
+        futures[1].result(5)
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[3].result(5)
+    assert _names(database) == ["a", "c", "d"]
+
+
+def test_nested_submit_runs_in_current_transaction(database):
+    def outer(conn):
+        conn.execute("INSERT INTO t (name) VALUES ('outer')")
+        # 在写线程上嵌套提交：立即执行，不排队等待自身
+        inner = database.submit(_insert("inner"))
+        assert inner.done()
+        failed = database.submit(_insert("outer"))
+        assert isinstance(failed.exception(), sqlite3.IntegrityError)
+        return inner.result()
+
+    assert database.write(outer) == 2
+    assert _names(database) == ["outer", "inner"]
+
+    # 外层任务失败时，嵌套写入随外层一起回滚
+    def outer_fails(conn):
+        database.write(_insert("nested"))
+        raise RuntimeError("外层失败")
+
+    with pytest.raises(RuntimeError):
+        database.write(outer_fails)
+    assert _names(database) == ["outer", "inner"]
+
+
+def test_nested_failure_keeps_outer_writes(database):
+    def outer(conn):
+        conn.execute("INSERT INTO t (name) VALUES ('before')")
+
+        def partial(inner_conn):
+            inner_conn.execute("INSERT INTO t (name) VALUES ('partial')")
+            raise ValueError("内层失败")
+
+        assert isinstance(database.submit(partial).exception(), ValueError)
+        conn.execute("INSERT INTO t (name) VALUES ('after')")
+
+    database.write(outer)
+    assert _names(database) == ["before", "after"]
+
+
+def test_close_flushes_queued_writes(tmp_path):
+    path = str(tmp_path / "close.db")
+    db = SQLiteDatabase(path)
+    db.write(lambda conn: conn.execute("CREATE TABLE t (name TEXT UNIQUE)"))
+    release = _hold_writer(db)
+    futures = [db.submit(_insert(f"row{i}")) for i in range(200)]
+
+    closer = threading.Thread(target=db.close)
+    closer.start()
+    release.set()
+    closer.join(10)
+    assert not closer.is_alive()
+
+    assert all(future.done() and future.exception() is None for future in futures)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (200,)
+    with pytest.raises(RuntimeError):
+        db.write(_insert("late"))
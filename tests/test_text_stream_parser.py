@@ -0,0 +1,48 @@
+"""
+TextStreamParser 句子切分等价性测试
+
+增量扫描句尾的实现必须与改动前从头重扫的实现（LegacyTextStreamParser）
+对任意 token 切分方式产出完全相同的句子。
+"""
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from bench.bench_text_stream_parser import LegacyTextStreamParser, split_sentences
+from core.scheduler.parsers.text_stream_parser import TextStreamParser
+
+# 句尾标点、省略号的组成字符、换行空白和各类括号占多数，普通文字用少量字符代表
+ALPHABET = "。！？.…\n 　()（）[]【】{}好的ab"
+
+tokens_strategy = st.lists(st.text(alphabet=ALPHABET, max_size=8), max_size=60)
+
+
+@settings(max_examples=2000, deadline=None)
+@given(tokens=tokens_strategy)
+def test_matches_legacy_parser(tokens: list[str]):
+    assert split_sentences(TextStreamParser(), tokens) == split_sentences(
+        LegacyTextStreamParser(), tokens
+    )
+
+
+@settings(max_examples=500, deadline=None)
+@given(text=st.text(alphabet=ALPHABET, max_size=200), data=st.data())
+def test_independent_of_token_boundaries(text: str, data: st.DataObject):
+    cuts = sorted(data.draw(st.sets(st.integers(0, len(text)), max_size=20)))
+    bounds = [0, *cuts, len(text)]
+    tokens = [text[start:end] for start, end in zip(bounds, bounds[1:])]
+    assert split_sentences(TextStreamParser(), tokens) == split_sentences(
+        LegacyTextStreamParser(), [text]
+    )
+
+
+def test_sentence_ids_and_reset():
+    parser = TextStreamParser()
+    first = list(parser.parse("你好呀，今天过得怎么样？我很好。（笑）"))
+    first.extend(parser.flush())
+    assert [result.sentence_id for result in first] == list(range(1, len(first) + 1))
+
+    parser.reset()
+    second = list(parser.parse("你好呀，今天过得怎么样？"))
+    assert second[0].sentence_id == 1
+    assert second[0].data == {"text": "你好呀，今天过得怎么样？", "tts_text": "你好呀，今天过得怎么样？"}
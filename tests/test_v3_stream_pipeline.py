@@ -0,0 +1,62 @@
+"""
+V3MotionChatContext.stream_pipeline 测试
+
+慢速 LLM、TTS 和动作检索使用 bench/bench_v3_first_sentence.py 中的替身。
+"""
+
+import asyncio
+
+from bench.bench_v3_first_sentence import (
+    FakeSlowPipeline,
+    drive_legacy,
+    drive_stream,
+    fake_stages,
+    measure,
+)
+from core.chat.v3_motion import V3MotionChatContext
+
+SENTENCES = [f"这是第{i}句测试回复。" for i in range(1, 5)]
+
+
+def test_sentence_emitted_before_next_llm_line():
+    result = asyncio.run(measure(drive_stream, SENTENCES, 0.2, 0.03, 0.01))
+    # 就绪即发：每句的延迟只有 TTS + 动作检索耗时，远小于 LLM 行间隔
+    assert max(result["lags_ms"]) < 150
+
+
+def test_legacy_driver_waits_for_next_line():
+    result = asyncio.run(measure(drive_legacy, SENTENCES, 0.2, 0.03, 0.01))
+    # 对照：改动前首句要等到 LLM 产出下一行才发出
+    assert result["lags_ms"][0] >= 150
+
+
+def test_events_keep_sentence_order():
+    async def run():
+        with fake_stages(tts_sec=0.0, motion_sec=0.02):
+            ctx = V3MotionChatContext(tts_lang="zh")
+            events = [
+                event async for event in ctx.stream_pipeline(FakeSlowPipeline(SENTENCES, 0.0))
+            ]
+        return events
+
+    events = asyncio.run(run())
+    assert [event.content for event in events] == SENTENCES
+    assert all(event.extras["audio"] == f"audio:{text}" for event, text in zip(events, SENTENCES))
+    assert all("motion" in event.extras for event in events)
+
+
+def test_disconnect_cancels_pending_tasks():
+    async def run():
+        with fake_stages(tts_sec=0.2, motion_sec=0.0) as stages:
+            ctx = V3MotionChatContext(tts_lang="zh")
+            stream = ctx.stream_pipeline(FakeSlowPipeline(SENTENCES, 0.0))
+            first = await anext(stream)
+            # 客户端断开：生成器被关闭，其余句子的 TTS 仍在排队或运行
+            await stream.aclose()
+            await asyncio.sleep(0)
+            return first, ctx, stages
+
+    first, ctx, stages = asyncio.run(run())
+    assert first.content == SENTENCES[0]
+    assert not ctx.pending_tasks
+    assert stages.tts_cancelled == stages.tts_started - 1